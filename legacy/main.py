@@ -7,26 +7,80 @@ policy noted below.
 from __future__ import annotations
 
 import argparse
+import array
+import asyncio
+import bisect
+import bz2
+import collections
 import csv
+import functools
+import gzip
+import hashlib
 import html
+import http.client
 import io
+import itertools
 import json
+import lzma
+import mmap
+import multiprocessing
+import operator
+import os
+import queue
 import re
 import secrets
+import sqlite3
+import string
+import struct
 import sys
+import tempfile
+import threading
+import time
 import urllib.error
+import urllib.parse
 import urllib.request
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Set, Tuple
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
 
 CardRecord = Dict[str, str]
+CARD_FIELDS = ("number", "cvv", "exp_month", "exp_year")
 ADDRESS_LABELS = ["Street", "City", "State/province/area", "Zip code"]
-ADDRESS_URL = "https://www.bestrandoms.com/random-address-in-us?quantity=1"
+ADDRESS_URL_TEMPLATE = "https://www.bestrandoms.com/random-address-in-us?quantity={quantity}"
+ADDRESS_URL = ADDRESS_URL_TEMPLATE.format(quantity=1)
+ADDRESS_MAX_QUANTITY = 20
 ADDRESS_HEADERS = {"User-Agent": "Mozilla/5.0"}
 MODE_CARDS = "cards"
 MODE_ADDRESS = "address"
 MODE_BOTH = "cards_then_address"
+ENGINE_AUTO = "auto"
+ENGINE_PYTHON = "python"
+ENGINE_NUMPY = "numpy"
+SAMPLING_RETRY = "retry"
+SAMPLING_PERMUTATION = "permutation"
+SAMPLING_SEQUENTIAL = "sequential"
 
 WARNING_MESSAGE = (
     "WARNING: Generated card data is for development and QA testing only. "
@@ -65,72 +119,583 @@ def validate_luhn(card_number: str) -> bool:
     return check_digit == expected
 
 
+LUHN_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+LUHN_UNDOUBLED = (0, 5, 1, 6, 2, 7, 3, 8, 4, 9)
+
+
+def _np_random_below(size: int, bound: int) -> "np.ndarray":
+    """Return ``size`` unbiased integers in ``[0, bound)`` drawn from ``os.urandom``."""
+    dtype = np.uint8 if bound <= 256 else np.uint32
+    span = int(np.iinfo(dtype).max) + 1
+    limit = span - span % bound
+    itemsize = np.dtype(dtype).itemsize
+    out = np.empty(size, dtype=dtype)
+    filled = 0
+    while filled < size:
+        needed = size - filled
+        draw = needed * span // limit + 16
+        raw = np.frombuffer(os.urandom(draw * itemsize), dtype=dtype)
+        accepted = raw[raw < limit][:needed] % bound
+        out[filled:filled + accepted.size] = accepted
+        filled += accepted.size
+    return out
+
+
+def _np_luhn_check_digits(partials: "np.ndarray") -> "np.ndarray":
+    """Return the Luhn check digit for every row of a digit matrix."""
+    width = partials.shape[1]
+    doubled = (width - 1 - np.arange(width)) % 2 == 0
+    table = np.array(LUHN_DOUBLED, dtype=np.uint8)
+    values = np.where(doubled, table[partials], partials)
+    totals = values.sum(axis=1, dtype=np.int64)
+    return ((10 - totals % 10) % 10).astype(np.uint8)
+
+
+def validate_luhn_batch(card_numbers: Sequence[str]) -> List[bool]:
+    """Validate many card numbers at once; vectorized per length when NumPy is available."""
+    if np is None:
+        return [validate_luhn(number) for number in card_numbers]
+
+    results = [False] * len(card_numbers)
+    by_length: Dict[int, List[int]] = {}
+    for position, number in enumerate(card_numbers):
+        if len(number) > 1:
+            by_length.setdefault(len(number), []).append(position)
+
+    for width, positions in by_length.items():
+        raw = "".join(card_numbers[position] for position in positions)
+        digits = np.frombuffer(raw.encode("ascii", errors="replace"), dtype=np.uint8)
+        digits = (digits - ord("0")).reshape(len(positions), width)
+        is_digit = (digits <= 9).all(axis=1)
+        digits = np.where(digits <= 9, digits, 0)
+        valid = is_digit & (_np_luhn_check_digits(digits[:, :-1]) == digits[:, -1])
+        for position, flag in zip(positions, valid.tolist()):
+            results[position] = flag
+    return results
+
+
+def _np_digits_to_strings(digits: "np.ndarray") -> List[str]:
+    """Materialize each row of a digit matrix as a string."""
+    width = digits.shape[1]
+    raw = (digits + ord("0")).astype(np.uint8).tobytes().decode("ascii")
+    return [raw[start:start + width] for start in range(0, len(raw), width)]
+
+
+def current_expiry_anchor() -> str:
+    """Return the current UTC month as an ``expiry_anchor`` (``"YYYY-MM"``)."""
+    now = datetime.now(timezone.utc)
+    return f"{now.year:04d}-{now.month:02d}"
+
+
+def _expiry_labels(years_ahead: int, anchor: Optional[str] = None) -> List[Tuple[str, str]]:
+    """Return the ``(MM, YY)`` pair for every month offset ``generate_expiry`` can pick.
+
+    Offsets count from the current UTC month, or from ``anchor`` (``"YYYY-MM"``).
+    """
+    if anchor is None:
+        now = datetime.now(timezone.utc)
+        base_year, base_month = now.year, now.month
+    else:
+        match = re.fullmatch(r"(\d{4})-(\d{2})", anchor)
+        if not match or not 1 <= int(match.group(2)) <= 12:
+            raise ValueError("Expiry anchor must look like YYYY-MM")
+        base_year, base_month = int(match.group(1)), int(match.group(2))
+    return [
+        (
+            f"{(base_month - 1 + offset) % 12 + 1:02d}",
+            f"{(base_year + (base_month - 1 + offset) // 12) % 100:02d}",
+        )
+        for offset in range(years_ahead * 12 + 1)
+    ]
+
+
+def _np_card_records(
+    numbers: List[str],
+    cvv_digits: int,
+    fixed_expiry: Optional[Tuple[str, str]],
+    expiry_labels: List[Tuple[str, str]],
+) -> List[CardRecord]:
+    """Attach vectorized CVVs and expiry dates to a batch of card numbers."""
+    count = len(numbers)
+    cvvs = _np_digits_to_strings(
+        _np_random_below(count * cvv_digits, 10).reshape(count, cvv_digits)
+    )
+    if fixed_expiry is not None:
+        expiries = [fixed_expiry] * count
+    else:
+        offsets = _np_random_below(count, len(expiry_labels)).tolist()
+        expiries = [expiry_labels[offset] for offset in offsets]
+    return [
+        {
+            "number": number,
+            "cvv": cvv,
+            "exp_month": exp_month,
+            "exp_year": exp_year,
+        }
+        for number, cvv, (exp_month, exp_year) in zip(numbers, cvvs, expiries)
+    ]
+
+
 # ---------------------------------------------------------------------------
-# Card generator
+# Random digit source
+# ---------------------------------------------------------------------------
+
+DIGIT_BLOCK_SIZE = 1 << 16
+# Bytes 250-255 are dropped so that every remaining byte maps to a digit with
+# equal probability (250 is a multiple of 10).
+DIGIT_TRANSLATION = bytes(48 + value % 10 if value < 250 else 0 for value in range(256))
+DIGIT_REJECTED = bytes(range(250, 256))
+
+
+class DigitSource:
+    """Serve unbiased decimal digits cut from large ``os.urandom`` blocks.
+
+    Each refill makes one ``os.urandom`` call and converts the whole block to ASCII
+    digits with ``bytes.translate`` (rejection sampling happens in the same pass),
+    so callers pay a slice per request instead of a system call per digit.
+    """
+
+    __slots__ = ("_block_size", "_buffer", "_position")
+
+    def __init__(self, block_size: int = DIGIT_BLOCK_SIZE) -> None:
+        if block_size <= 0:
+            raise ValueError("Block size must be positive")
+        self._block_size = block_size
+        self._buffer = ""
+        self._position = 0
+
+    def digits(self, count: int) -> str:
+        """Return ``count`` random digits as a string."""
+        end = self._position + count
+        if end > len(self._buffer):
+            self._refill(count)
+            end = count
+        chunk = self._buffer[self._position:end]
+        self._position = end
+        return chunk
+
+    def randbelow(self, bound: int) -> int:
+        """Return a uniform integer in ``[0, bound)`` built from buffered digits."""
+        if bound <= 0:
+            raise ValueError("Bound must be positive")
+        width = len(str(bound - 1))
+        span = 10 ** width
+        limit = span - span % bound
+        while True:
+            value = int(self.digits(width))
+            if value < limit:
+                return value % bound
+
+    def _refill(self, minimum: int) -> None:
+        parts = [self._buffer[self._position:]]
+        size = len(parts[0])
+        while size < minimum:
+            block = os.urandom(self._block_size).translate(DIGIT_TRANSLATION, DIGIT_REJECTED)
+            parts.append(block.decode("ascii"))
+            size += len(block)
+        self._buffer = "".join(parts)
+        self._position = 0
+
+
+MASK64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+def _mix64(value: int) -> int:
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+def _np_mix64(values: "np.ndarray") -> "np.ndarray":
+    with np.errstate(over="ignore"):
+        values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+class CounterRandom:
+    """Counter-based PRNG: ``word(position, lane)`` is a pure function of the seed.
+
+    Words come from the SplitMix64 finalizer applied to a seed-keyed counter, so any
+    card position can be produced directly (on any core) without replaying the
+    positions before it. Integer arithmetic is fixed at 64 bits, which makes the
+    stream identical across runs, machines and the Python/NumPy engines.
+    """
+
+    LANES = 2
+    LANE_CVV = 0
+    LANE_EXPIRY = 1
+
+    def __init__(self, seed: object) -> None:
+        material = hashlib.blake2b(
+            str(seed).encode("utf-8"), digest_size=24, person=b"reysilvagen-seed"
+        ).digest()
+        self.seed = seed
+        self.key = int.from_bytes(material[:8], "big")
+        self.permutation_key = int.from_bytes(material[8:], "big")
+
+    def word(self, position: int, lane: int) -> int:
+        counter = position * self.LANES + lane + 1
+        return _mix64((self.key + counter * GOLDEN_GAMMA) & MASK64)
+
+    def np_words(self, positions: "np.ndarray", lane: int) -> "np.ndarray":
+        with np.errstate(over="ignore"):
+            counters = positions * np.uint64(self.LANES) + np.uint64(lane + 1)
+            return _np_mix64(np.uint64(self.key) + counters * np.uint64(GOLDEN_GAMMA))
+
+    def card_extras(self, position: int, cvv_digits: int, expiry_choices: int) -> Tuple[str, int]:
+        """Return the CVV and expiry offset for one card position."""
+        cvv = self.word(position, self.LANE_CVV) % 10 ** cvv_digits
+        return f"{cvv:0{cvv_digits}d}", self.word(position, self.LANE_EXPIRY) % expiry_choices
+
+    def np_card_extras(
+        self, positions: "np.ndarray", cvv_digits: int, expiry_choices: int
+    ) -> Tuple[List[str], List[int]]:
+        """Vectorized ``card_extras``."""
+        cvvs = self.np_words(positions, self.LANE_CVV) % np.uint64(10 ** cvv_digits)
+        powers = 10 ** np.arange(cvv_digits - 1, -1, -1, dtype=np.uint64)
+        cvv_rows = ((cvvs[:, None] // powers) % np.uint64(10)).astype(np.uint8)
+        offsets = self.np_words(positions, self.LANE_EXPIRY) % np.uint64(expiry_choices)
+        return _np_digits_to_strings(cvv_rows), offsets.tolist()
+
+
+# ---------------------------------------------------------------------------
+# Keyed permutation
+# ---------------------------------------------------------------------------
+
+
+class KeyedPermutation:
+    """Pseudorandom bijection on ``range(size)`` built from a keyed Feistel network.
+
+    Position ``i`` of the permutation is computed on demand, so walking positions
+    ``0, 1, 2, ...`` visits distinct values without storing any of them. Domains
+    that are not a power of four are handled by cycle walking.
+    """
+
+    ROUNDS = 6
+
+    def __init__(self, size: int, key: Optional[int] = None) -> None:
+        if size <= 0:
+            raise ValueError("Permutation size must be positive")
+        if key is None:
+            key = secrets.randbits(128)
+        if key < 0:
+            raise ValueError("Permutation key must be non-negative")
+        self.size = size
+        bits = max((size - 1).bit_length(), 2)
+        self._half_bits = (bits + 1) // 2
+        self._half_mask = (1 << self._half_bits) - 1
+        material = hashlib.blake2b(
+            key.to_bytes(max((key.bit_length() + 7) // 8, 1), "big"),
+            digest_size=8 * self.ROUNDS,
+            person=b"reysilvagen-perm",
+        ).digest()
+        self._round_keys = [
+            int.from_bytes(material[offset:offset + 8], "big")
+            for offset in range(0, len(material), 8)
+        ]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, position: int) -> int:
+        if not 0 <= position < self.size:
+            raise IndexError("Permutation position out of range")
+        value = self._encrypt(position)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+    def _encrypt(self, value: int) -> int:
+        half_bits = self._half_bits
+        half_mask = self._half_mask
+        left = value >> half_bits
+        right = value & half_mask
+        for round_key in self._round_keys:
+            mixed = ((right ^ round_key) * GOLDEN_GAMMA) & MASK64
+            mixed ^= mixed >> 29
+            mixed = (mixed * 0xBF58476D1CE4E5B9) & MASK64
+            mixed ^= mixed >> 32
+            left, right = right, left ^ (mixed & half_mask)
+        return (left << half_bits) | right
+
+    def permute_array(self, positions: "np.ndarray") -> "np.ndarray":
+        """Vectorized ``__getitem__`` for an array of positions (requires NumPy)."""
+        values = self._encrypt_array(positions.astype(np.uint64))
+        pending = values >= self.size
+        while pending.any():
+            values[pending] = self._encrypt_array(values[pending])
+            pending = values >= self.size
+        return values
+
+    def _encrypt_array(self, values: "np.ndarray") -> "np.ndarray":
+        half_bits = np.uint64(self._half_bits)
+        half_mask = np.uint64(self._half_mask)
+        left = values >> half_bits
+        right = values & half_mask
+        with np.errstate(over="ignore"):
+            for round_key in self._round_keys:
+                mixed = (right ^ np.uint64(round_key)) * np.uint64(GOLDEN_GAMMA)
+                mixed ^= mixed >> np.uint64(29)
+                mixed *= np.uint64(0xBF58476D1CE4E5B9)
+                mixed ^= mixed >> np.uint64(32)
+                left, right = right, left ^ (mixed & half_mask)
+        return (left << half_bits) | right
+
+
+# ---------------------------------------------------------------------------
+# Compiled BIN patterns
 # ---------------------------------------------------------------------------
 
 MIN_CARD_LENGTH = 13
 MAX_CARD_LENGTH = 19
 BIN_MIN_LENGTH = 6
 BIN_MAX_LENGTH = 9
+NUMPY_MIN_BATCH = 256
+ITER_BATCH_SIZE = 65536
+# Above this many unique cards, retry sampling switches to the set-free permutation.
+RETRY_UNIQUE_LIMIT = 65536
+PATTERN_CACHE_SIZE = 256
+SHARD_MIN_SIZE = 1024
+SHARD_MAX_SIZE = 1 << 20
+SHARDS_PER_WORKER = 2  # finished shards buffered ahead of the consumer, per worker
+# Worker pools never fork: prefetch and fetcher threads may be running in the parent.
+SHARD_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+DIGIT_CHARS = "0123456789"
+
+def _normalize_pattern(bin_pattern: str) -> str:
+    if not bin_pattern:
+        raise ValueError("BIN pattern must not be empty")
+    pattern = bin_pattern.replace(" ", "").lower()
+    allowed = set("0123456789x")
+    if any(char not in allowed for char in pattern):
+        raise ValueError("BIN pattern may contain only digits and 'x'")
+    return pattern
+
+
+def _extract_prefix(pattern: str) -> str:
+    digits = []
+    for char in pattern:
+        if char.isdigit():
+            digits.append(char)
+        else:
+            break
+    prefix = "".join(digits)
+    if not prefix.isdigit():
+        raise ValueError("BIN pattern must start with digits")
+    if not (BIN_MIN_LENGTH <= len(prefix) <= BIN_MAX_LENGTH):
+        raise ValueError("BIN must be 6-9 digits long before placeholders")
+    return prefix
+
+
+def _determine_length(pattern: str, length: Optional[int], network: CardNetwork) -> int:
+    if length is None:
+        inferred = len(pattern) if "x" in pattern else max(len(pattern), network.length)
+    else:
+        inferred = length
+    if not (MIN_CARD_LENGTH <= inferred <= MAX_CARD_LENGTH):
+        raise ValueError("Card length must be between 13 and 19 digits")
+    return inferred
+
+
+class BinPattern:
+    """A validated BIN pattern laid out for one target card length.
+
+    Everything that does not change from card to card is computed once: the fixed
+    digits, the wildcard slots before the check digit (with their Luhn doubling
+    flag), the Luhn sum of the fixed digits, the card type and the capacity. The
+    per-card work is then limited to the wildcard slots.
+    """
+
+    __slots__ = (
+        "pattern",
+        "prefix",
+        "length",
+        "card_type",
+        "network",
+        "template",
+        "free_slots",
+        "index_slots",
+        "solved_slot",
+        "fixed_last",
+        "fixed_luhn_sum",
+        "capacity",
+        "_np_layout",
+    )
+
+    def __init__(self, pattern: str, prefix: str, length: int, network: CardNetwork) -> None:
+        self.pattern = pattern
+        self.prefix = prefix
+        self.length = length
+        self.network = network
+        self.card_type = network.name
+
+        last_index = length - 1
+        template: List[str] = []
+        free_slots: List[Tuple[int, bool]] = []
+        fixed_luhn_sum = 0
+        for index in range(last_index):
+            char = pattern[index] if index < len(pattern) else "x"
+            doubled = (last_index - 1 - index) % 2 == 0
+            template.append(char)
+            if char == "x":
+                free_slots.append((index, doubled))
+            else:
+                digit = int(char)
+                fixed_luhn_sum += LUHN_DOUBLED[digit] if doubled else digit
+        self.template = tuple(template)
+        self.free_slots = tuple(free_slots)
+        self.fixed_luhn_sum = fixed_luhn_sum
+        self.fixed_last: Optional[int] = None
+        if len(pattern) == length and pattern[last_index] != "x":
+            self.fixed_last = int(pattern[last_index])
+
+        # A fixed check digit pins the last free slot: each slot maps its ten digits
+        # onto all ten Luhn contributions, so exactly one digit there satisfies the
+        # checksum. Valid numbers are then indexed by the remaining slots alone.
+        self.solved_slot: Optional[Tuple[int, bool]] = None
+        self.index_slots = self.free_slots
+        if self.fixed_last is not None and free_slots:
+            self.solved_slot = self.free_slots[-1]
+            self.index_slots = self.free_slots[:-1]
+        if self.fixed_last is None or free_slots:
+            self.capacity = 10 ** len(self.index_slots)
+        else:
+            self.capacity = 1 if self.fill("")[1] == self.fixed_last else 0
+        self._np_layout = None
+
+    def __repr__(self) -> str:
+        return f"BinPattern({self.pattern!r}, length={self.length})"
+
+    @property
+    def free_positions(self) -> List[int]:
+        return [slot for slot, _ in self.free_slots]
+
+    def fill(self, free_digits: str) -> Tuple[str, int]:
+        """Place the digit string ``free_digits`` in the wildcard slots.
+
+        Returns ``(partial, check_digit)`` where ``partial`` excludes the check digit.
+        """
+        digits = list(self.template)
+        total = self.fixed_luhn_sum
+        for (slot, doubled), char in zip(self.free_slots, free_digits):
+            digits[slot] = char
+            digit = ord(char) - 48
+            total += LUHN_DOUBLED[digit] if doubled else digit
+        return "".join(digits), (10 - total % 10) % 10
+
+    def number_at(self, index: int) -> str:
+        """Return the ``index``-th valid number in ascending order, ``0 <= index < capacity``."""
+        width = len(self.index_slots)
+        return self.solve(str(index).zfill(width) if width else "")
+
+    def solve(self, index_digits: str) -> str:
+        """Return the valid number whose index slots hold the digit string ``index_digits``.
+
+        Random ``index_digits`` give a uniformly random valid number, also when a
+        fixed check digit pins the solved slot.
+        """
+        digits = list(self.template)
+        total = self.fixed_luhn_sum
+        for (slot, doubled), char in zip(self.index_slots, index_digits):
+            digits[slot] = char
+            digit = ord(char) - 48
+            total += LUHN_DOUBLED[digit] if doubled else digit
+        if self.solved_slot is not None:
+            slot, doubled = self.solved_slot
+            needed = (20 - self.fixed_last - total % 10) % 10
+            digits[slot] = DIGIT_CHARS[LUHN_UNDOUBLED[needed] if doubled else needed]
+            total += needed
+        return "".join(digits) + DIGIT_CHARS[(10 - total % 10) % 10]
+
+    def np_rows_at(self, indices: "np.ndarray") -> "np.ndarray":
+        """Vectorized ``number_at`` for an array of ``uint64`` indices, as digit rows."""
+        width = len(self.index_slots)
+        powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.uint64)
+        return self.np_solve(((indices[:, None] // powers) % np.uint64(10)).astype(np.uint8))
+
+    def np_solve(self, index_digits: "np.ndarray") -> "np.ndarray":
+        """Vectorized ``solve`` for a ``(rows, len(index_slots))`` digit array."""
+        if self.solved_slot is None:
+            return self.np_rows(index_digits)
+
+        free_digits = index_digits
+        _, _, doubled, table = self._numpy_layout()
+        totals = np.full(len(free_digits), self.fixed_luhn_sum, dtype=np.int64)
+        if free_digits.shape[1]:
+            contributions = np.where(doubled[:-1], table[free_digits], free_digits)
+            totals += contributions.sum(axis=1, dtype=np.int64)
+        needed = ((20 - self.fixed_last - totals % 10) % 10).astype(np.uint8)
+        if self.solved_slot[1]:
+            needed = np.array(LUHN_UNDOUBLED, dtype=np.uint8)[needed]
+        return self.np_rows(np.concatenate([free_digits, needed[:, None]], axis=1))
+
+    def _numpy_layout(self) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+        if self._np_layout is None:
+            base = np.array(
+                [0 if char == "x" else int(char) for char in self.template] + [0],
+                dtype=np.uint8,
+            )
+            columns = np.array(self.free_positions, dtype=np.intp)
+            doubled = np.array([flag for _, flag in self.free_slots], dtype=bool)
+            self._np_layout = (base, columns, doubled, np.array(LUHN_DOUBLED, dtype=np.uint8))
+        return self._np_layout
+
+    def np_rows(self, free_digits: "np.ndarray") -> "np.ndarray":
+        """Vectorized ``fill``: return complete digit rows, check digit included."""
+        base, columns, doubled, table = self._numpy_layout()
+
+        rows = np.tile(base, (free_digits.shape[0], 1))
+        totals = np.full(free_digits.shape[0], self.fixed_luhn_sum, dtype=np.int64)
+        if columns.size:
+            rows[:, columns] = free_digits
+            contributions = np.where(doubled, table[free_digits], free_digits)
+            totals += contributions.sum(axis=1, dtype=np.int64)
+        rows[:, -1] = (10 - totals % 10) % 10
+        return rows
+
+
+@functools.lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_bin_pattern(bin_pattern: str, length: Optional[int] = None) -> BinPattern:
+    """Validate ``bin_pattern`` and return its memoized ``BinPattern``."""
+    pattern = _normalize_pattern(bin_pattern)
+    prefix = _extract_prefix(pattern)
+    network = classify_card_network(pattern)
+    target_length = _determine_length(pattern, length, network)
+
+    if target_length <= len(prefix):
+        raise ValueError("Card length must be greater than the BIN prefix length")
+    if len(pattern) > target_length:
+        raise ValueError("Card length cannot be shorter than the BIN pattern length")
+    return BinPattern(pattern, prefix, target_length, network)
 
 
+# ---------------------------------------------------------------------------
+# Card generator
+# ---------------------------------------------------------------------------
+
 class CardGenerator:
     """Generate synthetic card numbers, CVVs, and expiry dates for testing."""
 
-    def __init__(self) -> None:
-        self._rand = secrets.SystemRandom()
+    def __init__(self, digit_source: Optional[DigitSource] = None) -> None:
+        self._digits = digit_source or DigitSource()
 
     def generate_from_bin(self, bin_pattern: str, length: Optional[int] = None) -> str:
-        pattern = self._normalize_pattern(bin_pattern)
-        prefix = self._extract_prefix(pattern)
-        target_length = self._determine_length(pattern, length)
-
-        if target_length <= len(prefix):
-            raise ValueError("Card length must be greater than the BIN prefix length")
-        if len(pattern) > target_length:
-            raise ValueError("Card length cannot be shorter than the BIN pattern length")
-
-        digits: List[Optional[str]] = []
-        for index in range(target_length):
-            if index < len(pattern):
-                char = pattern[index]
-                digits.append(None if char == "x" else char)
-            else:
-                digits.append(None)
-
-        last_index = target_length - 1
-        for index in range(last_index):
-            if digits[index] is None:
-                digits[index] = str(self._rand.randrange(0, 10))
-
-        partial = "".join(digit or "0" for digit in digits[:last_index])
-        if not partial.isdigit():
-            raise ValueError("BIN pattern must resolve to digits before the check digit")
-
-        check_digit = str(luhn_checksum(partial))
-        last_digit = digits[last_index]
-        if last_digit is None:
-            digits[last_index] = check_digit
-        elif last_digit != check_digit:
+        compiled = compile_bin_pattern(bin_pattern, length)
+        if not compiled.capacity:
             raise ValueError("BIN pattern conflicts with required Luhn check digit")
-
-        card_number = "".join(digit or "0" for digit in digits)
-        if not validate_luhn(card_number):
-            raise ValueError("Generated card number failed Luhn validation")
-        return card_number
+        return compiled.solve(self._digits.digits(len(compiled.index_slots)))
 
     def generate_cvv(self, card_type: str = "visa", length_override: Optional[int] = None) -> str:
         if length_override is not None:
             if length_override not in (3, 4):
                 raise ValueError("CVV length override must be 3 or 4 digits")
             target_length = length_override
-        elif card_type.lower() == "amex":
-            target_length = 4
         else:
-            target_length = 3
+            target_length = network_cvv_length(card_type)
 
-        return "".join(str(self._rand.randrange(0, 10)) for _ in range(target_length))
+        return self._digits.digits(target_length)
 
     def generate_expiry(
         self,
@@ -157,7 +722,7 @@ class CardGenerator:
             return f"{month:02d}", f"{full_year % 100:02d}"
 
         total_months = years_ahead * 12 + 1
-        offset = self._rand.randrange(0, total_months)
+        offset = self._digits.randbelow(total_months)
         expiry_month = ((current_month - 1 + offset) % 12) + 1
         expiry_year = current_year + (current_month - 1 + offset) // 12
         return f"{expiry_month:02d}", f"{expiry_year % 100:02d}"
@@ -171,15 +736,106 @@ class CardGenerator:
         years_ahead: int = 5,
         expiry_month: Optional[int] = None,
         expiry_year: Optional[int] = None,
-    ) -> List[CardRecord]:
+        engine: str = ENGINE_AUTO,
+        sampling: str = SAMPLING_RETRY,
+        seed: Optional[object] = None,
+        start: int = 0,
+        workers: int = 1,
+        as_batch: bool = False,
+        issued_index: Optional["IssuedIndex"] = None,
+        expiry_anchor: Optional[str] = None,
+    ) -> Union[List[CardRecord], CardBatch]:
+        """Generate ``count`` cards; ``as_batch=True`` returns a compact ``CardBatch``."""
+        cards = (
+            self.iter_cards(
+                bin_pattern,
+                count,
+                length=length,
+                cvv_length=cvv_length,
+                years_ahead=years_ahead,
+                expiry_month=expiry_month,
+                expiry_year=expiry_year,
+                engine=engine,
+                sampling=sampling,
+                seed=seed,
+                start=start,
+                workers=workers,
+                issued_index=issued_index,
+                expiry_anchor=expiry_anchor,
+            )
+        )
+        return CardBatch.from_records(cards) if as_batch else list(cards)
+
+    def iter_cards(
+        self,
+        bin_pattern: str,
+        count: int,
+        length: Optional[int] = None,
+        cvv_length: Optional[int] = None,
+        years_ahead: int = 5,
+        expiry_month: Optional[int] = None,
+        expiry_year: Optional[int] = None,
+        engine: str = ENGINE_AUTO,
+        unique: bool = True,
+        sampling: str = SAMPLING_RETRY,
+        seed: Optional[object] = None,
+        start: int = 0,
+        workers: int = 1,
+        expiry_anchor: Optional[str] = None,
+        issued_index: Optional["IssuedIndex"] = None,
+    ) -> Iterator[CardRecord]:
+        """Yield card records one at a time instead of building the whole list.
+
+        Arguments are validated eagerly so errors surface before any output is
+        written. With ``unique=False`` no set of issued numbers is kept, which keeps
+        memory flat for very large counts at the cost of possible repeats.
+        ``sampling="permutation"`` walks a keyed permutation of the wildcard space
+        instead, which is unique by construction, needs no set and never retries;
+        ``sampling="sequential"`` walks the same space in ascending order. Counts
+        above ``capacity()`` fail immediately, and retry sampling switches to a
+        permutation once the count exceeds half the capacity, or once a unique
+        run exceeds ``RETRY_UNIQUE_LIMIT`` cards so memory stays flat.
+
+        A ``seed`` makes the run reproducible: card ``start + i`` depends only on
+        ``(seed, start + i)``, so any slice can be regenerated independently. Seeded
+        runs always use permutation (or sequential) sampling. Random expiry dates
+        are offsets from the current UTC month, or from ``expiry_anchor``
+        (``"YYYY-MM"``) to pin them across months.
+
+        ``workers > 1`` splits the positions into shards generated by a process
+        pool. Shards are disjoint ranges of one keyed permutation, so uniqueness
+        needs no shared state; each worker writes its shard to a temporary file
+        and shards are streamed back in position order. Without a seed, a random
+        one is drawn for the run so that all workers share the permutation.
+
+        With an ``issued_index`` every yielded number is recorded in that
+        persistent index and numbers recorded by earlier runs are skipped.
+        """
         if count <= 0:
             raise ValueError("Count must be a positive integer")
-
-        card_type = detect_card_type(bin_pattern)
-        unique_numbers: Set[str] = set()
-        cards: List[CardRecord] = []
+        if engine not in (ENGINE_AUTO, ENGINE_PYTHON, ENGINE_NUMPY):
+            raise ValueError(f"Unknown engine: {engine}")
+        if engine == ENGINE_NUMPY and np is None:
+            raise RuntimeError("The numpy engine requires NumPy to be installed")
+        if sampling not in (SAMPLING_RETRY, SAMPLING_PERMUTATION, SAMPLING_SEQUENTIAL):
+            raise ValueError(f"Unknown sampling mode: {sampling}")
+        if cvv_length is not None and cvv_length not in (3, 4):
+            raise ValueError("CVV length override must be 3 or 4 digits")
+        if years_ahead < 0:
+            raise ValueError("years_ahead must be non-negative")
+        if start < 0:
+            raise ValueError("start must be non-negative")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if workers > 1 and seed is None:
+            seed = secrets.token_hex(16)
+        if (seed is not None or start) and sampling == SAMPLING_RETRY:
+            sampling = SAMPLING_PERMUTATION
+
+        compiled = compile_bin_pattern(bin_pattern, length)
+        card_type = compiled.card_type
+        expiry_labels = _expiry_labels(years_ahead, expiry_anchor)
         max_attempts = max(count * 10, 1000)
-        attempts = 0
 
         fixed_expiry: Optional[Tuple[str, str]] = None
         if expiry_month is not None or expiry_year is not None:
@@ -189,108 +845,817 @@ class CardGenerator:
                 year=expiry_year,
             )
 
-        while len(cards) < count:
+        use_numpy = engine == ENGINE_NUMPY or (
+            engine == ENGINE_AUTO and np is not None and count >= NUMPY_MIN_BATCH
+        )
+        if unique or sampling != SAMPLING_RETRY:
+            available = compiled.capacity - start
+            if count > available:
+                raise ValueError(
+                    f"Pattern allows only {compiled.capacity} distinct valid numbers; "
+                    f"requested {count} starting at {start}"
+                )
+            if sampling == SAMPLING_RETRY and (count > available // 2 or (unique and count > RETRY_UNIQUE_LIMIT)):
+                sampling = SAMPLING_PERMUTATION
+        if issued_index is not None:
+            options = {
+                "length": length,
+                "cvv_length": cvv_length,
+                "years_ahead": years_ahead,
+                "expiry_month": expiry_month,
+                "expiry_year": expiry_year,
+                "engine": engine,
+                "unique": unique,
+                "sampling": sampling,
+                "seed": seed,
+                "workers": workers,
+                "expiry_anchor": expiry_anchor,
+            }
+            return self._iter_cards_unissued(issued_index, compiled, bin_pattern, count, start, options)
+        if workers > 1:
+            options = {
+                "bin_pattern": bin_pattern,
+                "length": length,
+                "cvv_length": cvv_length,
+                "years_ahead": years_ahead,
+                "expiry_month": expiry_month,
+                "expiry_year": expiry_year,
+                "engine": engine,
+                "sampling": sampling,
+                "seed": seed,
+                "expiry_anchor": expiry_anchor,
+            }
+            return _iter_cards_sharded(options, count, start, workers)
+        if sampling != SAMPLING_RETRY:
+            return self._iter_cards_permuted(
+                compiled,
+                count,
+                card_type=card_type,
+                cvv_length=cvv_length,
+                expiry_labels=expiry_labels,
+                fixed_expiry=fixed_expiry,
+                use_numpy=use_numpy,
+                ordered=sampling == SAMPLING_SEQUENTIAL,
+                counter_random=CounterRandom(seed) if seed is not None else None,
+                start=start,
+            )
+        if use_numpy:
+            return self._iter_cards_numpy(
+                compiled,
+                count,
+                card_type=card_type,
+                cvv_length=cvv_length,
+                expiry_labels=expiry_labels,
+                fixed_expiry=fixed_expiry,
+                max_attempts=max_attempts,
+                unique=unique,
+            )
+        return self._iter_cards_python(
+            compiled,
+            count,
+            card_type=card_type,
+            cvv_length=cvv_length,
+            expiry_labels=expiry_labels,
+            fixed_expiry=fixed_expiry,
+            max_attempts=max_attempts,
+            unique=unique,
+        )
+
+    def _iter_cards_unissued(
+        self,
+        issued_index: "IssuedIndex",
+        compiled: BinPattern,
+        bin_pattern: str,
+        count: int,
+        start: int,
+        options: Dict[str, object],
+    ) -> Iterator[CardRecord]:
+        """Draw rounds of candidates and keep those the index has not seen yet.
+
+        Seeded and sequential runs reserve position ranges from the index's
+        high-water mark for their stream, so a run after an earlier one resumes
+        where it stopped instead of walking the issued positions again; only
+        numbers issued out of band are skipped by the claim. Unseeded runs draw
+        fresh random rounds until enough new numbers are found.
+        """
+        sampling = options["sampling"]
+        positional = sampling == SAMPLING_SEQUENTIAL or (
+            sampling == SAMPLING_PERMUTATION and options["seed"] is not None
+        )
+        stream = json.dumps(
+            [compiled.pattern, compiled.length, sampling, None if sampling == SAMPLING_SEQUENTIAL else options["seed"]]
+        )
+        produced = 0
+        drawn = 0
+        max_draws = max(count * 10, 1000)
+        while produced < count:
+            need = count - produced
+            if positional:
+                position = issued_index.reserve(stream, start, need, compiled.capacity)
+                if position is None:
+                    raise RuntimeError("Every number for this pattern has already been issued")
+                take = min(compiled.capacity - position, need)
+                candidates = self.iter_cards(bin_pattern, take, start=position, **options)
+            else:
+                if drawn >= max_draws:
+                    raise RuntimeError("Exceeded attempts while skipping already issued numbers")
+                candidates = self.iter_cards(bin_pattern, need, **options)
+            # Only numbers that are yielded get claimed, so chunks never exceed what is still needed.
+            while produced < count:
+                chunk = list(itertools.islice(candidates, min(ISSUED_BATCH_SIZE, count - produced)))
+                if not chunk:
+                    break
+                drawn += len(chunk)
+                fresh = set(issued_index.claim([card["number"] for card in chunk], compiled.prefix))
+                for card in chunk:
+                    if card["number"] in fresh:
+                        yield card
+                        produced += 1
+
+    def _iter_cards_python(
+        self,
+        compiled: BinPattern,
+        count: int,
+        *,
+        card_type: str,
+        cvv_length: Optional[int],
+        expiry_labels: List[Tuple[str, str]],
+        fixed_expiry: Optional[Tuple[str, str]],
+        max_attempts: int,
+        unique: bool,
+    ) -> Iterator[CardRecord]:
+        unique_numbers: Set[str] = set()
+        produced = 0
+        attempts = 0
+        draw_digits = self._digits.digits
+        index_count = len(compiled.index_slots)
+        solve = compiled.solve
+        if not compiled.capacity:
+            raise ValueError("BIN pattern conflicts with required Luhn check digit")
+
+        while produced < count:
             attempts += 1
             if attempts > max_attempts:
                 raise RuntimeError("Exceeded attempts while generating unique cards")
 
-            number = self.generate_from_bin(bin_pattern, length)
-            if number in unique_numbers:
-                continue
-            unique_numbers.add(number)
+            number = solve(draw_digits(index_count))
+            if unique:
+                if number in unique_numbers:
+                    continue
+                unique_numbers.add(number)
 
             cvv = self.generate_cvv(card_type=card_type, length_override=cvv_length)
-            if fixed_expiry is not None:
-                exp_month, exp_year = fixed_expiry
+            exp_month, exp_year = fixed_expiry or expiry_labels[
+                self._digits.randbelow(len(expiry_labels))
+            ]
+
+            produced += 1
+            yield {
+                "number": number,
+                "cvv": cvv,
+                "exp_month": exp_month,
+                "exp_year": exp_year,
+            }
+
+    def _iter_cards_numpy(
+        self,
+        compiled: BinPattern,
+        count: int,
+        *,
+        card_type: str,
+        cvv_length: Optional[int],
+        expiry_labels: List[Tuple[str, str]],
+        fixed_expiry: Optional[Tuple[str, str]],
+        max_attempts: int,
+        unique: bool,
+    ) -> Iterator[CardRecord]:
+        """Vectorized generation: fill wildcard slots for a whole batch at once."""
+        index_count = len(compiled.index_slots)
+        if not compiled.capacity:
+            raise ValueError("BIN pattern conflicts with required Luhn check digit")
+
+        cvv_digits = cvv_length or compiled.network.cvv_length
+        unique_numbers: Set[str] = set()
+        produced = 0
+        attempts = 0
+        while produced < count:
+            if attempts >= max_attempts:
+                raise RuntimeError("Exceeded attempts while generating unique cards")
+            batch = min(count - produced, ITER_BATCH_SIZE, max_attempts - attempts)
+            attempts += batch
+
+            index_digits = _np_random_below(batch * index_count, 10).reshape(batch, index_count)
+            numbers = _np_digits_to_strings(compiled.np_solve(index_digits))
+            if unique:
+                fresh: List[str] = []
+                for number in numbers:
+                    if number in unique_numbers:
+                        continue
+                    unique_numbers.add(number)
+                    fresh.append(number)
+                numbers = fresh
+            if not numbers:
+                continue
+
+            produced += len(numbers)
+            yield from _np_card_records(numbers, cvv_digits, fixed_expiry, expiry_labels)
+
+    def _iter_cards_permuted(
+        self,
+        compiled: BinPattern,
+        count: int,
+        *,
+        card_type: str,
+        cvv_length: Optional[int],
+        expiry_labels: List[Tuple[str, str]],
+        fixed_expiry: Optional[Tuple[str, str]],
+        use_numpy: bool,
+        ordered: bool = False,
+        counter_random: Optional[CounterRandom] = None,
+        start: int = 0,
+    ) -> Iterator[CardRecord]:
+        """Yield the valid numbers at positions ``start .. start + count - 1`` of a permutation.
+
+        With ``ordered=True`` the identity permutation is used, which yields every
+        valid number in ascending order. With ``counter_random`` the permutation key,
+        CVV and expiry all derive from the seed, so each position is reproducible on
+        its own.
+        """
+        key = counter_random.permutation_key if counter_random is not None else None
+        permutation = KeyedPermutation(compiled.capacity, key=key)
+        cvv_digits = cvv_length or compiled.network.cvv_length
+        end = start + count
+
+        if use_numpy:
+            for batch_start in range(start, end, ITER_BATCH_SIZE):
+                positions = np.arange(
+                    batch_start, min(batch_start + ITER_BATCH_SIZE, end), dtype=np.uint64
+                )
+                indices = positions if ordered else permutation.permute_array(positions)
+                numbers = _np_digits_to_strings(compiled.np_rows_at(indices))
+                if counter_random is None:
+                    yield from _np_card_records(numbers, cvv_digits, fixed_expiry, expiry_labels)
+                    continue
+                cvvs, offsets = counter_random.np_card_extras(
+                    positions, cvv_digits, len(expiry_labels)
+                )
+                for number, cvv, offset in zip(numbers, cvvs, offsets):
+                    exp_month, exp_year = fixed_expiry or expiry_labels[offset]
+                    yield {
+                        "number": number,
+                        "cvv": cvv,
+                        "exp_month": exp_month,
+                        "exp_year": exp_year,
+                    }
+            return
+
+        for position in range(start, end):
+            number = compiled.number_at(position if ordered else permutation[position])
+            if counter_random is not None:
+                cvv, offset = counter_random.card_extras(position, cvv_digits, len(expiry_labels))
+                exp_month, exp_year = fixed_expiry or expiry_labels[offset]
             else:
-                exp_month, exp_year = self.generate_expiry(years_ahead=years_ahead)
-
-            cards.append(
-                {
-                    "number": number,
-                    "cvv": cvv,
-                    "exp_month": exp_month,
-                    "exp_year": exp_year,
-                }
+                cvv = self._digits.digits(cvv_digits)
+                exp_month, exp_year = fixed_expiry or expiry_labels[
+                    self._digits.randbelow(len(expiry_labels))
+                ]
+            yield {
+                "number": number,
+                "cvv": cvv,
+                "exp_month": exp_month,
+                "exp_year": exp_year,
+            }
+
+    def capacity(self, bin_pattern: str, length: Optional[int] = None) -> int:
+        """Return the exact number of distinct Luhn-valid numbers a pattern can produce."""
+        return compile_bin_pattern(bin_pattern, length).capacity
+
+
+# ---------------------------------------------------------------------------
+# Sharded generation
+# ---------------------------------------------------------------------------
+
+def _shard_pool(processes: int) -> "multiprocessing.pool.Pool":
+    return multiprocessing.get_context(SHARD_START_METHOD).Pool(processes)
+
+
+def _generate_shard(options: Dict[str, object]) -> "CardBatch":
+    """Pool worker: generate one shard of cards as packed ``CardBatch`` columns."""
+    return CardBatch.from_records(CardGenerator().iter_cards(**options))
+
+
+class _ShardedCards:
+    """Iterator over the cards of finished shards, in order.
+
+    Iterating yields ``CardRecord`` dicts; ``_iter_chunks`` instead takes the
+    remaining rows shard by shard through ``batches``, so writers render the
+    packed columns directly.
+    """
+
+    def __init__(self, batches: Iterator["CardBatch"]) -> None:
+        self._batches = batches
+        self._batch = CardBatch(b"", b"", b"", 0, 0)
+        self._offset = 0
+        self._records: Iterator[CardRecord] = iter(())
+
+    def __iter__(self) -> "_ShardedCards":
+        return self
+
+    def __next__(self) -> CardRecord:
+        for record in self._records:
+            self._offset += 1
+            return record
+        self._batch = next(self._batches)
+        self._offset = 0
+        self._records = self._batch.iter_records()
+        return next(self)
+
+    def batches(self) -> Iterator["CardBatch"]:
+        if self._offset < len(self._batch):
+            rest = self._batch[self._offset:]
+            self._offset = len(self._batch)
+            self._records = iter(())
+            yield rest
+        yield from self._batches
+
+
+def _iter_cards_sharded(
+    options: Dict[str, object], count: int, start: int, workers: int
+) -> Iterator[CardRecord]:
+    return _ShardedCards(_iter_shard_batches(options, count, start, workers))
+
+
+def _iter_shard_batches(
+    options: Dict[str, object], count: int, start: int, workers: int
+) -> Iterator["CardBatch"]:
+    end = start + count
+    shard_size = min(SHARD_MAX_SIZE, max(-(-count // (workers * 4)), SHARD_MIN_SIZE))
+    tasks = (
+        dict(options, start=shard_start, count=min(shard_size, end - shard_start))
+        for shard_start in range(start, end, shard_size)
+    )
+    processes = min(workers, -(-count // shard_size))
+    # Shards are submitted in a bounded window, so finished batches waiting for the
+    # consumer never hold more than a few shards in memory.
+    pending: "collections.deque[multiprocessing.pool.AsyncResult[CardBatch]]" = collections.deque()
+    with _shard_pool(processes) as pool:
+        for task in itertools.islice(tasks, processes * SHARDS_PER_WORKER):
+            pending.append(pool.apply_async(_generate_shard, (task,)))
+        while pending:
+            batch = pending.popleft().get()
+            for task in itertools.islice(tasks, 1):
+                pending.append(pool.apply_async(_generate_shard, (task,)))
+            yield batch
+
+
+# ---------------------------------------------------------------------------
+# Issued-number index
+# ---------------------------------------------------------------------------
+
+ISSUED_BATCH_SIZE = 8192
+ISSUED_LOOKUP_SIZE = 500
+
+
+class IssuedIndex:
+    """Persistent record of every card number already handed out, in SQLite.
+
+    Numbers are the primary key of a ``WITHOUT ROWID`` table, so a lookup is one
+    B-tree search however many numbers are stored; each row also records the BIN
+    prefix. The database runs in WAL mode. ``claim`` checks and records a whole
+    batch inside one ``BEGIN IMMEDIATE`` transaction, so concurrent runs that
+    share the file never both receive the same number.
+
+    A second table keeps a high-water position per positional stream (pattern,
+    length, sampling and seed); ``reserve`` hands out disjoint position ranges
+    from it, so seeded runs resume without rescanning earlier positions.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._connection = sqlite3.connect(path, isolation_level=None, timeout=60)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS issued (number TEXT PRIMARY KEY, bin TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS positions (stream TEXT PRIMARY KEY, position INTEGER NOT NULL) WITHOUT ROWID"
+        )
+
+    def __enter__(self) -> "IssuedIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def claim(self, numbers: Sequence[str], bin_prefix: str) -> List[str]:
+        """Record ``numbers`` and return those that had not been issued before, in order."""
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            issued: Set[str] = set()
+            for offset in range(0, len(numbers), ISSUED_LOOKUP_SIZE):
+                batch = numbers[offset:offset + ISSUED_LOOKUP_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                issued.update(
+                    row[0]
+                    for row in connection.execute(
+                        f"SELECT number FROM issued WHERE number IN ({placeholders})", batch
+                    )
+                )
+            fresh = [number for number in dict.fromkeys(numbers) if number not in issued]
+            connection.executemany(
+                "INSERT INTO issued (number, bin) VALUES (?, ?)",
+                ((number, bin_prefix) for number in fresh),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return fresh
+
+    def reserve(self, stream: str, start: int, count: int, capacity: int) -> Optional[int]:
+        """Reserve up to ``count`` positions of ``stream`` at or after ``start``.
+
+        Returns the first reserved position, or None once ``capacity`` is reached.
+        """
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT position FROM positions WHERE stream = ?", (stream,)).fetchone()
+            position = max(start, row[0] if row else 0)
+            if position >= capacity:
+                connection.execute("COMMIT")
+                return None
+            connection.execute(
+                "INSERT OR REPLACE INTO positions (stream, position) VALUES (?, ?)",
+                (stream, min(capacity, position + count)),
             )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return position
 
-        return cards
-
-    def _normalize_pattern(self, bin_pattern: str) -> str:
-        if not bin_pattern:
-            raise ValueError("BIN pattern must not be empty")
-        pattern = bin_pattern.replace(" ", "").lower()
-        allowed = set("0123456789x")
-        if any(char not in allowed for char in pattern):
-            raise ValueError("BIN pattern may contain only digits and 'x'")
-        return pattern
-
-    def _extract_prefix(self, pattern: str) -> str:
-        digits = []
-        for char in pattern:
-            if char.isdigit():
-                digits.append(char)
-            else:
-                break
-        prefix = "".join(digits)
-        if not prefix.isdigit():
-            raise ValueError("BIN pattern must start with digits")
-        if not (BIN_MIN_LENGTH <= len(prefix) <= BIN_MAX_LENGTH):
-            raise ValueError("BIN must be 6-9 digits long before placeholders")
-        return prefix
-
-    def _determine_length(self, pattern: str, length: Optional[int]) -> int:
-        if length is None:
-            inferred = len(pattern) if "x" in pattern else max(len(pattern), 16)
-        else:
-            inferred = length
-        if not (MIN_CARD_LENGTH <= inferred <= MAX_CARD_LENGTH):
-            raise ValueError("Card length must be between 13 and 19 digits")
-        return inferred
+    def count(self, bin_prefix: Optional[str] = None) -> int:
+        if bin_prefix is None:
+            return self._connection.execute("SELECT COUNT(*) FROM issued").fetchone()[0]
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM issued WHERE bin = ?", (bin_prefix,)
+        ).fetchone()[0]
 
 
 # ---------------------------------------------------------------------------
-# Card type detection
+# Card network classification
 # ---------------------------------------------------------------------------
+# Networks are looked up in a digit trie built once from inclusive prefix
+# ranges, so classifying a number costs one dict step per leading digit and the
+# longest matching prefix wins (e.g. Verve 650002 inside Discover 65).
+
+
+class CardNetwork(NamedTuple):
+    """A card network: default and allowed number lengths plus its CVV length."""
+
+    name: str
+    length: int
+    lengths: Tuple[int, ...]
+    cvv_length: int
+
+
+UNKNOWN_NETWORK = CardNetwork("unknown", 16, tuple(range(MIN_CARD_LENGTH, MAX_CARD_LENGTH + 1)), 3)
+CARD_NETWORKS: Dict[str, CardNetwork] = {
+    network.name: network
+    for network in (
+        CardNetwork("visa", 16, (13, 16, 19), 3),
+        CardNetwork("mastercard", 16, (16,), 3),
+        CardNetwork("amex", 15, (15,), 4),
+        CardNetwork("discover", 16, (16, 17, 18, 19), 3),
+        CardNetwork("jcb", 16, (16, 17, 18, 19), 3),
+        CardNetwork("diners", 14, (14, 15, 16, 17, 18, 19), 3),
+        CardNetwork("unionpay", 16, (16, 17, 18, 19), 3),
+        CardNetwork("maestro", 16, (13, 14, 15, 16, 17, 18, 19), 3),
+        CardNetwork("mir", 16, (16, 17, 18, 19), 3),
+        CardNetwork("rupay", 16, (16,), 3),
+        CardNetwork("verve", 16, (16, 18, 19), 3),
+        UNKNOWN_NETWORK,
+    )
+}
+CARD_NETWORK_RANGES: Tuple[Tuple[str, str, str], ...] = (
+    ("4", "4", "visa"),
+    ("51", "55", "mastercard"),
+    ("2221", "2720", "mastercard"),
+    ("34", "34", "amex"),
+    ("37", "37", "amex"),
+    ("6011", "6011", "discover"),
+    ("644", "649", "discover"),
+    ("65", "65", "discover"),
+    ("3528", "3589", "jcb"),
+    ("300", "305", "diners"),
+    ("3095", "3095", "diners"),
+    ("36", "36", "diners"),
+    ("38", "39", "diners"),
+    ("62", "62", "unionpay"),
+    ("5018", "5018", "maestro"),
+    ("5020", "5020", "maestro"),
+    ("5038", "5038", "maestro"),
+    ("5893", "5893", "maestro"),
+    ("6304", "6304", "maestro"),
+    ("6759", "6759", "maestro"),
+    ("6761", "6763", "maestro"),
+    ("2200", "2204", "mir"),
+    ("508", "508", "rupay"),
+    ("6521", "6522", "rupay"),
+    ("506099", "506198", "verve"),
+    ("650002", "650027", "verve"),
+)
+# Each trie node maps a digit to [network ending at that prefix or None, child node].
+NetworkTrie = Dict[str, list]
+
+
+def _build_network_trie(ranges: Iterable[Tuple[str, str, str]]) -> Tuple[NetworkTrie, int]:
+    root: NetworkTrie = {}
+    depth = 0
+    for first, last, name in ranges:
+        if len(first) != len(last) or first > last:
+            raise ValueError(f"Invalid card network range {first}-{last}")
+        depth = max(depth, len(first))
+        for value in range(int(first), int(last) + 1):
+            prefix = str(value).zfill(len(first))
+            node = root
+            for digit in prefix[:-1]:
+                node = node.setdefault(digit, [None, {}])[1]
+            entry = node.setdefault(prefix[-1], [None, {}])
+            if entry[0] is not None:
+                raise ValueError(f"Card network prefix {prefix} is listed twice")
+            entry[0] = CARD_NETWORKS[name]
+    return root, depth
+
+
+NETWORK_TRIE, NETWORK_PREFIX_DEPTH = _build_network_trie(CARD_NETWORK_RANGES)
+
+
+def classify_card_network(number: str) -> CardNetwork:
+    """Return the network of the longest known prefix of ``number`` (a card number or BIN pattern).
+
+    Spaces and dashes are skipped; the walk stops at the first other non-digit,
+    such as an ``x`` placeholder.
+    """
+    node, found = NETWORK_TRIE, UNKNOWN_NETWORK
+    for char in number:
+        if char in " -":
+            continue
+        entry = node.get(char)
+        if entry is None:
+            break
+        if entry[0] is not None:
+            found = entry[0]
+        node = entry[1]
+        if not node:
+            break
+    return found
+
+
+def classify_card_networks(numbers: Iterable[str]) -> List[CardNetwork]:
+    """Classify many plain-digit numbers, walking the trie once per distinct leading prefix.
+
+    A ``CardBatch`` is classified straight from its packed number column.
+    """
+    if isinstance(numbers, CardBatch):
+        packed, width = numbers.numbers, numbers.number_width
+        numbers = [
+            packed[offset:offset + NETWORK_PREFIX_DEPTH].decode("ascii")
+            for offset in range(0, len(packed), width)
+        ]
+    memo: Dict[str, CardNetwork] = {}
+    networks: List[CardNetwork] = []
+    for number in numbers:
+        prefix = number[:NETWORK_PREFIX_DEPTH]
+        network = memo.get(prefix)
+        if network is None:
+            network = memo[prefix] = classify_card_network(prefix)
+        networks.append(network)
+    return networks
+
+
+def network_cvv_length(card_type: str) -> int:
+    return CARD_NETWORKS.get(card_type.lower(), UNKNOWN_NETWORK).cvv_length
+
 
 def detect_card_type(bin_pattern: str) -> str:
-    digits = "".join(char for char in bin_pattern if char.isdigit())
-    if not digits:
-        return "unknown"
+    """Name the network of the digits in ``bin_pattern``, ignoring every non-digit."""
+    return classify_card_network("".join(char for char in bin_pattern if char.isdigit())).name
+
+
+# ---------------------------------------------------------------------------
+# Columnar card batches
+# ---------------------------------------------------------------------------
+
+class Field(NamedTuple):
+    """A column reference inside a row layout passed to ``CardBatch.join_columns``."""
+
+    name: str
+
+
+RowParts = Sequence[Union[str, Field]]
+
+
+class CardRow(Mapping):
+    """Read-only view of one row of a ``CardBatch``; behaves like a ``CardRecord``."""
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: "CardBatch", index: int) -> None:
+        self._batch = batch
+        self._index = index
 
-    if digits.startswith("4"):
-        return "visa"
+    def __getitem__(self, key: str) -> str:
+        return self._batch.field(key, self._index)
 
-    first_two = digits[:2]
-    if first_two in {"51", "52", "53", "54", "55"}:
-        return "mastercard"
+    def __iter__(self) -> Iterator[str]:
+        return iter(CARD_FIELDS)
 
-    if len(digits) >= 4:
-        first_four = int(digits[:4])
-        if 2221 <= first_four <= 2720:
-            return "mastercard"
+    def __len__(self) -> int:
+        return len(CARD_FIELDS)
 
-    if first_two in {"34", "37"}:
-        return "amex"
+    def __repr__(self) -> str:
+        return f"CardRow({dict(self)!r})"
 
-    if len(digits) >= 4 and digits[:4] == "6011":
-        return "discover"
 
-    if first_two in {"64", "65"}:
-        return "discover"
+class CardBatch:
+    """Cards stored column-wise as packed ASCII digits.
 
-    return "unknown"
+    Numbers, CVVs and ``MMYY`` expiries live in three contiguous byte buffers of
+    fixed width, about 23 bytes per 16-digit card instead of a dict holding four
+    strings. Indexing yields ``CardRow`` views and strings are only materialized
+    when a field is read. All rows share one number length and one CVV length.
+    """
+
+    __slots__ = ("numbers", "cvvs", "expiries", "number_width", "cvv_width")
+
+    def __init__(
+        self,
+        numbers: bytes,
+        cvvs: bytes,
+        expiries: bytes,
+        number_width: int,
+        cvv_width: int,
+    ) -> None:
+        count = len(expiries) // 4
+        if len(expiries) != count * 4 or len(numbers) != count * number_width or len(cvvs) != count * cvv_width:
+            raise ValueError("CardBatch columns do not describe the same number of rows")
+        self.numbers = numbers
+        self.cvvs = cvvs
+        self.expiries = expiries
+        self.number_width = number_width
+        self.cvv_width = cvv_width
+
+    @classmethod
+    def from_records(cls, records: Iterable[CardRecord]) -> "CardBatch":
+        numbers = bytearray()
+        cvvs = bytearray()
+        expiries = bytearray()
+        number_width: Optional[int] = None
+        cvv_width: Optional[int] = None
+        for chunk in _iter_chunks(records, WRITE_CHUNK_SIZE):
+            if number_width is None:
+                number_width = len(chunk[0]["number"])
+                cvv_width = len(chunk[0]["cvv"])
+            for card in chunk:
+                if (
+                    len(card["number"]) != number_width
+                    or len(card["cvv"]) != cvv_width
+                    or len(card["exp_month"]) != 2
+                    or len(card["exp_year"]) != 2
+                ):
+                    raise ValueError("CardBatch rows must share one number length and CVV length")
+            numbers += "".join(card["number"] for card in chunk).encode("ascii")
+            cvvs += "".join(card["cvv"] for card in chunk).encode("ascii")
+            expiries += "".join(card["exp_month"] + card["exp_year"] for card in chunk).encode("ascii")
+        return cls(bytes(numbers), bytes(cvvs), bytes(expiries), number_width or 0, cvv_width or 0)
+
+    def __len__(self) -> int:
+        return len(self.expiries) // 4
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[CardRow, "CardBatch"]:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("CardBatch slices must be contiguous")
+            stop = max(start, stop)
+            return CardBatch(
+                self.numbers[start * self.number_width:stop * self.number_width],
+                self.cvvs[start * self.cvv_width:stop * self.cvv_width],
+                self.expiries[start * 4:stop * 4],
+                self.number_width,
+                self.cvv_width,
+            )
+        count = len(self)
+        if key < 0:
+            key += count
+        if not 0 <= key < count:
+            raise IndexError("CardBatch index out of range")
+        return CardRow(self, key)
+
+    def __iter__(self) -> Iterator[CardRow]:
+        return (CardRow(self, index) for index in range(len(self)))
+
+    def field(self, name: str, index: int) -> str:
+        if name == "number":
+            width = self.number_width
+            return self.numbers[index * width:(index + 1) * width].decode("ascii")
+        if name == "cvv":
+            width = self.cvv_width
+            return self.cvvs[index * width:(index + 1) * width].decode("ascii")
+        if name == "exp_month":
+            return self.expiries[index * 4:index * 4 + 2].decode("ascii")
+        if name == "exp_year":
+            return self.expiries[index * 4 + 2:index * 4 + 4].decode("ascii")
+        raise KeyError(name)
+
+    def to_records(self) -> List[CardRecord]:
+        return list(self.iter_records())
+
+    def iter_records(self) -> Iterator[CardRecord]:
+        """Yield every row as a plain ``CardRecord``, decoding each column once."""
+        if not len(self):
+            return
+        columns = [self._column_strings(name) for name in CARD_FIELDS]
+        for number, cvv, exp_month, exp_year in zip(*columns):
+            yield {"number": number, "cvv": cvv, "exp_month": exp_month, "exp_year": exp_year}
+
+    def join_columns(self, parts: RowParts) -> bytes:
+        """Render every row as the concatenation of ``parts`` and return the bytes.
+
+        ``Field`` entries select a column and plain strings are copied literally. With
+        NumPy the rows are assembled as one byte matrix; otherwise row by row.
+        """
+        count = len(self)
+        if np is not None:
+            pieces = [
+                self._np_column(part.name) if isinstance(part, Field)
+                else np.frombuffer(part.encode("utf-8"), dtype=np.uint8)
+                for part in parts
+            ]
+            widths = [piece.shape[-1] for piece in pieces]
+            out = np.empty((count, sum(widths)), dtype=np.uint8)
+            offset = 0
+            for piece, width in zip(pieces, widths):
+                out[:, offset:offset + width] = piece
+                offset += width
+            return out.tobytes()
+
+        columns = {name: self._column_strings(name) for name in CARD_FIELDS}
+        selectors = [
+            columns[part.name] if isinstance(part, Field) else itertools.repeat(part, count)
+            for part in parts
+        ]
+        return "".join("".join(row) for row in zip(*selectors)).encode("utf-8")
+
+    def _np_column(self, name: str) -> "np.ndarray":
+        count = len(self)
+        if name == "number":
+            return np.frombuffer(self.numbers, dtype=np.uint8).reshape(count, self.number_width)
+        if name == "cvv":
+            return np.frombuffer(self.cvvs, dtype=np.uint8).reshape(count, self.cvv_width)
+        expiries = np.frombuffer(self.expiries, dtype=np.uint8).reshape(count, 4)
+        if name == "exp_month":
+            return expiries[:, :2]
+        if name == "exp_year":
+            return expiries[:, 2:]
+        raise KeyError(name)
+
+    def _column_strings(self, name: str) -> List[str]:
+        if name == "number":
+            buffer, width, offset = self.numbers, self.number_width, 0
+        elif name == "cvv":
+            buffer, width, offset = self.cvvs, self.cvv_width, 0
+        elif name == "exp_month":
+            buffer, width, offset = self.expiries, 4, 0
+        elif name == "exp_year":
+            buffer, width, offset = self.expiries, 4, 2
+        else:
+            raise KeyError(name)
+        text = buffer.decode("ascii")
+        size = 2 if name.startswith("exp_") else width
+        return [text[start + offset:start + offset + size] for start in range(0, len(text), width)]
 
 
 # ---------------------------------------------------------------------------
 # Output formatters
 # ---------------------------------------------------------------------------
 
-def format_plain(cards: List[CardRecord]) -> str:
+def format_plain(cards: Iterable[CardRecord]) -> str:
+    if isinstance(cards, CardBatch):
+        return _format_with_layout(cards, LAYOUTS["plain"])
     return "\n".join(card["number"] for card in cards)
 
 
-def format_pipe(cards: List[CardRecord]) -> str:
+def format_pipe(cards: Iterable[CardRecord]) -> str:
+    if isinstance(cards, CardBatch):
+        return _format_with_layout(cards, LAYOUTS["pipe"])
     lines = [
         f"{card['number']}|{card['exp_month']}|{card['exp_year']}|{card['cvv']}"
         for card in cards
@@ -298,61 +1663,2026 @@ def format_pipe(cards: List[CardRecord]) -> str:
     return "\n".join(lines)
 
 
-def format_csv(cards: List[CardRecord]) -> str:
-    buffer = io.StringIO()
-    writer = csv.writer(buffer)
-    writer.writerow(["card_number", "exp_month", "exp_year", "cvv"])
+def format_csv(cards: Iterable[CardRecord]) -> str:
+    if isinstance(cards, CardBatch):
+        return _format_with_layout(cards, LAYOUTS["csv"])
+    layout = LAYOUTS["csv"]
+    return (layout.header + layout.render_records(list(cards), True)).rstrip("\n")
+
+
+def format_json(cards: Iterable[CardRecord]) -> str:
+    if isinstance(cards, CardBatch):
+        return _format_with_layout(cards, LAYOUTS["json"])
+    return json.dumps([dict(card) for card in cards], indent=2)
+
+
+def format_jsonl(cards: Iterable[CardRecord]) -> str:
+    if isinstance(cards, CardBatch):
+        return _format_with_layout(cards, LAYOUTS["jsonl"])
+    return "\n".join(json.dumps({field: card[field] for field in CARD_FIELDS}) for card in cards)
+
+
+def _format_with_layout(cards: Iterable[CardRecord], layout: TextLayout) -> str:
+    if not isinstance(cards, CardBatch):
+        cards = list(cards)
+    empty = not len(cards)
+    rendered = layout.header + ("" if empty else layout.render(cards, True)) + layout.footer(empty)
+    return rendered[:-1] if rendered.endswith("\n") else rendered
+
+
+FORMATTERS: Dict[str, Callable[[Iterable[CardRecord]], str]] = {
+    "plain": format_plain,
+    "pipe": format_pipe,
+    "csv": format_csv,
+    "json": format_json,
+    "jsonl": format_jsonl,
+}
+
+
+# ---------------------------------------------------------------------------
+# Streaming writers
+# ---------------------------------------------------------------------------
+# Each writer produces the same text as its formatter plus a trailing newline,
+# but consumes the cards lazily and writes them in bounded chunks.
+
+WRITE_CHUNK_SIZE = 8192
+
+
+def _iter_chunks(cards: Iterable[CardRecord], size: int) -> Iterator[Sequence[CardRecord]]:
+    if isinstance(cards, (CardBatch, _ShardedCards)):
+        batches = cards.batches() if isinstance(cards, _ShardedCards) else [cards]
+        for batch in batches:
+            for offset in range(0, len(batch), size):
+                yield batch[offset:offset + size]
+        return
+    iterator = iter(cards)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class TextLayout:
+    """Renders one output format as a header, row chunks and a footer.
+
+    Layouts that set ``row_parts`` render ``CardBatch`` chunks column-wise through
+    ``CardBatch.join_columns`` instead of visiting each record.
+    """
+
+    header = ""
+    row_parts: Optional[RowParts] = None
+
+    def render(self, cards: Sequence[CardRecord], first: bool) -> str:
+        """Render a chunk of rows; ``first`` is True for the first chunk of the output."""
+        if self.row_parts is not None and isinstance(cards, CardBatch):
+            return cards.join_columns(self.row_parts).decode("utf-8")
+        return self.render_records(cards, first)
+
+    def render_records(self, cards: Sequence[CardRecord], first: bool) -> str:
+        raise NotImplementedError
+
+    def footer(self, empty: bool) -> str:
+        return ""
+
+
+class PlainLayout(TextLayout):
+    row_parts = (Field("number"), "\n")
+
+    def render_records(self, cards: Sequence[CardRecord], first: bool) -> str:
+        return "".join(card["number"] + "\n" for card in cards)
+
+
+class PipeLayout(TextLayout):
+    row_parts = (
+        Field("number"), "|", Field("exp_month"), "|", Field("exp_year"), "|", Field("cvv"), "\n",
+    )
+
+    def render_records(self, cards: Sequence[CardRecord], first: bool) -> str:
+        return "".join(
+            f"{card['number']}|{card['exp_month']}|{card['exp_year']}|{card['cvv']}\n"
+            for card in cards
+        )
+
+
+class CsvLayout(TextLayout):
+    header = "card_number,exp_month,exp_year,cvv\r\n"
+    # Card fields are digits only, so rows never need CSV quoting.
+    row_parts = (
+        Field("number"), ",", Field("exp_month"), ",", Field("exp_year"), ",", Field("cvv"), "\r\n",
+    )
+
+    def render_records(self, cards: Sequence[CardRecord], first: bool) -> str:
+        return "".join(
+            f"{card['number']},{card['exp_month']},{card['exp_year']},{card['cvv']}\r\n"
+            for card in cards
+        )
+
+
+class JsonLayout(TextLayout):
+    header = "["
+    row_parts = (
+        '  {\n    "number": "', Field("number"),
+        '",\n    "cvv": "', Field("cvv"),
+        '",\n    "exp_month": "', Field("exp_month"),
+        '",\n    "exp_year": "', Field("exp_year"),
+        '"\n  },\n',
+    )
+
+    def render(self, cards: Sequence[CardRecord], first: bool) -> str:
+        if isinstance(cards, CardBatch):
+            rendered = cards.join_columns(self.row_parts).decode("utf-8")[:-2]
+        else:
+            rendered = self.render_records(cards, first)
+        return ("\n" if first else ",\n") + rendered
+
+    def render_records(self, cards: Sequence[CardRecord], first: bool) -> str:
+        return ",\n".join(
+            "  " + json.dumps(dict(card), indent=2).replace("\n", "\n  ") for card in cards
+        )
+
+    def footer(self, empty: bool) -> str:
+        return "]\n" if empty else "\n]\n"
+
+
+class JsonLinesLayout(TextLayout):
+    row_parts = (
+        '{"number": "', Field("number"),
+        '", "cvv": "', Field("cvv"),
+        '", "exp_month": "', Field("exp_month"),
+        '", "exp_year": "', Field("exp_year"),
+        '"}\n',
+    )
+
+    def render_records(self, cards: Sequence[CardRecord], first: bool) -> str:
+        return "".join(
+            json.dumps({field: card[field] for field in CARD_FIELDS}) + "\n" for card in cards
+        )
+
+
+LAYOUTS: Dict[str, TextLayout] = {
+    "plain": PlainLayout(),
+    "pipe": PipeLayout(),
+    "csv": CsvLayout(),
+    "json": JsonLayout(),
+    "jsonl": JsonLinesLayout(),
+}
+
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+class CardSink:
+    """Buffered binary destination that ``write_cards`` can write text chunks to.
+
+    Rendered text is encoded into a memory buffer that is passed to the underlying
+    binary stream, and flushed, every time it reaches ``buffer_size`` bytes and on
+    ``close``. Output therefore reaches the OS in large writes and never lags by
+    more than one buffer. Files and stdout share this path.
+    """
+
+    def __init__(self, raw: BinaryIO, *, buffer_size: int = WRITE_BUFFER_SIZE, owns: bool = False) -> None:
+        self._raw = raw
+        self._buffer = bytearray()
+        self._buffer_size = buffer_size
+        self._owns = owns
+
+    def write(self, text: str) -> int:
+        self._buffer += text.encode("utf-8")
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._raw.write(self._buffer)
+            self._buffer.clear()
+        self._raw.flush()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            if self._owns:
+                self._raw.close()
+
+    def __enter__(self) -> "CardSink":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def open_card_sink(
+    output: Optional[str] = None,
+    compress: Optional[str] = None,
+    threads: Optional[int] = None,
+) -> CardSink:
+    """Open a ``CardSink`` on ``output``, or on stdout when no path is given.
+
+    ``compress`` names one of ``COMPRESSORS``; the output is then written through a
+    ``BlockCompressor`` using ``threads`` compression threads.
+    """
+    if compress is not None and compress not in COMPRESSORS:
+        raise ValueError(f"Unknown compression method: {compress}")
+    if output is not None:
+        raw: BinaryIO = open(output, "wb", buffering=0)
+        owns = True
+    else:
+        sys.stdout.flush()
+        raw = sys.stdout.buffer
+        owns = False
+    if compress is not None:
+        return CardSink(BlockCompressor(raw, compress, threads=threads, owns=owns), owns=True)
+    return CardSink(raw, owns=owns)
+
+
+def write_cards(cards: Iterable[CardRecord], stream: TextIO, layout: TextLayout) -> None:
+    """Stream ``cards`` through ``layout`` to a text stream or ``CardSink`` in bounded chunks."""
+    stream.write(layout.header)
+    first = True
+    for chunk in _iter_chunks(cards, WRITE_CHUNK_SIZE):
+        stream.write(layout.render(chunk, first))
+        first = False
+    stream.write(layout.footer(first))
+
+
+def write_plain(cards: Iterable[CardRecord], stream: TextIO) -> None:
+    write_cards(cards, stream, LAYOUTS["plain"])
+
+
+def write_pipe(cards: Iterable[CardRecord], stream: TextIO) -> None:
+    write_cards(cards, stream, LAYOUTS["pipe"])
+
+
+def write_csv(cards: Iterable[CardRecord], stream: TextIO) -> None:
+    write_cards(cards, stream, LAYOUTS["csv"])
+
+
+def write_json(cards: Iterable[CardRecord], stream: TextIO) -> None:
+    write_cards(cards, stream, LAYOUTS["json"])
+
+
+def write_jsonl(cards: Iterable[CardRecord], stream: TextIO) -> None:
+    write_cards(cards, stream, LAYOUTS["jsonl"])
+
+
+WRITERS: Dict[str, Callable[[Iterable[CardRecord], TextIO], None]] = {
+    "plain": write_plain,
+    "pipe": write_pipe,
+    "csv": write_csv,
+    "json": write_json,
+    "jsonl": write_jsonl,
+}
+
+
+# ---------------------------------------------------------------------------
+# Output templates
+# ---------------------------------------------------------------------------
+
+TEMPLATE_FORMAT = "template"
+TEMPLATE_SPEC_PATTERN = re.compile(r"^(?:(?P<fill>.)?(?P<align>[<>^]))?(?P<width>\d+)?$")
+FIELD_WIDTHS = {"exp_month": 2, "exp_year": 2}
+
+
+class TemplateLayout(TextLayout):
+    """One output row per card rendered from a ``str.format``-style template.
+
+    The template is parsed once. Records are rendered with a positional format
+    string bound to an ``itemgetter``; ``CardBatch`` chunks are rendered through
+    ``join_columns``, with any ``[fill]align width`` padding turned into
+    constant literals because batch columns have a fixed width.
+    """
+
+    def __init__(self, template: str, allowed_fields: Sequence[str] = CARD_FIELDS) -> None:
+        self.template = template
+        self._segments: List[Tuple[str, Optional[str], str, str, int]] = []
+        positional: List[str] = []
+        fields: List[str] = []
+        for literal, name, spec, conversion in string.Formatter().parse(template):
+            if name is None:
+                self._segments.append((literal, None, "", "", 0))
+                positional.append(literal.replace("{", "{{").replace("}", "}}"))
+                continue
+            if name not in allowed_fields:
+                raise ValueError(
+                    f"Unknown template field {{{name}}}; use {', '.join(allowed_fields)}"
+                )
+            match = TEMPLATE_SPEC_PATTERN.match(spec or "")
+            if conversion or match is None:
+                raise ValueError(f"Unsupported format for template field {{{name}}}")
+            self._segments.append(
+                (literal, name, match["fill"] or " ", match["align"] or "<", int(match["width"] or 0))
+            )
+            positional.append(literal.replace("{", "{{").replace("}", "}}"))
+            positional.append(f"{{{len(fields)}:{spec}}}" if spec else f"{{{len(fields)}}}")
+            fields.append(name)
+        if not fields:
+            raise ValueError("Template must reference at least one card field")
+        self._format = ("".join(positional) + "\n").format
+        getter = operator.itemgetter(*fields)
+        self._values = (lambda card: (getter(card),)) if len(fields) == 1 else getter
+        self._batch_parts: Dict[Tuple[int, int], RowParts] = {}
+
+    def render(self, cards: Sequence[CardRecord], first: bool) -> str:
+        if isinstance(cards, CardBatch):
+            return cards.join_columns(self._parts_for(cards)).decode("utf-8")
+        return self.render_records(cards, first)
+
+    def render_records(self, cards: Sequence[CardRecord], first: bool) -> str:
+        render, values = self._format, self._values
+        return "".join(render(*values(card)) for card in cards)
+
+    def _parts_for(self, batch: CardBatch) -> RowParts:
+        key = (batch.number_width, batch.cvv_width)
+        parts = self._batch_parts.get(key)
+        if parts is None:
+            widths = dict(FIELD_WIDTHS, number=batch.number_width, cvv=batch.cvv_width)
+            parts = []
+            for literal, name, fill, align, width in self._segments:
+                parts.append(literal)
+                if name is None:
+                    continue
+                padding = max(0, width - widths[name])
+                before = {"<": 0, ">": padding, "^": padding // 2}[align]
+                parts += [fill * before, Field(name), fill * (padding - before)]
+            parts.append("\n")
+            parts = self._batch_parts[key] = [part for part in parts if part != ""]
+        return parts
+
+
+def compile_template(template: str, allowed_fields: Sequence[str] = CARD_FIELDS) -> TemplateLayout:
+    """Validate ``template`` (e.g. ``"{number}|{exp_month}/{exp_year}|{cvv}"``) once."""
+    return TemplateLayout(template, allowed_fields)
+
+
+def register_template(
+    template: str, name: str = TEMPLATE_FORMAT, allowed_fields: Sequence[str] = CARD_FIELDS
+) -> TemplateLayout:
+    """Compile ``template`` and register it under ``name`` in FORMATTERS, WRITERS and LAYOUTS."""
+    layout = compile_template(template, allowed_fields)
+    LAYOUTS[name] = layout
+    FORMATTERS[name] = functools.partial(_format_with_layout, layout=layout)
+    WRITERS[name] = functools.partial(write_cards, layout=layout)
+    return layout
+
+
+# ---------------------------------------------------------------------------
+# Compressed output
+# ---------------------------------------------------------------------------
+
+COMPRESS_BLOCK_SIZE = 4 << 20
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    "gzip": functools.partial(gzip.compress, compresslevel=6, mtime=0),
+    "xz": functools.partial(lzma.compress, format=lzma.FORMAT_XZ),
+    "bz2": functools.partial(bz2.compress, compresslevel=9),
+}
+
+
+class BlockCompressor:
+    """Binary stream that compresses independent blocks on a thread pool.
+
+    Input is cut into ``block_size`` blocks and each block becomes one complete
+    gzip/xz/bz2 member; members are written in order, which yields a standard
+    multi-member file that ``gunzip``, ``xz -d``, ``bunzip2`` and the stdlib
+    modules decompress as one stream. The codecs release the GIL while
+    compressing, so blocks are compressed in parallel. At most two blocks per
+    thread are in flight, which bounds memory use.
+    """
+
+    def __init__(
+        self,
+        raw: BinaryIO,
+        method: str,
+        *,
+        threads: Optional[int] = None,
+        block_size: int = COMPRESS_BLOCK_SIZE,
+        owns: bool = False,
+    ) -> None:
+        self._raw = raw
+        self._compress = COMPRESSORS[method]
+        self._threads = max(1, threads or os.cpu_count() or 1)
+        self._executor = ThreadPoolExecutor(self._threads, thread_name_prefix="reysilvagen-compress")
+        self._pending: "collections.deque[Future[bytes]]" = collections.deque()
+        self._buffer = bytearray()
+        self._block_size = block_size
+        self._owns = owns
+        self._members = 0
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        while len(self._buffer) >= self._block_size:
+            self._submit(bytes(self._buffer[:self._block_size]))
+            del self._buffer[:self._block_size]
+        return len(data)
+
+    def _submit(self, block: bytes) -> None:
+        self._pending.append(self._executor.submit(self._compress, block))
+        self._members += 1
+        while len(self._pending) > self._threads * 2:
+            self._raw.write(self._pending.popleft().result())
+
+    def flush(self) -> None:
+        """Write the members that have finished compressing; open blocks stay buffered."""
+        while self._pending and self._pending[0].done():
+            self._raw.write(self._pending.popleft().result())
+        self._raw.flush()
+
+    def close(self) -> None:
+        try:
+            if self._buffer or not self._members:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self._raw.write(self._pending.popleft().result())
+            self._raw.flush()
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            if self._owns:
+                self._raw.close()
+
+
+# ---------------------------------------------------------------------------
+# Checkpointed output
+# ---------------------------------------------------------------------------
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_SUFFIX = ".checkpoint"
+CHECKPOINT_INTERVAL = 1_000_000
+
+
+def _checkpoint_path(output: str) -> Path:
+    return Path(output + CHECKPOINT_SUFFIX)
+
+
+def _save_checkpoint(path: Path, state: Dict[str, object]) -> None:
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def write_checkpointed(
+    generator: CardGenerator,
+    output: str,
+    settings: Dict[str, object],
+    *,
+    interval: Optional[int] = None,
+    resume: bool = False,
+) -> None:
+    """Write ``settings["count"]`` cards to ``output``, checkpointing every ``interval`` cards.
+
+    The checkpoint next to the output records the settings (including the seed and
+    expiry anchor), the interval, the number of cards written and the byte offset
+    flushed to disk. With ``resume=True`` the output is truncated to that offset and
+    generation continues at the recorded position, so the finished file is
+    identical to an uninterrupted run. Rows stream in ``WRITE_CHUNK_SIZE`` chunks,
+    so memory does not grow with the interval. The checkpoint is removed once the
+    output is complete.
+    """
+    if interval is not None and interval <= 0:
+        raise ValueError("Checkpoint interval must be positive")
+    checkpoint = _checkpoint_path(output)
+    if resume:
+        try:
+            state = json.loads(checkpoint.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise RuntimeError(f"Cannot resume: no usable checkpoint at {checkpoint}") from exc
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise RuntimeError("Cannot resume: unsupported checkpoint version")
+        settings = state["settings"]
+    else:
+        settings = dict(settings)
+        if settings.get("seed") is None:
+            settings["seed"] = secrets.token_hex(16)
+        if settings.get("expiry_anchor") is None:
+            settings["expiry_anchor"] = current_expiry_anchor()
+        state = {"version": CHECKPOINT_VERSION, "settings": settings, "position": 0, "bytes": 0}
+    if interval is None:
+        interval = state.get("interval") or CHECKPOINT_INTERVAL
+    state["interval"] = interval
+
+    if settings.get("template"):
+        layout: TextLayout = compile_template(settings["template"])
+    else:
+        layout = LAYOUTS[settings["format"]]
+    count = settings["count"]
+    position = state["position"]
+    cards: Iterable[CardRecord] = []
+    if position < count:
+        cards = generator.iter_cards(
+            settings["bin_pattern"],
+            count - position,
+            length=settings["length"],
+            cvv_length=settings["cvv_length"],
+            years_ahead=settings["years_ahead"],
+            expiry_month=settings["expiry_month"],
+            expiry_year=settings["expiry_year"],
+            engine=settings["engine"],
+            sampling=settings["sampling"],
+            seed=settings["seed"],
+            start=settings["start"] + position,
+            workers=settings.get("workers", 1),
+            expiry_anchor=settings["expiry_anchor"],
+        )
+
+    with open(output, "r+b" if resume else "wb") as handle:
+        handle.truncate(state["bytes"])
+        handle.seek(state["bytes"])
+        if not resume:
+            handle.write(layout.header.encode("utf-8"))
+            handle.flush()
+            os.fsync(handle.fileno())
+            state["bytes"] = handle.tell()
+            _save_checkpoint(checkpoint, state)
+
+        first = position == 0
+        unsaved = 0
+        for rows in _iter_chunks(cards, min(WRITE_CHUNK_SIZE, interval)):
+            handle.write(layout.render(rows, first).encode("utf-8"))
+            first = False
+            state["position"] += len(rows)
+            unsaved += len(rows)
+            if unsaved >= interval:
+                handle.flush()
+                os.fsync(handle.fileno())
+                state["bytes"] = handle.tell()
+                _save_checkpoint(checkpoint, state)
+                unsaved = 0
+        handle.write(layout.footer(first).encode("utf-8"))
+    checkpoint.unlink()
+
+
+# ---------------------------------------------------------------------------
+# Binary card files
+# ---------------------------------------------------------------------------
+
+FORMAT_BINARY = "binary"
+BINARY_MAGIC = b"RSGCARDS"
+BINARY_VERSION = 2
+# magic, version, number width, CVV width, record size, count, pattern, expiry anchor, seed (128 bytes)
+BINARY_HEADER = struct.Struct("<8sHBBHxxQ24s7s73s")
+BINARY_SEED_SIZE = 73
+BINARY_RECORD_PARTS = (Field("number"), Field("cvv"), Field("exp_month"), Field("exp_year"))
+
+
+def _fill_binary(path: str, offset: int, cards: Iterable[CardRecord]) -> int:
+    """Copy ``cards`` as packed records into the mapped file starting at byte ``offset``."""
+    with open(path, "r+b") as handle, mmap.mmap(handle.fileno(), 0) as mapped:
+        for chunk in _iter_chunks(cards, ITER_BATCH_SIZE):
+            records = CardBatch.from_records(chunk).join_columns(BINARY_RECORD_PARTS)
+            mapped[offset:offset + len(records)] = records
+            offset += len(records)
+        mapped.flush()
+    return offset
+
+
+def _write_binary_shard(task: Tuple[str, int, Dict[str, object]]) -> int:
+    """Pool worker: fill one disjoint range of records of a preallocated binary file."""
+    path, offset, options = task
+    return _fill_binary(path, offset, CardGenerator().iter_cards(**options))
+
+
+def write_binary(
+    output: str,
+    bin_pattern: str,
+    count: int,
+    *,
+    workers: int = 1,
+    **options: object,
+) -> None:
+    """Write ``count`` cards to ``output`` as fixed-width binary records.
+
+    A 128-byte header (see ``BINARY_HEADER``) records the pattern, seed and
+    expiry anchor (the current month unless given) and is followed by one record per card:
+    the number, CVV and ``MMYY`` expiry as ASCII digits, so card ``i`` starts at
+    ``header + i * record_size``. The file is preallocated and memory-mapped; with
+    ``workers > 1`` every pool worker maps the same file and fills its own range
+    of records in place. ``options`` are passed on to ``CardGenerator.iter_cards``.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if workers > 1 and options.get("seed") is None:
+        options["seed"] = secrets.token_hex(16)
+    if options.get("expiry_anchor") is None:
+        options["expiry_anchor"] = current_expiry_anchor()
+    cards = CardGenerator().iter_cards(bin_pattern, count, **options)
+
+    compiled = compile_bin_pattern(bin_pattern, options.get("length"))
+    cvv_width = options.get("cvv_length") or compiled.network.cvv_length
+    record_size = compiled.length + cvv_width + 4
+    seed = options.get("seed")
+    seed_bytes = b"" if seed is None else str(seed).encode("utf-8")
+    if len(seed_bytes) > BINARY_SEED_SIZE:
+        raise ValueError("Seed is too long to record in the binary header")
+    header = BINARY_HEADER.pack(
+        BINARY_MAGIC,
+        BINARY_VERSION,
+        compiled.length,
+        cvv_width,
+        record_size,
+        count,
+        compiled.pattern.encode("ascii"),
+        str(options["expiry_anchor"]).encode("ascii"),
+        seed_bytes,
+    )
+
+    with open(output, "wb") as handle:
+        handle.write(header)
+        handle.truncate(BINARY_HEADER.size + count * record_size)
+
+    if workers == 1:
+        _fill_binary(output, BINARY_HEADER.size, cards)
+        return
+
+    start = options.pop("start", 0)
+    shard_size = min(SHARD_MAX_SIZE, max(-(-count // (workers * 4)), SHARD_MIN_SIZE))
+    tasks = [
+        (
+            output,
+            BINARY_HEADER.size + offset * record_size,
+            dict(
+                options,
+                bin_pattern=bin_pattern,
+                start=start + offset,
+                count=min(shard_size, count - offset),
+            ),
+        )
+        for offset in range(0, count, shard_size)
+    ]
+    with _shard_pool(min(workers, len(tasks))) as pool:
+        for _ in pool.imap_unordered(_write_binary_shard, tasks):
+            pass
+
+
+class BinaryCardReader:
+    """Random access to a binary card file through a read-only memory map.
+
+    Opening the file reads only the header. ``record(i)`` returns a zero-copy
+    ``memoryview`` of card ``i`` and ``reader[i]`` decodes it into a ``CardRecord``;
+    both are O(1). ``np_records()`` exposes every record as one NumPy byte matrix
+    backed by the map. Views and arrays handed out stay valid after ``close``;
+    the map is unmapped once the last of them is released.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._handle = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._handle.close()
+            raise ValueError(f"{path} is not a binary card file") from None
+        if len(self._map) < BINARY_HEADER.size or self._map[:8] != BINARY_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a binary card file")
+        (
+            _magic,
+            version,
+            self.number_width,
+            self.cvv_width,
+            self.record_size,
+            self.count,
+            pattern,
+            anchor,
+            seed,
+        ) = BINARY_HEADER.unpack_from(self._map)
+        if version != BINARY_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported binary card file version: {version}")
+        if len(self._map) < BINARY_HEADER.size + self.count * self.record_size:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+        self.pattern = pattern.rstrip(b"\0").decode("ascii")
+        self.expiry_anchor = anchor.decode("ascii")
+        self.seed: Optional[str] = seed.rstrip(b"\0").decode("utf-8") or None
+        self._view = memoryview(self._map)
+
+    def __enter__(self) -> "BinaryCardReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        try:
+            view = getattr(self, "_view", None)
+            if view is not None:
+                view.release()
+                self._view = None
+            try:
+                self._map.close()
+            except BufferError:
+                # Record views or arrays still export the map; it is unmapped when they go away.
+                pass
+        finally:
+            self._handle.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, index: int) -> memoryview:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("card index out of range")
+        start = BINARY_HEADER.size + index * self.record_size
+        return self._view[start:start + self.record_size]
+
+    def __getitem__(self, index: int) -> CardRecord:
+        raw = bytes(self.record(index)).decode("ascii")
+        cvv_end = self.number_width + self.cvv_width
+        return {
+            "number": raw[:self.number_width],
+            "cvv": raw[self.number_width:cvv_end],
+            "exp_month": raw[cvv_end:cvv_end + 2],
+            "exp_year": raw[cvv_end + 2:],
+        }
+
+    def __iter__(self) -> Iterator[CardRecord]:
+        return (self[index] for index in range(self.count))
+
+    def np_records(self) -> "np.ndarray":
+        return np.frombuffer(
+            self._map, dtype=np.uint8, count=self.count * self.record_size, offset=BINARY_HEADER.size
+        ).reshape(self.count, self.record_size)
+
+
+# ---------------------------------------------------------------------------
+# Fixture validation
+# ---------------------------------------------------------------------------
+
+VALIDATE_CHUNK_SIZE = 65536
+JSON_NUMBER_PATTERN = re.compile(r'"number"\s*:\s*"([^"]*)"')
+
+
+def _detect_fixture_format(first_line: str) -> str:
+    stripped = first_line.lstrip("\ufeff").strip()
+    if stripped.startswith(("[", "{")):
+        return "json"
+    if stripped.lower().startswith("card_number"):
+        return "csv"
+    return "pipe"
+
+
+def _iter_fixture_numbers(lines: Iterable[str], fmt: str) -> Iterator[Tuple[int, str]]:
+    """Yield ``(line_number, card_number)`` pairs from formatter output."""
+    if fmt == "csv":
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            return
+        column = header.index("card_number") if "card_number" in header else 0
+        for row in reader:
+            if len(row) > column and row[column].strip():
+                yield reader.line_num, row[column].strip()
+    elif fmt == "json":
+        for line_number, line in enumerate(lines, start=1):
+            for match in JSON_NUMBER_PATTERN.finditer(line):
+                yield line_number, match.group(1)
+    else:
+        # plain output is the first field of the pipe layout
+        for line_number, line in enumerate(lines, start=1):
+            number = line.split("|", 1)[0].strip()
+            if number:
+                yield line_number, number
+
+
+def validate_fixture_lines(
+    lines: Iterable[str],
+    fmt: Optional[str] = None,
+    chunk_size: int = VALIDATE_CHUNK_SIZE,
+) -> Iterator[Tuple[int, List[Tuple[int, str]]]]:
+    """Validate fixture lines in chunks, yielding ``(checked, invalid)`` per chunk.
+
+    ``invalid`` holds ``(line_number, card_number)`` pairs. The format is detected
+    from the first line unless ``fmt`` is given; only one chunk is held in memory.
+    """
+    iterator = iter(lines)
+    if fmt is None:
+        first_line = next(iterator, None)
+        if first_line is None:
+            return
+        fmt = _detect_fixture_format(first_line)
+        iterator = _chain_first(first_line, iterator)
+
+    line_numbers: List[int] = []
+    numbers: List[str] = []
+    for line_number, number in _iter_fixture_numbers(iterator, fmt):
+        line_numbers.append(line_number)
+        numbers.append(number)
+        if len(numbers) >= chunk_size:
+            yield len(numbers), _collect_invalid(line_numbers, numbers)
+            line_numbers, numbers = [], []
+    if numbers:
+        yield len(numbers), _collect_invalid(line_numbers, numbers)
+
+
+def _chain_first(first: str, rest: Iterator[str]) -> Iterator[str]:
+    yield first
+    yield from rest
+
+
+def _collect_invalid(line_numbers: List[int], numbers: List[str]) -> List[Tuple[int, str]]:
+    return [
+        (line_number, number)
+        for line_number, number, valid in zip(line_numbers, numbers, validate_luhn_batch(numbers))
+        if not valid
+    ]
+
+
+def _run_validation(path: str) -> int:
+    started = time.perf_counter()
+    checked = 0
+    invalid = 0
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as handle:
+            for chunk_checked, chunk_invalid in validate_fixture_lines(handle):
+                checked += chunk_checked
+                invalid += len(chunk_invalid)
+                for line_number, number in chunk_invalid:
+                    print(f"line {line_number}: invalid card number {number}")
+    except OSError as exc:
+        print(f"Error reading {path}: {exc}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - started
+    rate = checked / elapsed if elapsed > 0 else float(checked)
+    print(
+        f"Checked {checked} numbers, {invalid} invalid, in {elapsed:.2f}s ({rate:,.0f} numbers/s).",
+        file=sys.stderr,
+    )
+    return 1 if invalid else 0
+
+
+# ---------------------------------------------------------------------------
+# SQLite bulk load
+# ---------------------------------------------------------------------------
+
+SQLITE_BATCH_SIZE = 65536
+SQLITE_TRANSACTION_ROWS = 1_000_000
+SQLITE_JOURNAL_MODES = ("delete", "truncate", "persist", "memory", "wal", "off")
+SQLITE_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def load_sqlite(
+    cards: Iterable[CardRecord],
+    database: str,
+    table: str = "cards",
+    *,
+    page_size: Optional[int] = None,
+    journal_mode: Optional[str] = None,
+    transaction_rows: int = SQLITE_TRANSACTION_ROWS,
+) -> int:
+    """Insert ``cards`` into ``table`` of the SQLite ``database`` and return the row count.
+
+    The table (``number``, ``cvv``, ``exp_month``, ``exp_year`` TEXT columns) is
+    created when missing. Rows go in through ``executemany`` in batches of
+    ``SQLITE_BATCH_SIZE``, committed every ``transaction_rows`` rows. ``page_size``
+    only takes effect on a new database; ``journal_mode`` is one of
+    ``SQLITE_JOURNAL_MODES``.
+    """
+    if not SQLITE_IDENTIFIER.match(table):
+        raise ValueError(f"Invalid SQLite table name: {table}")
+    if journal_mode is not None and journal_mode.lower() not in SQLITE_JOURNAL_MODES:
+        raise ValueError(f"Unknown SQLite journal mode: {journal_mode}")
+    if page_size is not None and (page_size < 512 or page_size > 65536 or page_size & (page_size - 1)):
+        raise ValueError("SQLite page size must be a power of two between 512 and 65536")
+
+    connection = sqlite3.connect(database, isolation_level=None)
+    try:
+        if page_size is not None:
+            connection.execute(f"PRAGMA page_size={page_size}")
+        if journal_mode is not None:
+            connection.execute(f"PRAGMA journal_mode={journal_mode.lower()}")
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(number TEXT NOT NULL, cvv TEXT NOT NULL, exp_month TEXT NOT NULL, exp_year TEXT NOT NULL)"
+        )
+        insert = f"INSERT INTO {table} (number, cvv, exp_month, exp_year) VALUES (?, ?, ?, ?)"
+        row_of = operator.itemgetter(*CARD_FIELDS)
+        rows = 0
+        pending = 0
+        connection.execute("BEGIN")
+        for chunk in _iter_chunks(cards, SQLITE_BATCH_SIZE):
+            connection.executemany(insert, map(row_of, chunk))
+            rows += len(chunk)
+            pending += len(chunk)
+            if pending >= transaction_rows:
+                connection.execute("COMMIT")
+                connection.execute("BEGIN")
+                pending = 0
+        connection.execute("COMMIT")
+    except BaseException:
+        if connection.in_transaction:
+            connection.execute("ROLLBACK")
+        raise
+    finally:
+        connection.close()
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Job manifests
+# ---------------------------------------------------------------------------
+
+MANIFEST_KEYS: Dict[str, Callable[[str], object]] = {
+    "bin": str,
+    "count": int,
+    "length": int,
+    "cvv_length": int,
+    "years_ahead": int,
+    "expiry_month": int,
+    "expiry_year": int,
+    "engine": str,
+    "sampling": str,
+    "seed": str,
+    "start": int,
+    "expiry_anchor": str,
+    "format": str,
+    "output": str,
+    "weight": int,
+}
+MANIFEST_GENERATION_KEYS = (
+    "count",
+    "length",
+    "cvv_length",
+    "years_ahead",
+    "expiry_month",
+    "expiry_year",
+    "engine",
+    "sampling",
+    "seed",
+    "start",
+    "expiry_anchor",
+)
+
+
+def load_manifest(path: str) -> List[Dict[str, object]]:
+    """Read manifest jobs from a JSON list (or ``{"jobs": [...]}``) or a CSV file with a header.
+
+    Each job needs a ``bin``; the other ``MANIFEST_KEYS`` are optional. Empty CSV
+    cells count as missing.
+    """
+    text = Path(path).read_text(encoding="utf-8-sig")
+    if text.lstrip().startswith(("[", "{")):
+        raw = json.loads(text)
+        entries = raw.get("jobs") if isinstance(raw, dict) else raw
+        if not isinstance(entries, list):
+            raise ValueError("JSON manifest must be a list of jobs or an object with a 'jobs' list")
+    else:
+        entries = list(csv.DictReader(io.StringIO(text)))
+
+    jobs: List[Dict[str, object]] = []
+    for number, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Manifest job {number} is not an object")
+        unknown = set(entry) - set(MANIFEST_KEYS)
+        if unknown:
+            raise ValueError(f"Manifest job {number}: unknown keys {', '.join(sorted(unknown))}")
+        job: Dict[str, object] = {}
+        for key, value in entry.items():
+            if value is None or (isinstance(value, str) and not value.strip()):
+                continue
+            try:
+                job[key] = MANIFEST_KEYS[key](value.strip() if isinstance(value, str) else value)
+            except ValueError:
+                raise ValueError(f"Manifest job {number}: invalid {key} {value!r}") from None
+        if "bin" not in job:
+            raise ValueError(f"Manifest job {number}: 'bin' is required")
+        if job.get("weight", 1) <= 0:
+            raise ValueError(f"Manifest job {number}: weight must be positive")
+        if job.get("format", "pipe") not in WRITERS:
+            raise ValueError(f"Manifest job {number}: unknown format {job['format']}")
+        jobs.append(job)
+    if not jobs:
+        raise ValueError("Manifest contains no jobs")
+    return jobs
+
+
+def iter_interleaved(
+    streams: Sequence[Iterator[CardRecord]], weights: Sequence[int], source: DigitSource
+) -> Iterator[CardRecord]:
+    """Mix ``streams`` card by card, choosing each next stream with probability ∝ its weight.
+
+    Exhausted streams drop out, so every card of every stream is emitted once.
+    """
+    active = list(zip(streams, weights))
+    while active:
+        bounds = list(itertools.accumulate(weight for _, weight in active))
+        total = bounds[-1]
+        while True:
+            index = bisect.bisect_right(bounds, source.randbelow(total))
+            card = next(active[index][0], None)
+            if card is None:
+                del active[index]
+                break
+            yield card
+
+
+def run_manifest(
+    generator: CardGenerator,
+    jobs: Sequence[Dict[str, object]],
+    defaults: Dict[str, object],
+    *,
+    output: Optional[str] = None,
+    fmt: str = "pipe",
+    interleave: bool = False,
+    compress: Optional[str] = None,
+    compress_threads: Optional[int] = None,
+) -> None:
+    """Run every manifest job with one generator, so compiled patterns and the RNG are shared.
+
+    Jobs with their own ``output`` are written to that file in their own (or the
+    run's) format. All other jobs share one stream (``output`` or stdout) in
+    ``fmt``, either one after another or, with ``interleave=True``, mixed card by
+    card by ``weight`` (default: the job's count). ``defaults`` supplies the
+    generation settings a job leaves out. Every job is validated before any
+    output is written.
+    """
+    shared: List[Tuple[Iterator[CardRecord], int]] = []
+    separate: List[Tuple[Iterator[CardRecord], str, str]] = []
+    for job in jobs:
+        settings = {key: job.get(key, defaults.get(key)) for key in MANIFEST_GENERATION_KEYS}
+        settings = {key: value for key, value in settings.items() if value is not None}
+        cards = generator.iter_cards(job["bin"], **settings)
+        if "output" in job:
+            separate.append((cards, str(job["output"]), str(job.get("format", fmt))))
+        else:
+            shared.append((cards, int(job.get("weight", settings["count"]))))
+
+    for cards, path, job_format in separate:
+        with open_card_sink(path, compress, compress_threads) as sink:
+            WRITERS[job_format](cards, sink)
+    if shared:
+        streams = [cards for cards, _ in shared]
+        if interleave:
+            combined = iter_interleaved(streams, [weight for _, weight in shared], generator._digits)
+        else:
+            combined = itertools.chain.from_iterable(streams)
+        with open_card_sink(output, compress, compress_threads) as sink:
+            WRITERS[fmt](combined, sink)
+
+
+# ---------------------------------------------------------------------------
+# Local generation service
+# ---------------------------------------------------------------------------
+# Two transports share ``service_response``: a framed JSON-lines protocol on a
+# Unix socket and plain HTTP/1.1 on a localhost port. A framed response is one or
+# more frames, each a JSON header line followed by exactly ``size`` body bytes;
+# the last frame of a response has ``"more": false``.
+
+SERVICE_OPS = ("generate", "validate", "detect")
+SERVICE_CHUNK_SIZE = 8192
+SERVICE_CONTENT_TYPES = {"json": "application/json", "jsonl": "application/x-ndjson", "csv": "text/csv"}
+SERVICE_ERRORS = (ValueError, RuntimeError, KeyError, TypeError)
+SERVICE_MAX_BODY = 1 << 20  # largest HTTP request body read into memory
+
+
+def _iter_layout_bytes(cards: Iterable[CardRecord], layout: TextLayout, chunk_size: int) -> Iterator[bytes]:
+    pending = layout.header
+    first = True
+    for chunk in _iter_chunks(cards, chunk_size):
+        yield (pending + layout.render(chunk, first)).encode("utf-8")
+        pending = ""
+        first = False
+    yield (pending + layout.footer(first)).encode("utf-8")
+
+
+def _generation_request(params: Dict[str, object]) -> Tuple[str, str, Dict[str, object]]:
+    """Split generate parameters into the BIN pattern, the format and ``iter_cards`` settings."""
+    params = dict(params)
+    fmt = str(params.pop("format", "pipe"))
+    if fmt not in LAYOUTS:
+        raise ValueError(f"Unknown format: {fmt}")
+    bin_pattern = params.pop("bin", None)
+    if not bin_pattern:
+        raise ValueError("'bin' is required")
+    unknown = set(params) - set(MANIFEST_GENERATION_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    settings = {key: MANIFEST_KEYS[key](value) for key, value in params.items() if value is not None}
+    settings.setdefault("count", 10)
+    return str(bin_pattern), fmt, settings
+
+
+def service_response(
+    generator: CardGenerator, op: str, params: Dict[str, object]
+) -> Tuple[str, Iterator[bytes]]:
+    """Validate one service request and return its content type and body chunks.
+
+    ``generate`` takes ``bin``, ``format`` and the manifest generation keys and
+    streams the formatted cards in chunks; ``validate`` takes ``numbers`` (a list
+    or comma-separated string) and ``detect`` takes ``bin``. Invalid requests
+    raise before the first chunk is produced.
+    """
+    if op == "generate":
+        bin_pattern, fmt, settings = _generation_request(params)
+        layout = LAYOUTS[fmt]
+        cards = generator.iter_cards(bin_pattern, **settings)
+        content_type = SERVICE_CONTENT_TYPES.get(fmt, "text/plain")
+        return f"{content_type}; charset=utf-8", _iter_layout_bytes(cards, layout, SERVICE_CHUNK_SIZE)
+    if op == "validate":
+        numbers = params.get("numbers", [])
+        if isinstance(numbers, str):
+            numbers = [number for number in numbers.split(",") if number]
+        if not isinstance(numbers, list) or not all(isinstance(number, str) for number in numbers):
+            raise ValueError("'numbers' must be a list of strings")
+        body = json.dumps({"valid": validate_luhn_batch(numbers)})
+        return "application/json", iter([body.encode("utf-8")])
+    if op == "detect":
+        body = json.dumps({"card_type": detect_card_type(str(params.get("bin", "")))})
+        return "application/json", iter([body.encode("utf-8")])
+    raise ValueError(f"Unknown operation: {op}")
+
+
+def _frame(request_id: object, body: bytes, more: bool, error: Optional[str] = None) -> bytes:
+    header: Dict[str, object] = {"id": request_id, "status": "error" if error else "ok"}
+    if error:
+        header["error"] = error
+    header.update(size=len(body), more=more)
+    return json.dumps(header).encode("utf-8") + b"\n" + body
+
+
+def iter_framed_response(generator: CardGenerator, line: bytes) -> Iterator[bytes]:
+    """Answer one JSON-lines request (``{"op": ..., "id": ..., ...}``) as frames.
+
+    An error while streaming ends the response with an error frame, so a client
+    never mistakes a truncated body for a complete one.
+    """
+    request_id = None
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("Request must be a JSON object")
+        request_id = request.pop("id", None)
+        _, chunks = service_response(generator, str(request.pop("op", "generate")), request)
+        previous = next(chunks)
+    except SERVICE_ERRORS as exc:
+        yield _frame(request_id, b"", False, str(exc))
+        return
+    while True:
+        try:
+            chunk = next(chunks, None)
+        except SERVICE_ERRORS as exc:
+            yield _frame(request_id, previous, True)
+            yield _frame(request_id, b"", False, str(exc))
+            return
+        if chunk is None:
+            break
+        yield _frame(request_id, previous, True)
+        previous = chunk
+    yield _frame(request_id, previous, False)
+
+
+def stdio_response(generator: CardGenerator, line: bytes) -> bytes:
+    """Answer one JSON-lines request with exactly one frame.
+
+    ``generate`` bodies are ``FORMATTERS[format](generate_bulk(...))``; other
+    operations are answered as by the service.
+    """
+    request_id = None
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("Request must be a JSON object")
+        request_id = request.pop("id", None)
+        op = str(request.pop("op", "generate"))
+        if op == "generate":
+            bin_pattern, fmt, settings = _generation_request(request)
+            if fmt not in FORMATTERS:
+                raise ValueError(f"Unknown format: {fmt}")
+            cards = generator.generate_bulk(bin_pattern, as_batch=True, **settings)
+            body = FORMATTERS[fmt](cards).encode("utf-8")
+        else:
+            body = b"".join(service_response(generator, op, request)[1])
+    except SERVICE_ERRORS as exc:
+        return _frame(request_id, b"", False, str(exc))
+    return _frame(request_id, body, False)
+
+
+def run_stdio(generator: CardGenerator, stdin: BinaryIO, stdout: BinaryIO) -> None:
+    """Coprocess loop: one request line in, one frame out, flushed immediately."""
+    for line in stdin:
+        if not line.strip():
+            continue
+        stdout.write(stdio_response(generator, line))
+        stdout.flush()
+
+
+async def _serve_framed(
+    generator: CardGenerator, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    # Requests on one connection are answered in order, so clients may pipeline.
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # The request line overran the stream limit; it cannot be resynchronised.
+                writer.write(_frame(None, b"", False, "Request line too long"))
+                await writer.drain()
+                break
+            if not line:
+                break
+            if not line.strip():
+                continue
+            for frame in iter_framed_response(generator, line):
+                writer.write(frame)
+                await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def _write_http_head(writer: asyncio.StreamWriter, status: str, headers: Dict[str, str]) -> None:
+    lines = [f"HTTP/1.1 {status}"] + [f"{name}: {value}" for name, value in headers.items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await writer.drain()
+
+
+async def _write_http_error(
+    writer: asyncio.StreamWriter, status: str, message: str, keep_alive: bool = False
+) -> None:
+    error = json.dumps({"error": message}).encode("utf-8")
+    await _write_http_head(writer, status, {
+        "Content-Type": "application/json",
+        "Content-Length": str(len(error)),
+        "Connection": "keep-alive" if keep_alive else "close",
+    })
+    writer.write(error)
+    await writer.drain()
+
+
+async def _serve_http(
+    generator: CardGenerator, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    # HTTP/1.1 keep-alive; pipelined requests are read and answered one at a time.
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            if not request_line.strip():
+                continue
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                await _write_http_head(writer, "400 Bad Request", {"Content-Length": "0", "Connection": "close"})
+                break
+            headers: Dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            try:
+                length = int(headers.get("content-length", "0") or 0)
+                if length < 0:
+                    raise ValueError
+            except ValueError:
+                # The body cannot be framed, so the connection is closed after the error.
+                await _write_http_error(writer, "400 Bad Request", "Invalid Content-Length header")
+                break
+            if length > SERVICE_MAX_BODY:
+                # The unread body would be parsed as the next request, so close as well.
+                await _write_http_error(
+                    writer, "413 Payload Too Large", f"Request body exceeds {SERVICE_MAX_BODY} bytes"
+                )
+                break
+            body = await reader.readexactly(length)
+            chunked = version == "HTTP/1.1"
+            keep_alive = chunked and headers.get("connection", "").lower() != "close"
+
+            url = urllib.parse.urlsplit(target)
+            op = url.path.strip("/")
+            status = "200 OK"
+            try:
+                if op not in SERVICE_OPS:
+                    status = "404 Not Found"
+                    raise ValueError(f"Unknown operation: {op or '/'}")
+                params: Dict[str, object] = dict(urllib.parse.parse_qsl(url.query))
+                if method == "POST" and body:
+                    payload = json.loads(body)
+                    if not isinstance(payload, dict):
+                        raise ValueError("Request body must be a JSON object")
+                    params.update(payload)
+                content_type, chunks = service_response(generator, op, params)
+                chunks = itertools.chain((next(chunks, b""),), chunks)
+            except SERVICE_ERRORS as exc:
+                if status == "200 OK":
+                    status = "400 Bad Request"
+                await _write_http_error(writer, status, str(exc), keep_alive)
+                if not keep_alive:
+                    break
+                continue
+
+            response_headers = {"Content-Type": content_type}
+            if chunked:
+                response_headers["Transfer-Encoding"] = "chunked"
+            response_headers["Connection"] = "keep-alive" if keep_alive else "close"
+            await _write_http_head(writer, status, response_headers)
+            try:
+                for chunk in chunks:
+                    if not chunk:
+                        continue  # an empty chunk would end a chunked body early
+                    writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk) if chunked else chunk)
+                    await writer.drain()
+            except SERVICE_ERRORS:
+                # The status line is already sent: close without the terminating chunk so
+                # the client sees an aborted body rather than a complete one.
+                break
+            if chunked:
+                writer.write(b"0\r\n\r\n")
+                await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_service(
+    address: str, generator: Optional[CardGenerator] = None
+) -> asyncio.AbstractServer:
+    """Start the service on ``unix:PATH`` (framed JSON lines) or ``[HOST:]PORT`` (HTTP).
+
+    One warm ``CardGenerator`` (and the compiled-pattern cache) serves every
+    connection; each connection is its own task, so clients run concurrently.
+    """
+    generator = generator or CardGenerator()
+    if address.startswith("unix:"):
+        return await asyncio.start_unix_server(
+            functools.partial(_serve_framed, generator), path=address[len("unix:"):]
+        )
+    host, _, port = address.rpartition(":")
+    return await asyncio.start_server(
+        functools.partial(_serve_http, generator), host=host or "127.0.0.1", port=int(port)
+    )
+
+
+async def _serve_forever(address: str) -> None:
+    server = await start_service(address)
+    names = ", ".join(str(socket.getsockname()) for socket in server.sockets)
+    print(f"Serving on {names}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+# ---------------------------------------------------------------------------
+# Random address helper
+# ---------------------------------------------------------------------------
+
+ADDRESS_PATTERN_TEMPLATE = r"<b>{label}:?\s*</b>\s*(?:&nbsp;|\s)*([^<]+)"
+# One alternation over every label, so a single scan finds all fields of all addresses.
+ADDRESS_FIELD_PATTERN = re.compile(
+    ADDRESS_PATTERN_TEMPLATE.format(label="(" + "|".join(map(re.escape, ADDRESS_LABELS)) + ")"),
+    flags=re.IGNORECASE,
+)
+ADDRESS_CANONICAL_LABELS = {label.lower(): label for label in ADDRESS_LABELS}
+
+
+def parse_random_addresses(html_text: str) -> List[Dict[str, str]]:
+    """Parse every address block from a BestRandoms HTML payload in one pass.
+
+    Fields are collected in document order, and a label that repeats starts the
+    next address.
+    """
+    addresses: List[Dict[str, str]] = []
+    current: Dict[str, str] = {}
+    for match in ADDRESS_FIELD_PATTERN.finditer(html_text):
+        label = ADDRESS_CANONICAL_LABELS[match.group(1).lower()]
+        if label in current:
+            addresses.append(current)
+            current = {}
+        current[label] = html.unescape(match.group(2)).strip()
+    if current or not addresses:
+        addresses.append(current)
+    for address in addresses:
+        for label in ADDRESS_LABELS:
+            if label not in address:
+                raise ValueError(f"Could not parse {label.lower()}")
+    return [{label: address[label] for label in ADDRESS_LABELS} for address in addresses]
+
+
+def parse_random_address(html_text: str) -> Dict[str, str]:
+    """Parse address fields from the BestRandoms HTML payload."""
+    return parse_random_addresses(html_text)[0]
+
+
+def fetch_random_us_address(url: str = ADDRESS_URL, fetcher: Optional["AddressFetcher"] = None) -> Dict[str, str]:
+    """Fetch a random US address and return the parsed fields.
+
+    The page goes through ``fetcher`` (a default ``AddressFetcher`` when omitted),
+    so it shares that fetcher's rate limit, retries and cache.
+    """
+    if fetcher is None:
+        with AddressFetcher(concurrency=1) as fetcher:
+            return fetch_random_us_address(url, fetcher)
+    return parse_random_address(fetcher.fetch_pages([url])[0].decode("utf-8"))
+
+
+def display_us_address(address: Dict[str, str]) -> None:
+    for label in ADDRESS_LABELS:
+        print(f"{label}: {address[label]}")
+
+
+# ---------------------------------------------------------------------------
+# Batch address fetching
+# ---------------------------------------------------------------------------
+
+ADDRESS_CONCURRENCY = 4
+ADDRESS_RATE = 2.0
+ADDRESS_RETRIES = 3
+ADDRESS_BACKOFF = 0.5
+ADDRESS_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Pages in flight per worker; bounds read-ahead when the consumer is slower than the network.
+ADDRESS_PAGES_PER_WORKER = 2
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` acquisitions per second, ``burst`` at once."""
+
+    def __init__(self, rate: float, burst: float = 1.0) -> None:
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ResponseCache:
+    """Content-addressed on-disk store of raw responses.
+
+    Bodies live once under ``objects/<sha256 of body>``; ``requests/<sha256 of key>``
+    points a request key at its body. Both are written atomically, so a cache
+    directory can be shared, copied and replayed offline.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory)
+        (self.directory / "objects").mkdir(parents=True, exist_ok=True)
+        (self.directory / "requests").mkdir(exist_ok=True)
+
+    def _request_path(self, key: str) -> Path:
+        return self.directory / "requests" / hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            digest = self._request_path(key).read_text(encoding="ascii").strip()
+            return (self.directory / "objects" / digest).read_bytes()
+        except OSError:
+            return None
+
+    def put(self, key: str, body: bytes) -> str:
+        digest = hashlib.sha256(body).hexdigest()
+        for path, data in (
+            (self.directory / "objects" / digest, body),
+            (self._request_path(key), digest.encode("ascii")),
+        ):
+            temporary = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            temporary.write_bytes(data)
+            os.replace(temporary, path)
+        return digest
+
+
+class AddressFetcher:
+    """Fetch address pages concurrently over pooled keep-alive connections.
+
+    At most ``concurrency`` requests run at once, every attempt waits for the
+    shared ``TokenBucket``, and failures (connection errors, 429 and 5xx) are
+    retried with exponential backoff. With ``cache_dir`` each response is stored
+    under the key ``"<url>#<n>"``, the n-th request for that URL in a batch. A
+    repeated batch therefore replays the same pages, and ``offline=True`` serves
+    only from the cache.
+    """
+
+    def __init__(
+        self,
+        url_template: str = ADDRESS_URL_TEMPLATE,
+        *,
+        concurrency: int = ADDRESS_CONCURRENCY,
+        rate: float = ADDRESS_RATE,
+        burst: Optional[float] = None,
+        retries: int = ADDRESS_RETRIES,
+        backoff: float = ADDRESS_BACKOFF,
+        timeout: float = 15.0,
+        cache_dir: Optional[str] = None,
+        offline: bool = False,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        if offline and cache_dir is None:
+            raise ValueError("Offline fetching requires a cache directory")
+        self.url_template = url_template
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.offline = offline
+        self._bucket = TokenBucket(rate, burst or concurrency)
+        self._cache = ResponseCache(cache_dir) if cache_dir is not None else None
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.cache_hits = 0
+        self.retried = 0
+        self.elapsed = 0.0
+
+    def __enter__(self) -> "AddressFetcher":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle.clear()
+
+    def fetch_addresses(self, count: int) -> List[Dict[str, str]]:
+        return list(self.iter_addresses(count))
+
+    def iter_addresses(self, count: int) -> Iterator[Dict[str, str]]:
+        """Yield ``count`` addresses in order, as soon as the page holding each one arrives."""
+        if count <= 0:
+            raise ValueError("Address count must be a positive integer")
+        quantities = [
+            min(ADDRESS_MAX_QUANTITY, count - offset) for offset in range(0, count, ADDRESS_MAX_QUANTITY)
+        ]
+        pages = self.iter_pages([self.url_template.format(quantity=quantity) for quantity in quantities])
+        for page, quantity in zip(pages, quantities):
+            yield from parse_random_addresses(page.decode("utf-8"))[:quantity]
+
+    def fetch_pages(self, urls: Sequence[str]) -> List[bytes]:
+        """Return the raw bodies of ``urls`` in order."""
+        return list(self.iter_pages(urls))
+
+    def iter_pages(self, urls: Sequence[str]) -> Iterator[bytes]:
+        """Yield the bodies of ``urls`` in order, keeping a bounded window of requests in flight.
+
+        At most ``concurrency * ADDRESS_PAGES_PER_WORKER`` pages are requested
+        ahead of the consumer; each yielded page lets one more request start.
+        """
+        seen: Dict[str, int] = collections.Counter()
+        keys = []
+        for url in urls:
+            keys.append(f"{url}#{seen[url]}")
+            seen[url] += 1
+        requests = zip(urls, keys)
+        started = time.perf_counter()
+        pending: "collections.deque[Future[bytes]]" = collections.deque()
+        pool = ThreadPoolExecutor(self.concurrency, thread_name_prefix="reysilvagen-fetch")
+        try:
+            for url, key in itertools.islice(requests, self.concurrency * ADDRESS_PAGES_PER_WORKER):
+                pending.append(pool.submit(self._fetch_one, url, key))
+            while pending:
+                body = pending.popleft().result()
+                for url, key in itertools.islice(requests, 1):
+                    pending.append(pool.submit(self._fetch_one, url, key))
+                yield body
+        finally:
+            # Queued pages are dropped when the consumer stops early; only running ones finish.
+            pool.shutdown(wait=True, cancel_futures=True)
+            self.elapsed += time.perf_counter() - started
+
+    def report(self) -> str:
+        total = self.requests + self.cache_hits
+        hit_rate = self.cache_hits / total if total else 0.0
+        rate = total / self.elapsed if self.elapsed > 0 else float(total)
+        return (
+            f"Fetched {total} pages ({self.requests} requests, {self.cache_hits} cache hits, "
+            f"{hit_rate:.0%} hit rate, {self.retried} retries) at {rate:,.1f} pages/s."
+        )
+
+    def _fetch_one(self, url: str, key: str) -> bytes:
+        if self._cache is not None:
+            body = self._cache.get(key)
+            if body is not None:
+                with self._lock:
+                    self.cache_hits += 1
+                return body
+        if self.offline:
+            raise RuntimeError(f"No cached response for {url} (offline)")
+
+        error: Exception = RuntimeError("no attempt made")
+        for attempt in range(self.retries + 1):
+            if attempt:
+                with self._lock:
+                    self.retried += 1
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            self._bucket.acquire()
+            try:
+                status, body = self._request(url)
+            except (OSError, http.client.HTTPException) as exc:
+                error = exc
+                continue
+            with self._lock:
+                self.requests += 1
+            if status == 200:
+                if self._cache is not None:
+                    self._cache.put(key, body)
+                return body
+            error = RuntimeError(f"HTTP {status}")
+            if status not in ADDRESS_RETRY_STATUSES:
+                break
+        raise RuntimeError(f"Failed to fetch address: {error}")
+
+    def _request(self, url: str) -> Tuple[int, bytes]:
+        parts = urllib.parse.urlsplit(url)
+        pool_key = (parts.scheme, parts.netloc)
+        with self._lock:
+            idle = self._idle.get(pool_key)
+            connection = idle.pop() if idle else None
+        if connection is None:
+            connection_class = (
+                http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            )
+            connection = connection_class(parts.netloc, timeout=self.timeout)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        try:
+            connection.request("GET", path, headers=ADDRESS_HEADERS)
+            response = connection.getresponse()
+            body = response.read()
+        except BaseException:
+            connection.close()
+            raise
+        if response.will_close:
+            connection.close()
+        else:
+            with self._lock:
+                self._idle.setdefault(pool_key, []).append(connection)
+        return response.status, body
+
+
+# ---------------------------------------------------------------------------
+# Card and address pairing
+# ---------------------------------------------------------------------------
+# In cards_then_address mode addresses are fetched on a background thread while
+# cards are generated, so wall time approaches max(CPU, I/O) instead of the sum.
+# With --pair, each card is joined with one address into a single record.
+
+ADDRESS_FIELDS = ("street", "city", "state", "zip")
+PAIRED_FIELDS = CARD_FIELDS + ADDRESS_FIELDS
+PAIRED_ROW_ORDER = ("number", "exp_month", "exp_year", "cvv") + ADDRESS_FIELDS
+PREFETCH_SIZE = 1024
+
+
+def prefetch(iterable: Iterable[Any], size: int = PREFETCH_SIZE) -> Iterator[Any]:
+    """Start draining ``iterable`` on a daemon thread and return an iterator over its items.
+
+    At most ``size`` items are buffered; an exception raised by ``iterable`` is
+    re-raised by the returned iterator once the items before it are consumed.
+    """
+    buffer: "queue.Queue[Tuple[bool, Any]]" = queue.Queue(size)
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                buffer.put((True, item))
+        except BaseException as exc:
+            buffer.put((False, exc))
+        else:
+            buffer.put((False, None))
+
+    threading.Thread(target=produce, name="reysilvagen-prefetch", daemon=True).start()
+
+    def drain() -> Iterator[Any]:
+        while True:
+            more, item = buffer.get()
+            if more:
+                yield item
+            elif item is not None:
+                raise item
+            else:
+                return
+
+    return drain()
+
+
+def pair_cards(cards: Iterable[CardRecord], addresses: Iterable[Dict[str, str]]) -> Iterator[CardRecord]:
+    """Join each card with the next address into a record keyed by ``PAIRED_FIELDS``."""
+    addresses = iter(addresses)
     for card in cards:
-        writer.writerow([card["number"], card["exp_month"], card["exp_year"], card["cvv"]])
-    return buffer.getvalue().rstrip("\n")
+        address = next(addresses, None)
+        if address is None:
+            raise RuntimeError("Ran out of addresses to pair with cards")
+        record = {field: card[field] for field in CARD_FIELDS}
+        record.update(zip(ADDRESS_FIELDS, (address[label] for label in ADDRESS_LABELS)))
+        yield record
+
+
+class PairedPlainLayout(TextLayout):
+    def render_records(self, cards: Sequence[CardRecord], first: bool) -> str:
+        return "".join(
+            f"{card['number']} {card['street']}, {card['city']}, {card['state']} {card['zip']}\n"
+            for card in cards
+        )
 
 
-def format_json(cards: List[CardRecord]) -> str:
-    return json.dumps(cards, indent=2)
+class PairedPipeLayout(TextLayout):
+    def render_records(self, cards: Sequence[CardRecord], first: bool) -> str:
+        return "".join("|".join(card[field] for field in PAIRED_ROW_ORDER) + "\n" for card in cards)
 
 
-FORMATTERS: Dict[str, Callable[[List[CardRecord]], str]] = {
-    "plain": format_plain,
-    "pipe": format_pipe,
-    "csv": format_csv,
-    "json": format_json,
-}
+class PairedCsvLayout(TextLayout):
+    header = "card_number,exp_month,exp_year,cvv,street,city,state,zip\r\n"
 
+    def render_records(self, cards: Sequence[CardRecord], first: bool) -> str:
+        # Addresses contain commas, so rows go through the csv module for quoting.
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows([card[field] for field in PAIRED_ROW_ORDER] for card in cards)
+        return buffer.getvalue()
 
-# ---------------------------------------------------------------------------
-# Random address helper
-# ---------------------------------------------------------------------------
 
-ADDRESS_PATTERN_TEMPLATE = r"<b>{label}:?\s*</b>\s*(?:&nbsp;|\s)*([^<]+)"
+class PairedJsonLinesLayout(TextLayout):
+    def render_records(self, cards: Sequence[CardRecord], first: bool) -> str:
+        return "".join(
+            json.dumps({field: card[field] for field in PAIRED_FIELDS}) + "\n" for card in cards
+        )
 
 
-def parse_random_address(html_text: str) -> Dict[str, str]:
-    """Parse address fields from the BestRandoms HTML payload."""
-    results: Dict[str, str] = {}
-    for label in ADDRESS_LABELS:
-        pattern = ADDRESS_PATTERN_TEMPLATE.format(label=re.escape(label))
-        match = re.search(pattern, html_text, flags=re.IGNORECASE)
-        if not match:
-            raise ValueError(f"Could not parse {label.lower()}")
-        value = html.unescape(match.group(1)).strip()
-        results[label] = value
-    return results
+PAIRED_LAYOUTS: Dict[str, TextLayout] = {
+    "plain": PairedPlainLayout(),
+    "pipe": PairedPipeLayout(),
+    "csv": PairedCsvLayout(),
+    "json": LAYOUTS["json"],
+    "jsonl": PairedJsonLinesLayout(),
+}
 
 
-def fetch_random_us_address(url: str = ADDRESS_URL) -> Dict[str, str]:
-    """Fetch a random US address and return the parsed fields."""
-    request = urllib.request.Request(url, headers=ADDRESS_HEADERS)
-    try:
-        with urllib.request.urlopen(request, timeout=15) as response:
-            html_text = response.read().decode("utf-8")
-    except urllib.error.URLError as exc:  # pragma: no cover - network errors
-        raise RuntimeError(f"Failed to fetch address: {exc}") from exc
-    return parse_random_address(html_text)
+def write_paired(
+    cards: Iterable[CardRecord],
+    addresses: Iterable[Dict[str, str]],
+    stream: TextIO,
+    layout: Union[str, TextLayout] = "pipe",
+) -> None:
+    """Stream ``cards`` joined with ``addresses`` through a ``PAIRED_LAYOUTS`` layout."""
+    if isinstance(layout, str):
+        layout = PAIRED_LAYOUTS[layout]
+    write_cards(pair_cards(cards, addresses), stream, layout)
+
+
+def _iter_address_source(args: argparse.Namespace, count: int) -> Iterator[Dict[str, str]]:
+    if args.address_csv:
+        corpus = AddressCorpus.load(args.address_csv)
+        yield from corpus.sample(count, state=args.address_state, zip_prefix=args.address_zip)
+        return
+    with AddressFetcher(
+        concurrency=args.address_concurrency,
+        rate=args.address_rate,
+        cache_dir=args.address_cache,
+        offline=args.address_offline,
+    ) as fetcher:
+        yield from fetcher.iter_addresses(count)
+    if count > ADDRESS_MAX_QUANTITY or args.address_cache:
+        print(fetcher.report(), file=sys.stderr)
 
 
-def display_us_address(address: Dict[str, str]) -> None:
-    for label in ADDRESS_LABELS:
-        print(f"{label}: {address[label]}")
+# ---------------------------------------------------------------------------
+# Offline address corpus
+# ---------------------------------------------------------------------------
+# The CSV shape is the one the Electron app's csvLoader reads: FULL ADDRESS, CITY
+# and ZIP are required and JURISDICTION holds the state.
+
+ADDRESS_CSV_STREET = "FULL ADDRESS"
+ADDRESS_CSV_CITY = "CITY"
+ADDRESS_CSV_ZIP = "ZIP"
+ADDRESS_CSV_STATE = "JURISDICTION"
+ADDRESS_DEFAULT_STATE = "Louisiana"  # same fallback as the Electron address generator
+ADDRESS_CACHE_MAGIC = b"RSGADDR1"
+ADDRESS_CACHE_VERSION = 1
+ADDRESS_CACHE_SUFFIX = ".cache"
+ADDRESS_CACHE_HEADER = struct.Struct("<8sIQI")  # magic, version, rows, metadata length
+
+
+def _source_stamp(path: str) -> List[int]:
+    status = os.stat(path)
+    return [status.st_size, status.st_mtime_ns]
+
+
+def _read_address_csv(path: str) -> List[Tuple[str, str, str, str]]:
+    """Return ``(street, city, state, zip)`` rows, skipping rows without the required fields."""
+    rows = []
+    with open(path, "r", encoding="utf-8-sig", newline="") as handle:
+        for record in csv.DictReader(handle):
+            street = (record.get(ADDRESS_CSV_STREET) or "").strip()
+            city = (record.get(ADDRESS_CSV_CITY) or "").strip()
+            zip_code = (record.get(ADDRESS_CSV_ZIP) or "").strip()
+            if street and city and zip_code:
+                state = (record.get(ADDRESS_CSV_STATE) or "").strip() or ADDRESS_DEFAULT_STATE
+                rows.append((street, city, state, zip_code))
+    return rows
+
+
+def _build_address_image(rows: List[Tuple[str, str, str, str]], stamp: List[int]) -> bytes:
+    """Lay ``rows`` out as the columnar corpus image that ``AddressCorpus`` reads."""
+    rows = sorted(rows, key=lambda row: row[3])  # ZIP order makes every prefix a contiguous range
+    cities = sorted({row[1] for row in rows})
+    states = sorted({row[2] for row in rows})
+    city_codes = {city: code for code, city in enumerate(cities)}
+    state_codes = {state: code for code, state in enumerate(states)}
+
+    sections: Dict[str, array.array] = {}
+    for name, column in (("street", 0), ("zip", 3)):
+        encoded = [row[column].encode("utf-8") for row in rows]
+        sections[f"{name}_offsets"] = array.array("Q", itertools.accumulate(map(len, encoded), initial=0))
+        sections[f"{name}_blob"] = array.array("B", b"".join(encoded))
+    sections["city_codes"] = array.array("I", (city_codes[row[1]] for row in rows))
+    sections["state_codes"] = array.array("I", (state_codes[row[2]] for row in rows))
+    by_state: List[List[int]] = [[] for _ in states]
+    for index, code in enumerate(sections["state_codes"]):
+        by_state[code].append(index)
+    sections["state_rows"] = array.array("I", itertools.chain.from_iterable(by_state))
+    state_bounds = list(itertools.accumulate(map(len, by_state), initial=0))
+
+    layout: Dict[str, List[object]] = {}
+    body = bytearray()
+    for name, values in sections.items():
+        body += bytes(-len(body) % 8)
+        layout[name] = [len(body), len(values), values.typecode]
+        body += values.tobytes()
+    metadata = json.dumps({
+        "version": ADDRESS_CACHE_VERSION,
+        "source": stamp,
+        "cities": cities,
+        "states": states,
+        "state_bounds": state_bounds,
+        "sections": layout,
+    }).encode("utf-8")
+    metadata += b" " * (-(ADDRESS_CACHE_HEADER.size + len(metadata)) % 8)
+    header = ADDRESS_CACHE_HEADER.pack(ADDRESS_CACHE_MAGIC, ADDRESS_CACHE_VERSION, len(rows), len(metadata))
+    return header + metadata + bytes(body)
+
+
+class AddressCorpus:
+    """Offline US addresses held column-wise, with state and ZIP-prefix indexes.
+
+    Streets and ZIP codes are UTF-8 blobs with offset arrays, while cities and
+    states are dictionary codes. Rows are sorted by ZIP, so any ZIP prefix is a
+    contiguous row range found by binary search. A grouped row list gives each
+    state's rows. Every column is a zero-copy ``memoryview`` cast over the corpus
+    image, which ``load`` memory-maps from a cache file. Sampling a row is O(1)
+    once its filter has been resolved; filters are cached.
+    """
+
+    def __init__(self, image: object, source: Optional[List[int]] = None) -> None:
+        self._image = image
+        view = memoryview(image)
+        magic, version, self.rows, metadata_size = ADDRESS_CACHE_HEADER.unpack_from(view)
+        if magic != ADDRESS_CACHE_MAGIC or version != ADDRESS_CACHE_VERSION:
+            raise ValueError("Not an address corpus cache")
+        body_start = ADDRESS_CACHE_HEADER.size + metadata_size
+        metadata = json.loads(bytes(view[ADDRESS_CACHE_HEADER.size:body_start]))
+        self.source: List[int] = metadata["source"]
+        self.cities: List[str] = metadata["cities"]
+        self.states: List[str] = metadata["states"]
+        self._state_bounds: List[int] = metadata["state_bounds"]
+        columns: Dict[str, memoryview] = {}
+        for name, (offset, length, typecode) in metadata["sections"].items():
+            start = body_start + offset
+            size = length * array.array(typecode).itemsize
+            columns[name] = view[start:start + size].cast(typecode)
+        self._street_offsets = columns["street_offsets"]
+        self._street_blob = columns["street_blob"]
+        self._zip_offsets = columns["zip_offsets"]
+        self._zip_blob = columns["zip_blob"]
+        self._city_codes = columns["city_codes"]
+        self._state_codes = columns["state_codes"]
+        self._state_rows = columns["state_rows"]
+        self._state_lookup = {state.lower(): code for code, state in enumerate(self.states)}
+        self._filters: Dict[Tuple[Optional[str], str], Sequence[int]] = {}
+        self._digits = DigitSource()
+
+    @classmethod
+    def from_csv(cls, path: str) -> "AddressCorpus":
+        return cls(_build_address_image(_read_address_csv(path), _source_stamp(path)))
+
+    @classmethod
+    def load(cls, path: str, cache_path: Optional[str] = None) -> "AddressCorpus":
+        """Open the corpus for the CSV at ``path`` through its memory-mapped cache.
+
+        The cache (``path + ".cache"`` by default) is rebuilt whenever it is missing,
+        unreadable, or was built from a different version of the CSV.
+        """
+        cache_path = cache_path or path + ADDRESS_CACHE_SUFFIX
+        stamp = _source_stamp(path)
+        mapped: Optional[mmap.mmap] = None
+        try:
+            with open(cache_path, "rb") as handle:
+                mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            corpus = cls(mapped)
+            if corpus.source == stamp:
+                return corpus
+            corpus.close()
+        except (OSError, ValueError, KeyError, struct.error):
+            pass
+        if mapped is not None:
+            mapped.close()
+        image = _build_address_image(_read_address_csv(path), stamp)
+        temporary = cache_path + ".tmp"
+        with open(temporary, "wb") as handle:
+            handle.write(image)
+        os.replace(temporary, cache_path)
+        return cls(image)
+
+    def close(self) -> None:
+        """Release the column views and unmap a memory-mapped image."""
+        for name in (
+            "_street_offsets", "_street_blob", "_zip_offsets", "_zip_blob",
+            "_city_codes", "_state_codes", "_state_rows",
+        ):
+            getattr(self, name).release()
+        self._filters.clear()
+        close = getattr(self._image, "close", None)
+        if close is not None:
+            close()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _text(self, blob: memoryview, offsets: memoryview, index: int) -> str:
+        return str(blob[offsets[index]:offsets[index + 1]], "utf-8")
+
+    def zip_code(self, index: int) -> str:
+        return self._text(self._zip_blob, self._zip_offsets, index)
+
+    def __getitem__(self, index: int) -> Dict[str, str]:
+        if not 0 <= index < self.rows:
+            raise IndexError("address index out of range")
+        return dict(zip(ADDRESS_LABELS, (
+            self._text(self._street_blob, self._street_offsets, index),
+            self.cities[self._city_codes[index]],
+            self.states[self._state_codes[index]],
+            self.zip_code(index),
+        )))
+
+    def _zip_bound(self, prefix: str, low: int, high: int, upper: bool) -> int:
+        while low < high:
+            middle = (low + high) // 2
+            head = self.zip_code(middle)[:len(prefix)]
+            if head < prefix or (upper and head == prefix):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def matching(self, state: Optional[str] = None, zip_prefix: str = "") -> Sequence[int]:
+        """Return the row indexes for a state (name, any case) and/or ZIP prefix."""
+        key = (state.lower() if state else None, zip_prefix)
+        rows = self._filters.get(key)
+        if rows is not None:
+            return rows
+        low = self._zip_bound(zip_prefix, 0, self.rows, False) if zip_prefix else 0
+        high = self._zip_bound(zip_prefix, low, self.rows, True) if zip_prefix else self.rows
+        rows = range(low, high)
+        if state:
+            code = self._state_lookup.get(state.lower())
+            if code is None:
+                rows = range(0)
+            else:
+                members = self._state_rows[self._state_bounds[code]:self._state_bounds[code + 1]]
+                rows = members if not zip_prefix else array.array(
+                    "I", (index for index in members if low <= index < high)
+                )
+        self._filters[key] = rows
+        return rows
+
+    def sample_indices(self, count: int, state: Optional[str] = None, zip_prefix: str = "") -> List[int]:
+        rows = self.matching(state, zip_prefix)
+        if not len(rows):
+            raise ValueError("No addresses match the requested state/ZIP filter")
+        if np is not None and count >= NUMPY_MIN_BATCH:
+            picks = _np_random_below(count, len(rows))
+            if isinstance(rows, range):
+                return (picks.astype(np.int64) + rows.start).tolist()
+            return np.frombuffer(rows, dtype=np.uint32)[picks].tolist()
+        randbelow = self._digits.randbelow
+        size = len(rows)
+        return [rows[randbelow(size)] for _ in range(count)]
+
+    def sample(self, count: int = 1, state: Optional[str] = None, zip_prefix: str = "") -> List[Dict[str, str]]:
+        """Return ``count`` random addresses (with replacement) from the filtered rows."""
+        return [self[index] for index in self.sample_indices(count, state, zip_prefix)]
 
 
 # ---------------------------------------------------------------------------
@@ -550,15 +3880,47 @@ def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser.add_argument(
         "--format",
         "-f",
-        choices=sorted(FORMATTERS.keys()),
+        choices=sorted([*FORMATTERS.keys(), FORMAT_BINARY]),
         default="pipe",
-        help="Output format (plain, pipe, csv, json).",
+        help=(
+            "Output format (plain, pipe, csv, json, jsonl, or fixed-width 'binary' records, "
+            "which requires --output)."
+        ),
+    )
+    parser.add_argument(
+        "--template",
+        "-t",
+        help=(
+            "Custom text layout per card using {number}, {cvv}, {exp_month} and {exp_year}, "
+            "with optional [fill]align width specs, e.g. '{number}|{exp_month}/{exp_year}|{cvv}'. "
+            "Overrides --format."
+        ),
     )
     parser.add_argument(
         "--output",
         "-o",
         help="Optional file path to write the generated data.",
     )
+    parser.add_argument(
+        "--sqlite",
+        metavar="DB",
+        help="Load the cards straight into a table of this SQLite database instead of writing text.",
+    )
+    parser.add_argument(
+        "--sqlite-table",
+        default="cards",
+        help="Table for --sqlite, created when missing (default: cards).",
+    )
+    parser.add_argument(
+        "--sqlite-page-size",
+        type=int,
+        help="Page size for a new --sqlite database (power of two, 512-65536).",
+    )
+    parser.add_argument(
+        "--sqlite-journal-mode",
+        choices=SQLITE_JOURNAL_MODES,
+        help="Journal mode used while loading --sqlite (default: the database's own).",
+    )
     parser.add_argument(
         "--cvv-length",
         type=int,
@@ -581,6 +3943,167 @@ def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
         default=5,
         help="Maximum years ahead for random expiry (default: 5).",
     )
+    parser.add_argument(
+        "--engine",
+        choices=[ENGINE_AUTO, ENGINE_PYTHON, ENGINE_NUMPY],
+        default=ENGINE_AUTO,
+        help="Generation engine: 'numpy' batch engine, 'python' fallback, or 'auto' (default).",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Stream every valid number for the BIN pattern in ascending order (ignores --count).",
+    )
+    parser.add_argument(
+        "--sampling",
+        choices=[SAMPLING_RETRY, SAMPLING_PERMUTATION],
+        default=SAMPLING_RETRY,
+        help=(
+            "Uniqueness strategy: 'retry' random draws against a seen set (default; runs of more "
+            f"than {RETRY_UNIQUE_LIMIT} cards use 'permutation') or 'permutation' over the wildcard "
+            "space (constant memory, no retries)."
+        ),
+    )
+    parser.add_argument(
+        "--seed",
+        help="Make generation reproducible: the same seed always yields the same cards.",
+    )
+    parser.add_argument(
+        "--expiry-anchor",
+        metavar="YYYY-MM",
+        help=(
+            "Count random expiry dates from this month instead of the current one, so "
+            "seeded runs stay byte-identical across months."
+        ),
+    )
+    parser.add_argument(
+        "--start",
+        type=int,
+        default=0,
+        help="Index of the first card to emit, to regenerate a slice of a run (default: 0).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Generate with N worker processes, each owning a disjoint shard (default: 1).",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=sorted(COMPRESSORS.keys()),
+        help="Compress the text output as parallel independent blocks (multi-member file).",
+    )
+    parser.add_argument(
+        "--compress-threads",
+        type=int,
+        metavar="N",
+        help="Threads used by --compress (default: one per CPU).",
+    )
+    parser.add_argument(
+        "--issued-index",
+        metavar="DB",
+        help="SQLite file recording every number issued across runs; issued numbers are skipped.",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        metavar="N",
+        help="Checkpoint --output every N cards so an interrupted run can be resumed.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume the interrupted checkpointed run that was writing --output.",
+    )
+    parser.add_argument(
+        "--manifest",
+        metavar="FILE",
+        help=(
+            "Run every job in a JSON or CSV manifest (bin, count, length, cvv_length, "
+            "years_ahead, expiry_month, expiry_year, engine, sampling, seed, start, "
+            "format, output, weight) in one process."
+        ),
+    )
+    parser.add_argument(
+        "--interleave",
+        action="store_true",
+        help="With --manifest, mix jobs without their own output into one stream by weight.",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="ADDRESS",
+        help=(
+            "Run a generation service: 'unix:PATH' for framed JSON lines on a Unix socket, "
+            "or '[HOST:]PORT' for HTTP (default host 127.0.0.1)."
+        ),
+    )
+    parser.add_argument(
+        "--stdio",
+        action="store_true",
+        help="Coprocess mode: answer JSON-lines requests on stdin with framed responses on stdout.",
+    )
+    parser.add_argument(
+        "--validate",
+        metavar="FILE",
+        help="Stream a plain, pipe, CSV or JSON card file, report invalid lines, and exit.",
+    )
+    parser.add_argument(
+        "--address-count",
+        type=int,
+        default=1,
+        metavar="N",
+        help=f"Number of addresses to print (fetched up to {ADDRESS_MAX_QUANTITY} per request; default: 1).",
+    )
+    parser.add_argument(
+        "--pair",
+        action="store_true",
+        help=(
+            "Join each generated card with one address (cards_then_address mode) and write "
+            "the joined records in the chosen --format or --template."
+        ),
+    )
+    parser.add_argument(
+        "--address-cache",
+        metavar="DIR",
+        help="Record fetched address pages in a content-addressed cache and replay them.",
+    )
+    parser.add_argument(
+        "--address-offline",
+        action="store_true",
+        help="Serve addresses only from --address-cache, without network access.",
+    )
+    parser.add_argument(
+        "--address-concurrency",
+        type=int,
+        default=ADDRESS_CONCURRENCY,
+        metavar="N",
+        help=f"Concurrent address requests over pooled connections (default: {ADDRESS_CONCURRENCY}).",
+    )
+    parser.add_argument(
+        "--address-rate",
+        type=float,
+        default=ADDRESS_RATE,
+        metavar="RPS",
+        help=f"Maximum address requests per second (default: {ADDRESS_RATE}).",
+    )
+    parser.add_argument(
+        "--address-csv",
+        metavar="FILE",
+        help=(
+            "Draw addresses offline from a CSV corpus (FULL ADDRESS, CITY, ZIP, JURISDICTION "
+            "columns) cached next to it as FILE.cache, instead of fetching them."
+        ),
+    )
+    parser.add_argument(
+        "--address-state",
+        help="With --address-csv, only draw addresses in this state.",
+    )
+    parser.add_argument(
+        "--address-zip",
+        default="",
+        metavar="PREFIX",
+        help="With --address-csv, only draw addresses whose ZIP starts with PREFIX.",
+    )
     parser.add_argument(
         "--interactive",
         "-i",
@@ -592,11 +4115,18 @@ def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
         action="store_true",
         help="Run built-in self tests and exit.",
     )
+    parser.add_argument(
+        "--benchmark",
+        choices=sorted(BENCHMARKS.keys()),
+        help="Run a built-in throughput benchmark and exit.",
+    )
     return parser.parse_args(argv)
 
 def _determine_mode(args: argparse.Namespace) -> str:
     if args.mode:
         return args.mode
+    if args.pair:
+        return MODE_BOTH
 
     card_related = any(
         value is not None
@@ -604,11 +4134,30 @@ def _determine_mode(args: argparse.Namespace) -> str:
             args.bin,
             args.length,
             args.output,
+            args.checkpoint_every,
+            args.compress,
+            args.template,
+            args.issued_index,
+            args.sqlite,
             args.cvv_length,
             args.expiry_month,
             args.expiry_year,
+            args.expiry_anchor,
+        )
+    ) or any(
+        (
+            args.count != 10,
+            args.format != "pipe",
+            args.engine != ENGINE_AUTO,
+            args.sampling != SAMPLING_RETRY,
+            args.all,
+            args.seed is not None,
+            args.workers != 1,
+            args.resume,
+            args.interactive,
+            args.self_test,
         )
-    ) or args.count != 10 or args.format != "pipe" or args.interactive or args.self_test
+    )
     if card_related:
         return MODE_CARDS
 
@@ -622,75 +4171,502 @@ def main(argv: Optional[List[str]] = None) -> int:
         success = _run_self_tests()
         return 0 if success else 1
 
+    if args.benchmark:
+        BENCHMARKS[args.benchmark]()
+        return 0
+
+    if args.validate:
+        return _run_validation(args.validate)
+
+    if args.template is not None:
+        try:
+            register_template(args.template, allowed_fields=PAIRED_FIELDS if args.pair else CARD_FIELDS)
+        except ValueError as exc:
+            print(f"Error: invalid --template: {exc}", file=sys.stderr)
+            return 1
+        args.format = TEMPLATE_FORMAT
+
+    if args.manifest:
+        return _run_manifest(args)
+
+    if args.stdio:
+        try:
+            run_stdio(CardGenerator(), sys.stdin.buffer, sys.stdout.buffer)
+        except (KeyboardInterrupt, BrokenPipeError):
+            pass
+        return 0
+
+    if args.serve:
+        try:
+            asyncio.run(_serve_forever(args.serve))
+        except KeyboardInterrupt:
+            pass
+        except (OSError, ValueError) as exc:
+            print(f"Error: cannot serve on {args.serve}: {exc}", file=sys.stderr)
+            return 1
+        return 0
+
     mode = _determine_mode(args)
 
-    cards: List[Dict[str, str]] = []
+    cards: Iterable[CardRecord] = []
+    addresses: Optional[Iterator[Dict[str, str]]] = None
+
+    if args.pair:
+        if mode != MODE_BOTH:
+            print(f"Error: --pair requires --mode {MODE_BOTH}", file=sys.stderr)
+            return 1
+        if (
+            not args.bin or args.interactive or args.all or args.format == FORMAT_BINARY
+            or args.resume or args.checkpoint_every or args.sqlite
+        ):
+            print(
+                "Error: --pair requires --bin and cannot be combined with --interactive, --all, "
+                "the binary format, checkpointing or --sqlite",
+                file=sys.stderr,
+            )
+            return 1
 
     if mode in {MODE_CARDS, MODE_BOTH}:
         generator = CardGenerator()
 
-        if args.interactive or not args.bin:
-            while True:
-                _collect_interactive_config(args)
-                try:
-                    cards = generator.generate_bulk(
-                        bin_pattern=args.bin,
-                        count=args.count,
-                        length=args.length,
-                        cvv_length=args.cvv_length,
-                        years_ahead=args.years_ahead,
-                        expiry_month=args.expiry_month,
-                        expiry_year=args.expiry_year,
-                    )
-                    break
-                except (ValueError, RuntimeError) as exc:
-                    print(f"Error: {exc}", file=sys.stderr)
-                    if not _prompt_yes_no("Try again? (y/N): "):
-                        return 1
-        else:
-            cards = generator.generate_bulk(
-                bin_pattern=args.bin,
-                count=args.count,
-                length=args.length,
-                cvv_length=args.cvv_length,
-                years_ahead=args.years_ahead,
-                expiry_month=args.expiry_month,
-                expiry_year=args.expiry_year,
+        if args.sqlite and (args.format == FORMAT_BINARY or args.resume or args.checkpoint_every or args.compress):
+            print(
+                "Error: --sqlite cannot be combined with the binary format, checkpointing or --compress",
+                file=sys.stderr,
             )
+            return 1
+        if args.compress and (args.format == FORMAT_BINARY or args.resume or args.checkpoint_every):
+            print(
+                "Error: --compress cannot be combined with the binary format or checkpointing",
+                file=sys.stderr,
+            )
+            return 1
+        if args.issued_index and (args.format == FORMAT_BINARY or args.resume or args.checkpoint_every):
+            print(
+                "Error: --issued-index cannot be combined with the binary format or checkpointing",
+                file=sys.stderr,
+            )
+            return 1
+        if mode == MODE_BOTH:
+            addresses = prefetch(_iter_address_source(args, args.count if args.pair else args.address_count))
+        issued_index = IssuedIndex(args.issued_index) if args.issued_index else None
+        if args.format == FORMAT_BINARY:
+            status = _run_binary(generator, args)
+            if status:
+                return status
+        elif args.resume or args.checkpoint_every:
+            status = _run_checkpointed(generator, args)
+            if status:
+                return status
+        else:
+            if args.interactive or not args.bin:
+                while True:
+                    _collect_interactive_config(args)
+                    try:
+                        cards = generator.generate_bulk(
+                            bin_pattern=args.bin,
+                            count=args.count,
+                            length=args.length,
+                            cvv_length=args.cvv_length,
+                            years_ahead=args.years_ahead,
+                            expiry_month=args.expiry_month,
+                            expiry_year=args.expiry_year,
+                            engine=args.engine,
+                            sampling=args.sampling,
+                            seed=args.seed,
+                            start=args.start,
+                            workers=args.workers,
+                            issued_index=issued_index,
+                            expiry_anchor=args.expiry_anchor,
+                        )
+                        break
+                    except (ValueError, RuntimeError) as exc:
+                        print(f"Error: {exc}", file=sys.stderr)
+                        if not _prompt_yes_no("Try again? (y/N): "):
+                            return 1
+            else:
+                sampling = args.sampling
+                if args.all:
+                    args.count = generator.capacity(args.bin, args.length) - args.start
+                    sampling = SAMPLING_SEQUENTIAL
+                cards = generator.iter_cards(
+                    bin_pattern=args.bin,
+                    count=args.count,
+                    length=args.length,
+                    cvv_length=args.cvv_length,
+                    years_ahead=args.years_ahead,
+                    expiry_month=args.expiry_month,
+                    expiry_year=args.expiry_year,
+                    engine=args.engine,
+                    sampling=sampling,
+                    seed=args.seed,
+                    start=args.start,
+                    workers=args.workers,
+                    issued_index=issued_index,
+                    expiry_anchor=args.expiry_anchor,
+                )
 
-        formatter = FORMATTERS[args.format]
-        rendered = formatter(cards)
-
-        if args.output:
-            path_out = Path(args.output)
             try:
-                path_out.write_text(
-                    rendered + ("\n" if rendered and not rendered.endswith("\n") else ""),
-                    encoding="utf-8",
-                )
+                if args.sqlite:
+                    started = time.perf_counter()
+                    rows = load_sqlite(
+                        cards,
+                        args.sqlite,
+                        args.sqlite_table,
+                        page_size=args.sqlite_page_size,
+                        journal_mode=args.sqlite_journal_mode,
+                    )
+                    elapsed = time.perf_counter() - started
+                    rate = rows / elapsed if elapsed > 0 else float(rows)
+                    print(
+                        f"Loaded {rows} rows into {args.sqlite}:{args.sqlite_table} "
+                        f"in {elapsed:.2f}s ({rate:,.0f} rows/s).",
+                        file=sys.stderr,
+                    )
+                elif args.pair:
+                    layout = LAYOUTS[args.format] if args.template is not None else PAIRED_LAYOUTS[args.format]
+                    with open_card_sink(args.output, args.compress, args.compress_threads) as sink:
+                        write_paired(cards, addresses, sink, layout)
+                else:
+                    with open_card_sink(args.output, args.compress, args.compress_threads) as sink:
+                        WRITERS[args.format](cards, sink)
             except OSError as exc:
                 print(f"Error writing output: {exc}", file=sys.stderr)
                 return 1
-        else:
-            print(rendered)
+            except sqlite3.Error as exc:
+                print(f"Error loading {args.sqlite}: {exc}", file=sys.stderr)
+                return 1
+            finally:
+                if issued_index is not None:
+                    issued_index.close()
 
         print(WARNING_MESSAGE, file=sys.stderr)
 
-        if mode == MODE_BOTH and not args.output:
+        if mode == MODE_BOTH and not args.output and not args.pair:
             print()
 
-    if mode in {MODE_ADDRESS, MODE_BOTH}:
-        address = fetch_random_us_address()
-        display_us_address(address)
+    if mode in {MODE_ADDRESS, MODE_BOTH} and not args.pair:
+        if addresses is None:
+            addresses = _iter_address_source(args, args.address_count)
+        for number, address in enumerate(addresses):
+            if number:
+                print()
+            display_us_address(address)
+
+    return 0
+
+
+def _run_checkpointed(generator: CardGenerator, args: argparse.Namespace) -> int:
+    if not args.output:
+        print("Error: --checkpoint-every and --resume require --output", file=sys.stderr)
+        return 1
+    settings: Dict[str, object] = {}
+    if not args.resume:
+        if not args.bin:
+            print("Error: --bin is required for checkpointed generation", file=sys.stderr)
+            return 1
+        count = args.count
+        sampling = args.sampling
+        if args.all:
+            count = generator.capacity(args.bin, args.length) - args.start
+            sampling = SAMPLING_SEQUENTIAL
+        settings = {
+            "bin_pattern": args.bin,
+            "count": count,
+            "format": args.format,
+            "template": args.template,
+            "length": args.length,
+            "cvv_length": args.cvv_length,
+            "years_ahead": args.years_ahead,
+            "expiry_month": args.expiry_month,
+            "expiry_year": args.expiry_year,
+            "engine": args.engine,
+            "sampling": sampling,
+            "seed": args.seed,
+            "start": args.start,
+            "workers": args.workers,
+            "expiry_anchor": args.expiry_anchor,
+        }
+    try:
+        write_checkpointed(
+            generator,
+            args.output,
+            settings,
+            interval=args.checkpoint_every,
+            resume=args.resume,
+        )
+    except OSError as exc:
+        print(f"Error writing output: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _run_binary(generator: CardGenerator, args: argparse.Namespace) -> int:
+    if not args.output or not args.bin:
+        print("Error: the binary format requires --bin and --output", file=sys.stderr)
+        return 1
+    if args.resume or args.checkpoint_every:
+        print("Error: checkpointing is not supported for the binary format", file=sys.stderr)
+        return 1
+    count = args.count
+    sampling = args.sampling
+    if args.all:
+        count = generator.capacity(args.bin, args.length) - args.start
+        sampling = SAMPLING_SEQUENTIAL
+    try:
+        write_binary(
+            args.output,
+            args.bin,
+            count,
+            workers=args.workers,
+            length=args.length,
+            cvv_length=args.cvv_length,
+            years_ahead=args.years_ahead,
+            expiry_month=args.expiry_month,
+            expiry_year=args.expiry_year,
+            engine=args.engine,
+            sampling=sampling,
+            seed=args.seed,
+            start=args.start,
+            expiry_anchor=args.expiry_anchor,
+        )
+    except OSError as exc:
+        print(f"Error writing output: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
 
+def _run_manifest(args: argparse.Namespace) -> int:
+    if args.format == FORMAT_BINARY or args.resume or args.checkpoint_every:
+        print(
+            "Error: --manifest cannot be combined with the binary format or checkpointing",
+            file=sys.stderr,
+        )
+        return 1
+    defaults = {
+        "count": args.count,
+        "length": args.length,
+        "cvv_length": args.cvv_length,
+        "years_ahead": args.years_ahead,
+        "expiry_month": args.expiry_month,
+        "expiry_year": args.expiry_year,
+        "engine": args.engine,
+        "sampling": args.sampling,
+        "seed": args.seed,
+        "expiry_anchor": args.expiry_anchor,
+    }
+    try:
+        jobs = load_manifest(args.manifest)
+        run_manifest(
+            CardGenerator(),
+            jobs,
+            defaults,
+            output=args.output,
+            fmt=args.format,
+            interleave=args.interleave,
+            compress=args.compress,
+            compress_threads=args.compress_threads,
+        )
+    except OSError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    except ValueError as exc:
+        print(f"Error: invalid manifest: {exc}", file=sys.stderr)
+        return 1
+    print(WARNING_MESSAGE, file=sys.stderr)
     return 0
 
 
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def _report_rate(label: str, amount: int, unit: str, elapsed: float) -> float:
+    rate = amount / elapsed if elapsed > 0 else float(amount)
+    print(f"{label:<32} {amount:>10} {unit} in {elapsed:7.3f}s  {rate:>14,.0f} {unit}/s")
+    return rate
+
+
+class _SystemRandomDigits(DigitSource):
+    """The previous one-``randrange``-per-digit strategy, kept for benchmarking."""
+
+    __slots__ = ("_rand",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._rand = secrets.SystemRandom()
+
+    def digits(self, count: int) -> str:
+        return "".join(str(self._rand.randrange(0, 10)) for _ in range(count))
+
+    def randbelow(self, bound: int) -> int:
+        return self._rand.randrange(0, bound)
+
+
+def _benchmark_digits() -> None:
+    """Compare per-digit SystemRandom calls with the buffered DigitSource."""
+    total_digits = 2_000_000
+    rand = secrets.SystemRandom()
+    started = time.perf_counter()
+    "".join(str(rand.randrange(0, 10)) for _ in range(total_digits))
+    baseline = _report_rate("SystemRandom.randrange per digit", total_digits, "digits", time.perf_counter() - started)
+
+    source = DigitSource()
+    started = time.perf_counter()
+    for _ in range(total_digits // 16):
+        source.digits(16)
+    buffered = _report_rate("DigitSource.digits(16)", total_digits, "digits", time.perf_counter() - started)
+    print(f"speedup: {buffered / baseline:.1f}x")
+
+    count = 100_000
+    for label, generator in (
+        ("generate_bulk, per-digit source", CardGenerator(_SystemRandomDigits())),
+        ("generate_bulk, DigitSource", CardGenerator()),
+    ):
+        started = time.perf_counter()
+        generator.generate_bulk("445566", count=count, length=16, engine=ENGINE_PYTHON)
+        _report_rate(label, count, "cards", time.perf_counter() - started)
+
+
+def _benchmark_compress() -> None:
+    """Report BlockCompressor throughput for each codec as the thread count grows."""
+    cards = CardGenerator().generate_bulk(
+        "445566", count=1_000_000, length=16, seed="benchmark", as_batch=True
+    )
+    text = format_pipe(cards).encode("utf-8")
+    total = len(text)
+    cpus = os.cpu_count() or 1
+    thread_counts = sorted({threads for threads in (1, 2, 4, 8, cpus) if threads <= cpus})
+    print(f"{total:,} bytes of pipe output, {cpus} CPUs")
+    for method in sorted(COMPRESSORS):
+        baseline = 0.0
+        for threads in thread_counts:
+            compressed = io.BytesIO()
+            started = time.perf_counter()
+            compressor = BlockCompressor(compressed, method, threads=threads, block_size=1 << 20)
+            compressor.write(text)
+            compressor.close()
+            rate = _report_rate(f"{method}, {threads} thread(s)", total, "bytes", time.perf_counter() - started)
+            baseline = baseline or rate
+            print(f"  ratio {total / len(compressed.getvalue()):.1f}x, scaling {rate / baseline:.2f}x")
+
+
+def _benchmark_addresses() -> None:
+    """Time corpus parsing against the mapped cache, then filtered sampling rates."""
+    states = ["Louisiana", "Texas", "Ohio", "Maine"]
+    with tempfile.TemporaryDirectory(prefix="reysilvagen-") as directory:
+        path = os.path.join(directory, "addresses.csv")
+        with open(path, "w", encoding="utf-8", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow([ADDRESS_CSV_STREET, ADDRESS_CSV_CITY, ADDRESS_CSV_ZIP, ADDRESS_CSV_STATE])
+            for index in range(200_000):
+                writer.writerow([
+                    f"{index % 9000 + 100} Main Street",
+                    f"City {index % 700}",
+                    f"{(index * 7919) % 99999:05d}",
+                    states[index % len(states)],
+                ])
+        started = time.perf_counter()
+        AddressCorpus.load(path)
+        _report_rate("parse CSV and build cache", 200_000, "rows", time.perf_counter() - started)
+        started = time.perf_counter()
+        corpus = AddressCorpus.load(path)
+        _report_rate("open mapped cache", 200_000, "rows", time.perf_counter() - started)
+
+        count = 1_000_000
+        for label, state, prefix in (
+            ("sample indices, unfiltered", None, ""),
+            ("sample indices, state", "texas", ""),
+            ("sample indices, ZIP prefix 70", None, "70"),
+        ):
+            corpus.sample_indices(1, state, prefix)
+            started = time.perf_counter()
+            corpus.sample_indices(count, state, prefix)
+            _report_rate(label, count, "addresses", time.perf_counter() - started)
+        started = time.perf_counter()
+        corpus.sample(100_000)
+        _report_rate("sample records", 100_000, "addresses", time.perf_counter() - started)
+
+
+def _address_fixture_html(count: int) -> str:
+    """An HTML payload shaped like a recorded BestRandoms response with ``count`` addresses."""
+    blocks = "".join(
+        "<li><p><span><b>Street:</b>&nbsp;&nbsp;"
+        f"{index + 100} Maple Avenue</span></p>"
+        "<p><span><b>City:</b>&nbsp;&nbsp;Springfield</span></p>"
+        "<p><span><b>State/province/area: </b>&nbsp;&nbsp;Illinois</span></p>"
+        "<p><span><b>Phone number</b>&nbsp;&nbsp;217-555-0100</span></p>"
+        f"<p><span><b>Zip code</b>&nbsp;&nbsp;{62700 + index % 100}</span></p></li>"
+        for index in range(count)
+    )
+    filler = "<div class='nav'>" + "<a href='/x'>link</a>" * 400 + "</div>"
+    return f"<html><head><title>Random Address</title></head><body>{filler}<ul>{blocks}</ul>{filler}</body></html>"
+
+
+def _parse_address_per_label(html_text: str) -> Dict[str, str]:
+    """The previous parser: one freshly formatted regex and full scan per label."""
+    results: Dict[str, str] = {}
+    for label in ADDRESS_LABELS:
+        pattern = ADDRESS_PATTERN_TEMPLATE.format(label=re.escape(label))
+        match = re.search(pattern, html_text, flags=re.IGNORECASE)
+        if not match:
+            raise ValueError(f"Could not parse {label.lower()}")
+        results[label] = html.unescape(match.group(1)).strip()
+    return results
+
+
+def _benchmark_address_parsing() -> None:
+    """Compare parsers on fixture payloads of 1 to ADDRESS_MAX_QUANTITY addresses."""
+    payloads = 2000
+    single = _address_fixture_html(1)
+    started = time.perf_counter()
+    for _ in range(payloads):
+        _parse_address_per_label(single)
+    _report_rate("per-label scans, 1 per payload", payloads, "addresses", time.perf_counter() - started)
+    for quantity in (1, 5, ADDRESS_MAX_QUANTITY):
+        payload = _address_fixture_html(quantity)
+        started = time.perf_counter()
+        for _ in range(payloads):
+            parse_random_addresses(payload)
+        _report_rate(
+            f"single pass, {quantity} per payload", payloads * quantity, "addresses", time.perf_counter() - started
+        )
+    print(f"requests for 1000 addresses: {1000} at quantity=1, {-(-1000 // ADDRESS_MAX_QUANTITY)} batched")
+
+
+def _benchmark_networks() -> None:
+    """Classify a mixed batch of numbers one at a time and through the batch API."""
+    generator = CardGenerator()
+    bins = ("411111", "555555", "378282", "601100", "353011", "622126", "676770", "650010")
+    numbers = [
+        card["number"]
+        for bin_pattern in bins
+        for card in generator.generate_bulk(bin_pattern, count=25000, engine=ENGINE_PYTHON)
+    ]
+    started = time.perf_counter()
+    for number in numbers:
+        classify_card_network(number)
+    _report_rate("classify_card_network", len(numbers), "numbers", time.perf_counter() - started)
+    started = time.perf_counter()
+    classify_card_networks(numbers)
+    _report_rate("classify_card_networks", len(numbers), "numbers", time.perf_counter() - started)
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    "digits": _benchmark_digits,
+    "compress": _benchmark_compress,
+    "addresses": _benchmark_addresses,
+    "address-parsing": _benchmark_address_parsing,
+    "networks": _benchmark_networks,
+}
+
+
 # ---------------------------------------------------------------------------
 # Self tests
 # ---------------------------------------------------------------------------
 
 def _run_self_tests() -> bool:
+    import contextlib
     import unittest
 
     class ValidatorTests(unittest.TestCase):
@@ -711,6 +4687,29 @@ def _run_self_tests() -> bool:
             for card in ["4111111111111112", "abcdef", ""]:
                 self.assertFalse(validate_luhn(card))
 
+        def test_validate_luhn_batch(self) -> None:
+            numbers = ["4111111111111111", "4111111111111112", "378282246310005", "37828224631000x", "0", ""]
+            self.assertEqual(
+                validate_luhn_batch(numbers),
+                [validate_luhn(number) for number in numbers],
+            )
+
+        def test_validate_fixture_formats(self) -> None:
+            cards = [
+                {"number": "4111111111111111", "exp_month": "01", "exp_year": "30", "cvv": "123"},
+                {"number": "4111111111111112", "exp_month": "06", "exp_year": "28", "cvv": "321"},
+            ]
+            for name, formatter in FORMATTERS.items():
+                lines = io.StringIO(formatter(cards) + "\n")
+                invalid = [
+                    entry
+                    for _, chunk in validate_fixture_lines(lines, chunk_size=1)
+                    for entry in chunk
+                ]
+                self.assertEqual([number for _, number in invalid], ["4111111111111112"], name)
+            lines = io.StringIO(format_pipe(cards))
+            self.assertEqual(list(validate_fixture_lines(lines))[0][1][0][0], 2)
+
     class GeneratorTests(unittest.TestCase):
         def setUp(self) -> None:
             self.generator = CardGenerator()
@@ -743,6 +4742,35 @@ def _run_self_tests() -> bool:
                 self.assertEqual(card["exp_month"], "12")
                 self.assertEqual(card["exp_year"], "30")
 
+        def test_python_engine(self) -> None:
+            cards = self.generator.generate_bulk(
+                "445566", count=300, length=16, engine=ENGINE_PYTHON
+            )
+            self.assertEqual(len(cards), 300)
+            self.assertTrue(all(validate_luhn(card["number"]) for card in cards))
+
+        @unittest.skipIf(np is None, "NumPy is not installed")
+        def test_numpy_engine(self) -> None:
+            cards = self.generator.generate_bulk(
+                "378282xxxxxxxxx", count=500, engine=ENGINE_NUMPY
+            )
+            numbers = [card["number"] for card in cards]
+            self.assertEqual(len(set(numbers)), 500)
+            for card in cards:
+                self.assertEqual(len(card["number"]), 15)
+                self.assertTrue(validate_luhn(card["number"]))
+                self.assertEqual(len(card["cvv"]), 4)
+                self.assertTrue(1 <= int(card["exp_month"]) <= 12)
+
+        @unittest.skipIf(np is None, "NumPy is not installed")
+        def test_numpy_luhn_matches_scalar(self) -> None:
+            partials = _np_random_below(40 * 15, 10).reshape(40, 15)
+            expected = [
+                luhn_checksum("".join(str(digit) for digit in row))
+                for row in partials.tolist()
+            ]
+            self.assertEqual(_np_luhn_check_digits(partials).tolist(), expected)
+
     class FormatterTests(unittest.TestCase):
         SAMPLE = [
             {"number": "4111111111111111", "exp_month": "01", "exp_year": "30", "cvv": "123"},
@@ -766,10 +4794,999 @@ def _run_self_tests() -> bool:
             parsed = json.loads(rendered)
             self.assertEqual(parsed[1]["cvv"], "321")
 
+        def test_writers_match_formatters(self) -> None:
+            for name, formatter in FORMATTERS.items():
+                stream = io.StringIO()
+                WRITERS[name](iter(self.SAMPLE), stream)
+                self.assertEqual(stream.getvalue(), formatter(self.SAMPLE) + "\n", name)
+
+        def test_jsonl(self) -> None:
+            lines = format_jsonl(self.SAMPLE).split("\n")
+            self.assertEqual([json.loads(line) for line in lines], self.SAMPLE)
+
+        def test_card_sink_buffers_and_flushes(self) -> None:
+            raw = io.BytesIO()
+            sink = CardSink(raw, buffer_size=64)
+            write_pipe(self.SAMPLE, sink)
+            self.assertEqual(len(raw.getvalue()), 0)
+            write_pipe(self.SAMPLE * 2, sink)
+            self.assertGreater(len(raw.getvalue()), 0)
+            sink.close()
+            self.assertEqual(raw.getvalue().decode("utf-8"), (format_pipe(self.SAMPLE) + "\n") * 3)
+
+    class PermutationTests(unittest.TestCase):
+        def test_large_unique_retry_runs_use_permutation(self) -> None:
+            generator = CardGenerator()
+
+            def set_based(*args: object, **kwargs: object) -> Iterator[CardRecord]:
+                raise AssertionError("set-based retry sampling used above RETRY_UNIQUE_LIMIT")
+
+            generator._iter_cards_python = set_based  # type: ignore[assignment]
+            generator._iter_cards_numpy = set_based  # type: ignore[assignment]
+            numbers = [card["number"] for card in generator.iter_cards("445566", RETRY_UNIQUE_LIMIT + 1, length=16)]
+            self.assertEqual(len(set(numbers)), RETRY_UNIQUE_LIMIT + 1)
+
+        def test_bijection(self) -> None:
+            for size in (1, 7, 100, 1000):
+                permutation = KeyedPermutation(size, key=42)
+                self.assertEqual(sorted(permutation[i] for i in range(size)), list(range(size)))
+
+        @unittest.skipIf(np is None, "NumPy is not installed")
+        def test_array_matches_scalar(self) -> None:
+            permutation = KeyedPermutation(12345, key=7)
+            values = permutation.permute_array(np.arange(500, dtype=np.uint64)).tolist()
+            self.assertEqual(values, [permutation[i] for i in range(500)])
+
+        def test_permutation_sampling_exhausts_space(self) -> None:
+            for engine in (ENGINE_PYTHON, ENGINE_NUMPY):
+                if engine == ENGINE_NUMPY and np is None:
+                    continue
+                cards = CardGenerator().generate_bulk(
+                    "445566xx1234567x",
+                    count=100,
+                    engine=engine,
+                    sampling=SAMPLING_PERMUTATION,
+                )
+                numbers = {card["number"] for card in cards}
+                self.assertEqual(len(numbers), 100)
+                self.assertTrue(all(validate_luhn(number) for number in numbers))
+
+        def test_permutation_rejects_oversized_count(self) -> None:
+            with self.assertRaises(ValueError):
+                CardGenerator().iter_cards(
+                    "445566xx1234567x", count=101, sampling=SAMPLING_PERMUTATION
+                )
+
+        def test_capacity(self) -> None:
+            generator = CardGenerator()
+            self.assertEqual(generator.capacity("445566xx1234567x"), 100)
+            self.assertEqual(generator.capacity("445566123xxxx", length=16), 10**6)
+            self.assertEqual(generator.capacity("445566xx12345678"), 10)
+
+        def test_sequential_enumerates_all(self) -> None:
+            numbers = [
+                card["number"]
+                for card in CardGenerator().iter_cards(
+                    "445566xx12345678", count=10, sampling=SAMPLING_SEQUENTIAL
+                )
+            ]
+            self.assertEqual(numbers, sorted(numbers))
+            self.assertEqual(len(set(numbers)), 10)
+            self.assertTrue(all(validate_luhn(number) for number in numbers))
+
+        def test_retry_near_capacity_succeeds(self) -> None:
+            cards = CardGenerator().generate_bulk("445566xxx123456x", count=1000)
+            self.assertEqual(len({card["number"] for card in cards}), 1000)
+
+    class DigitSourceTests(unittest.TestCase):
+        def test_digits_span_refills(self) -> None:
+            source = DigitSource(block_size=16)
+            drawn = "".join(source.digits(7) for _ in range(50))
+            self.assertEqual(len(drawn), 350)
+            self.assertTrue(drawn.isdigit())
+            self.assertEqual(set(drawn), set(DIGIT_CHARS))
+
+        def test_randbelow_range(self) -> None:
+            source = DigitSource()
+            values = {source.randbelow(61) for _ in range(3000)}
+            self.assertEqual(values, set(range(61)))
+
+    class SeededTests(unittest.TestCase):
+        def test_seed_is_reproducible(self) -> None:
+            first = CardGenerator().generate_bulk("445566", count=50, length=16, seed="fixture-1")
+            second = CardGenerator().generate_bulk("445566", count=50, length=16, seed="fixture-1")
+            other = CardGenerator().generate_bulk("445566", count=50, length=16, seed="fixture-2")
+            self.assertEqual(first, second)
+            self.assertNotEqual(first, other)
+            self.assertEqual(len({card["number"] for card in first}), 50)
+
+        def test_expiry_anchor_pins_expiries(self) -> None:
+            with tempfile.TemporaryDirectory() as directory:
+                outputs = []
+                for name in ("a.csv", "b.csv"):
+                    path = os.path.join(directory, name)
+                    argv = ["--bin", "445566", "-c", "200", "--seed", "s", "--expiry-anchor", "2040-11", "-f", "csv", "-o", path]
+                    with contextlib.redirect_stderr(io.StringIO()):
+                        self.assertEqual(main(argv), 0)
+                    outputs.append(Path(path).read_bytes())
+            self.assertEqual(outputs[0], outputs[1])
+            cards = list(csv.DictReader(io.StringIO(outputs[0].decode("utf-8"))))
+            expiries = {(card["exp_year"], card["exp_month"]) for card in cards}
+            self.assertTrue(all(("40", "11") <= expiry <= ("45", "11") for expiry in expiries))
+            self.assertEqual(
+                CardGenerator().generate_bulk("445566", count=20, seed="s", expiry_anchor="2040-11"),
+                list(CardGenerator().iter_cards("445566", 20, seed="s", expiry_anchor="2040-11")),
+            )
+
+        def test_slices_match_full_run(self) -> None:
+            full = CardGenerator().generate_bulk("378282", count=40, length=15, seed=7)
+            tail = CardGenerator().generate_bulk("378282", count=15, length=15, seed=7, start=25)
+            self.assertEqual(full[25:], tail)
+
+        @unittest.skipIf(np is None, "NumPy is not installed")
+        def test_engines_agree(self) -> None:
+            for pattern in ("445566", "445566xx12345678"):
+                runs = [
+                    CardGenerator().generate_bulk(
+                        pattern, count=7, length=16, seed=99, start=3, engine=engine
+                    )
+                    for engine in (ENGINE_PYTHON, ENGINE_NUMPY)
+                ]
+                self.assertEqual(runs[0], runs[1])
+
+        def test_workers_match_single_process(self) -> None:
+            options = {"count": 5000, "length": 16, "seed": "shards", "engine": ENGINE_PYTHON}
+            single = CardGenerator().generate_bulk("445566", **options)
+            sharded = CardGenerator().generate_bulk("445566", workers=3, **options)
+            self.assertEqual(single, sharded)
+            # Writers take the rest of a partly consumed run shard by shard.
+            cards = CardGenerator().iter_cards("445566", workers=3, **options)
+            self.assertEqual(list(itertools.islice(cards, 5)), single[:5])
+            stream = io.StringIO()
+            write_pipe(cards, stream)
+            self.assertEqual(stream.getvalue(), format_pipe(single[5:]) + "\n")
+
+        def test_solved_slot_indexes_every_number(self) -> None:
+            compiled = compile_bin_pattern("445566xx12345678")
+            numbers = [compiled.number_at(index) for index in range(compiled.capacity)]
+            self.assertEqual(len(set(numbers)), 10)
+            self.assertEqual(numbers, sorted(numbers))
+            self.assertTrue(all(validate_luhn(number) for number in numbers))
+
+    class PatternTests(unittest.TestCase):
+        def test_classifies_networks_by_longest_prefix(self) -> None:
+            cases = {
+                "4111-1111": "visa",
+                "2221000000": "mastercard",
+                "2720990000": "mastercard",
+                "2721000000": "unknown",
+                "378282": "amex",
+                "3530111333300000": "jcb",
+                "30569309025904": "diners",
+                "6221260000": "unionpay",
+                "6759649826438453": "maestro",
+                "2200123456": "mir",
+                "6500100000": "verve",
+                "6510000000": "discover",
+                "60x11": "discover",
+                "": "unknown",
+            }
+            for number, name in cases.items():
+                self.assertEqual(detect_card_type(number), name, number)
+            networks = classify_card_networks(["4111111111111111", "378282246310005", "4000000000000002"])
+            self.assertEqual([network.name for network in networks], ["visa", "amex", "visa"])
+            batch = CardGenerator().generate_bulk("353011", count=3, as_batch=True)
+            self.assertEqual({network.name for network in classify_card_networks(batch)}, {"jcb"})
+
+        def test_network_rules_feed_defaults(self) -> None:
+            amex = CardGenerator().generate_bulk("378282", count=5, seed=1)
+            self.assertTrue(all(len(card["number"]) == 15 and len(card["cvv"]) == 4 for card in amex))
+            self.assertEqual(compile_bin_pattern("305693").length, 14)
+            self.assertEqual(compile_bin_pattern("378282", 16).length, 16)
+            self.assertEqual(compile_bin_pattern("371449", 16).length, 16)
+            self.assertEqual(len(CardGenerator().generate_bulk("445566", count=1, length=17)[0]["number"]), 17)
+            self.assertEqual(len(CardGenerator().generate_cvv("AMEX")), 4)
+            self.assertEqual(len(CardGenerator().generate_cvv("jcb")), 3)
+
+        def test_compiled_pattern_layout(self) -> None:
+            compiled = compile_bin_pattern("445566xx1234567x")
+            self.assertEqual(compiled.length, 16)
+            self.assertEqual(compiled.prefix, "445566")
+            self.assertEqual(compiled.free_positions, [6, 7])
+            self.assertIsNone(compiled.fixed_last)
+            self.assertIs(compile_bin_pattern("445566xx1234567x"), compiled)
+
+        def test_retry_engines_solve_fixed_check_digit(self) -> None:
+            generator = CardGenerator()
+            numbers = [generator.generate_from_bin("445566xxxxxxxxx7") for _ in range(50)]
+            engines = [ENGINE_PYTHON] + ([ENGINE_NUMPY] if np is not None else [])
+            for engine in engines:
+                numbers += [card["number"] for card in generator.generate_bulk("445566xxxxxxxxx7", count=300, engine=engine)]
+            self.assertTrue(all(number.endswith("7") and validate_luhn(number) for number in numbers))
+            self.assertEqual(len({card["number"] for card in generator.generate_bulk("445566xx12345678", count=10)}), 10)
+            with self.assertRaises(ValueError):
+                generator.generate_from_bin("4455661234567891")
+
+        def test_fill_matches_luhn(self) -> None:
+            compiled = compile_bin_pattern("378282", 15)
+            partial, check_digit = compiled.fill("12345678")
+            self.assertEqual(partial, "37828212345678")
+            self.assertEqual(check_digit, luhn_checksum(partial))
+
+        @unittest.skipIf(np is None, "NumPy is not installed")
+        def test_np_rows_match_fill(self) -> None:
+            compiled = compile_bin_pattern("601100x", 16)
+            free_digits = _np_random_below(20 * 9, 10).reshape(20, 9)
+            rows = _np_digits_to_strings(compiled.np_rows(free_digits))
+            expected = [
+                "".join(map(str, compiled.fill("".join(map(str, row)))))
+                for row in free_digits.tolist()
+            ]
+            self.assertEqual(rows, expected)
+
+    class BinaryFormatTests(unittest.TestCase):
+        OPTIONS = {"length": 16, "seed": "binary", "engine": ENGINE_PYTHON, "expiry_anchor": "2030-01"}
+
+        def test_reader_matches_generated_cards(self) -> None:
+            expected = list(CardGenerator().iter_cards("445566", 300, **self.OPTIONS))
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "cards.bin")
+                write_binary(path, "445566", 300, **self.OPTIONS)
+                self.assertEqual(os.path.getsize(path), BINARY_HEADER.size + 300 * 23)
+                with BinaryCardReader(path) as reader:
+                    self.assertEqual((reader.pattern, reader.number_width), ("445566", 16))
+                    self.assertEqual((reader.count, reader.seed), (300, "binary"))
+                    self.assertEqual(reader.expiry_anchor, "2030-01")
+                    self.assertEqual(reader[137], expected[137])
+                    self.assertEqual(reader[-1], expected[-1])
+                    record = reader.record(5)
+                    self.assertEqual(bytes(record[:16]).decode("ascii"), expected[5]["number"])
+                    self.assertEqual(list(reader), expected)
+                self.assertTrue(reader._handle.closed)
+                self.assertEqual(bytes(record[:16]).decode("ascii"), expected[5]["number"])
+                if np is not None:
+                    with BinaryCardReader(path) as reader:
+                        records = reader.np_records()
+                    self.assertEqual(records[7, :16].tobytes().decode("ascii"), expected[7]["number"])
+
+        def test_workers_fill_disjoint_ranges(self) -> None:
+            with tempfile.TemporaryDirectory() as directory:
+                single = os.path.join(directory, "single.bin")
+                sharded = os.path.join(directory, "sharded.bin")
+                write_binary(single, "445566", 5000, **self.OPTIONS)
+                write_binary(sharded, "445566", 5000, workers=3, **self.OPTIONS)
+                self.assertEqual(Path(single).read_bytes(), Path(sharded).read_bytes())
+
+        def test_rejects_other_files(self) -> None:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "cards.txt")
+                Path(path).write_text("4111111111111111\n", encoding="utf-8")
+                with self.assertRaises(ValueError):
+                    BinaryCardReader(path)
+
+    class TemplateTests(unittest.TestCase):
+        SAMPLE = [
+            {"number": "4111111111111111", "cvv": "123", "exp_month": "01", "exp_year": "30"},
+            {"number": "5555555555554444", "cvv": "321", "exp_month": "06", "exp_year": "28"},
+        ]
+
+        def test_renders_records_and_batches_alike(self) -> None:
+            batch = CardBatch.from_records(self.SAMPLE)
+            for template in (
+                "{number}|{exp_month}/{exp_year}|{cvv}",
+                "{number:<20}{cvv:*>6}{exp_month:^4}{exp_year}",
+                "{{{number}}}",
+                "{cvv}",
+            ):
+                layout = compile_template(template)
+                self.assertEqual(layout.render(batch, True), layout.render(self.SAMPLE, True), template)
+            self.assertEqual(
+                compile_template("{number},{exp_month}/{exp_year},{cvv}").render(self.SAMPLE[:1], True),
+                "4111111111111111,01/30,123\n",
+            )
+
+        def test_rejects_invalid_templates(self) -> None:
+            for template in ("{pan}", "{number!r}", "{cvv:.2f}", "no fields", "{}", "{number"):
+                with self.assertRaises(ValueError, msg=template):
+                    compile_template(template)
+
+        def test_registered_alongside_formatters(self) -> None:
+            register_template("{number}/{cvv}", name="test-template")
+            try:
+                self.assertEqual(
+                    FORMATTERS["test-template"](self.SAMPLE[:2]),
+                    "4111111111111111/123\n5555555555554444/321",
+                )
+                stream = io.StringIO()
+                WRITERS["test-template"](self.SAMPLE[:1], stream)
+                self.assertEqual(stream.getvalue(), "4111111111111111/123\n")
+            finally:
+                for registry in (FORMATTERS, WRITERS, LAYOUTS):
+                    del registry["test-template"]
+
+    class ManifestTests(unittest.TestCase):
+        def _write(self, directory: str, name: str, text: str) -> str:
+            path = os.path.join(directory, name)
+            Path(path).write_text(text, encoding="utf-8")
+            return path
+
+        def test_csv_and_json_manifests_agree(self) -> None:
+            with tempfile.TemporaryDirectory() as directory:
+                csv_path = self._write(
+                    directory,
+                    "jobs.csv",
+                    "bin,count,length,cvv_length,seed\n445566,3,16,,a\n378282,2,15,4,b\n",
+                )
+                json_path = self._write(
+                    directory,
+                    "jobs.json",
+                    json.dumps({"jobs": [
+                        {"bin": "445566", "count": 3, "length": 16, "seed": "a"},
+                        {"bin": "378282", "count": 2, "length": 15, "cvv_length": 4, "seed": "b"},
+                    ]}),
+                )
+                self.assertEqual(load_manifest(csv_path), load_manifest(json_path))
+                self.assertEqual(load_manifest(csv_path)[1]["cvv_length"], 4)
+                with self.assertRaises(ValueError):
+                    load_manifest(self._write(directory, "bad.csv", "bin,colour\n445566,red\n"))
+
+        def test_run_manifest_outputs(self) -> None:
+            jobs = [
+                {"bin": "445566", "count": 40, "length": 16, "weight": 3},
+                {"bin": "378282", "count": 20, "length": 15},
+            ]
+            with tempfile.TemporaryDirectory() as directory:
+                shared = os.path.join(directory, "shared.txt")
+                separate = os.path.join(directory, "separate.json")
+                run_manifest(
+                    CardGenerator(),
+                    jobs + [{"bin": "601100", "count": 5, "output": separate, "format": "json"}],
+                    {"count": 10, "years_ahead": 5},
+                    output=shared,
+                    fmt="plain",
+                    interleave=True,
+                )
+                numbers = Path(shared).read_text(encoding="utf-8").split()
+                self.assertEqual(len(json.loads(Path(separate).read_text(encoding="utf-8"))), 5)
+            self.assertEqual(len(numbers), 60)
+            self.assertEqual(sum(number.startswith("445566") for number in numbers), 40)
+            self.assertTrue(all(validate_luhn(number) for number in numbers))
+            self.assertLess(sum(number.startswith("445566") for number in numbers[:40]), 40)
+
+        def test_interleave_respects_weights(self) -> None:
+            mixed = list(iter_interleaved([iter("a" * 900), iter("b" * 100)], [9, 1], DigitSource()))
+            self.assertEqual(sorted(mixed), ["a"] * 900 + ["b"] * 100)
+            self.assertGreater(mixed[:100].count("a"), 70)
+
+    class ServiceTests(unittest.TestCase):
+        def test_framed_responses(self) -> None:
+            request = {"op": "generate", "id": 7, "bin": "445566", "count": 20000, "length": 16, "seed": "s"}
+            frames = list(iter_framed_response(CardGenerator(), json.dumps(request).encode("utf-8")))
+            self.assertGreater(len(frames), 1)
+            body = b""
+            for frame in frames:
+                header, _, payload = frame.partition(b"\n")
+                header = json.loads(header)
+                self.assertEqual((header["id"], header["status"], header["size"]), (7, "ok", len(payload)))
+                body += payload
+            self.assertFalse(header["more"])
+            expected = CardGenerator().generate_bulk("445566", count=20000, length=16, seed="s")
+            self.assertEqual(body.decode("utf-8"), format_pipe(expected) + "\n")
+
+            error = list(iter_framed_response(CardGenerator(), b'{"op": "generate", "bin": "44"}'))
+            self.assertEqual(json.loads(error[0].partition(b"\n")[0])["status"], "error")
+
+        class FailingGenerator(CardGenerator):
+            def iter_cards(self, *args: object, **kwargs: object) -> Iterator[CardRecord]:
+                for number, card in enumerate(super().iter_cards(*args, **kwargs)):
+                    if number == 2 * SERVICE_CHUNK_SIZE:
+                        raise RuntimeError("generation failed")
+                    yield card
+
+        def test_framed_error_after_first_chunk(self) -> None:
+            request = b'{"op": "generate", "id": 3, "bin": "445566", "count": 50000, "length": 16}'
+            headers = [
+                json.loads(frame.partition(b"\n")[0])
+                for frame in iter_framed_response(self.FailingGenerator(), request)
+            ]
+            self.assertGreater(len(headers), 2)
+            self.assertTrue(all(header["status"] == "ok" and header["more"] for header in headers[:-1]))
+            self.assertEqual(
+                (headers[-1]["status"], headers[-1]["more"], headers[-1]["error"]), ("error", False, "generation failed")
+            )
+
+        def test_stdio_one_frame_per_request(self) -> None:
+            requests = (
+                b'{"id": "a", "bin": "445566", "count": 3, "length": 16, "seed": 1, "format": "csv"}\n'
+                b"\n"
+                b'{"id": "b", "op": "detect", "bin": "6011"}\n'
+                b'{"id": "c", "bin": "445566", "format": "xml"}\n'
+            )
+            stdout = io.BytesIO()
+            run_stdio(CardGenerator(), io.BytesIO(requests), stdout)
+            stream = io.BytesIO(stdout.getvalue())
+            responses = []
+            for _ in range(3):
+                header = json.loads(stream.readline())
+                header["body"] = stream.read(header["size"]).decode("utf-8")
+                responses.append(header)
+            self.assertEqual(stream.read(), b"")
+            expected = CardGenerator().generate_bulk("445566", count=3, length=16, seed=1)
+            self.assertEqual(responses[0]["body"], format_csv(expected))
+            self.assertEqual(json.loads(responses[1]["body"]), {"card_type": "discover"})
+            self.assertEqual((responses[2]["id"], responses[2]["status"]), ("c", "error"))
+            self.assertFalse(any(response["more"] for response in responses))
+
+        @unittest.skipUnless(hasattr(asyncio, "start_unix_server"), "Unix sockets are unavailable")
+        def test_unix_socket_pipelining(self) -> None:
+            async def exercise(path: str) -> List[Dict[str, object]]:
+                server = await start_service(f"unix:{path}")
+                async with server:
+                    reader, writer = await asyncio.open_unix_connection(path)
+                    writer.write(
+                        b'{"op": "detect", "id": 1, "bin": "378282"}\n'
+                        b'{"op": "validate", "id": 2, "numbers": ["4111111111111111", "4111111111111112"]}\n'
+                    )
+                    await writer.drain()
+                    responses = []
+                    for _ in range(2):
+                        header = json.loads(await reader.readline())
+                        header["body"] = json.loads(await reader.readexactly(header["size"]))
+                        responses.append(header)
+                    writer.write_eof()
+                    self.assertEqual(await reader.read(), b"")
+                    writer.close()
+                    return responses
+
+            with tempfile.TemporaryDirectory() as directory:
+                responses = asyncio.run(exercise(os.path.join(directory, "service.sock")))
+            self.assertEqual([response["id"] for response in responses], [1, 2])
+            self.assertEqual(responses[0]["body"], {"card_type": "amex"})
+            self.assertEqual(responses[1]["body"], {"valid": [True, False]})
+
+        def test_http_generate(self) -> None:
+            async def exercise() -> Tuple[str, int]:
+                server = await start_service("127.0.0.1:0")
+                port = server.sockets[0].getsockname()[1]
+                loop = asyncio.get_running_loop()
+
+                def fetch(path: str) -> Tuple[int, str]:
+                    try:
+                        with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=10) as response:
+                            return response.status, response.read().decode("utf-8")
+                    except urllib.error.HTTPError as exc:
+                        return exc.code, ""
+
+                async with server:
+                    _, body = await loop.run_in_executor(None, fetch, "/generate?bin=445566&count=5&format=jsonl")
+                    status, _ = await loop.run_in_executor(None, fetch, "/generate?bin=44")
+                    return body, status
+
+            body, status = asyncio.run(exercise())
+            cards = [json.loads(line) for line in body.splitlines()]
+            self.assertEqual(len(cards), 5)
+            self.assertTrue(all(validate_luhn(card["number"]) for card in cards))
+            self.assertEqual(status, 400)
+
+        def exchange(self, request: bytes, generator: Optional[CardGenerator] = None) -> bytes:
+            async def exercise() -> bytes:
+                server = await start_service("127.0.0.1:0", generator)
+                port = server.sockets[0].getsockname()[1]
+                async with server:
+                    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                    writer.write(request)
+                    await writer.drain()
+                    response = await reader.read()
+                    writer.close()
+                    await writer.wait_closed()
+                    return response
+
+            return asyncio.run(exercise())
+
+        def test_http_rejects_invalid_content_length(self) -> None:
+            response = self.exchange(b"POST /detect HTTP/1.1\r\nContent-Length: abc\r\n\r\n{}")
+            self.assertTrue(response.startswith(b"HTTP/1.1 400 Bad Request\r\n"))
+            self.assertIn(b"Invalid Content-Length", response)
+
+        def test_http_rejects_oversized_body(self) -> None:
+            response = self.exchange(b"POST /detect HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % (SERVICE_MAX_BODY + 1))
+            self.assertTrue(response.startswith(b"HTTP/1.1 413 Payload Too Large\r\n"))
+
+        def test_http_aborts_chunked_body_on_error(self) -> None:
+            response = self.exchange(
+                b"GET /generate?bin=445566&count=50000 HTTP/1.1\r\nConnection: close\r\n\r\n", self.FailingGenerator()
+            )
+            self.assertTrue(response.startswith(b"HTTP/1.1 200 OK\r\n"))
+            self.assertIn(b"Transfer-Encoding: chunked", response)
+            self.assertFalse(response.endswith(b"\r\n0\r\n\r\n"))
+
+    class IssuedIndexTests(unittest.TestCase):
+        def test_runs_never_repeat_numbers(self) -> None:
+            with tempfile.TemporaryDirectory() as directory:
+                with IssuedIndex(os.path.join(directory, "issued.db")) as index:
+                    pattern = "445566xx12345678"  # 10 valid numbers
+                    options = {"sampling": SAMPLING_PERMUTATION, "issued_index": index}
+                    first = CardGenerator().generate_bulk(pattern, count=4, **options)
+                    second = CardGenerator().generate_bulk(pattern, count=6, **options)
+                    numbers = [card["number"] for card in first + second]
+                    self.assertEqual(len(set(numbers)), 10)
+                    self.assertEqual(index.count("445566"), 10)
+                    with self.assertRaises(RuntimeError):
+                        CardGenerator().generate_bulk(pattern, count=1, seed=1, issued_index=index)
+
+        def test_seeded_runs_continue_past_issued_numbers(self) -> None:
+            options = {"length": 16, "seed": "ci"}
+            full = CardGenerator().generate_bulk("445566", count=30, **options)
+            with tempfile.TemporaryDirectory() as directory:
+                with IssuedIndex(os.path.join(directory, "issued.db")) as index:
+                    claimed = index.claim([card["number"] for card in full[:10]], "445566")
+                    self.assertEqual(claimed, [card["number"] for card in full[:10]])
+                    self.assertEqual(index.claim(claimed[:3], "445566"), [])
+                    later = CardGenerator().generate_bulk("445566", count=20, issued_index=index, **options)
+            self.assertEqual(later, full[10:])
+
+        def test_seeded_runs_resume_from_high_water_mark(self) -> None:
+            options = {"length": 16, "seed": "resume", "sampling": SAMPLING_PERMUTATION}
+            full = CardGenerator().generate_bulk("445566", count=40, **options)
+            with tempfile.TemporaryDirectory() as directory:
+                with IssuedIndex(os.path.join(directory, "issued.db")) as index:
+                    first = CardGenerator().generate_bulk("445566", count=25, issued_index=index, **options)
+                    index.claim([full[26]["number"]], "445566")
+                    claims = []
+                    original_claim = index.claim
+                    index.claim = lambda numbers, prefix: claims.append(len(numbers)) or original_claim(numbers, prefix)
+                    second = CardGenerator().generate_bulk("445566", count=10, issued_index=index, **options)
+            self.assertEqual(first, full[:25])
+            self.assertEqual(second, full[25:26] + full[27:36])
+            self.assertEqual(sum(claims), 11)
+
+    class SqliteLoadTests(unittest.TestCase):
+        def test_load_round_trips_cards(self) -> None:
+            cards = CardGenerator().generate_bulk("445566", count=1500, length=16, seed="db")
+            with tempfile.TemporaryDirectory() as directory:
+                database = os.path.join(directory, "fixtures.db")
+                rows = load_sqlite(
+                    iter(cards), database, "issued_cards",
+                    page_size=8192, journal_mode="off", transaction_rows=1000,
+                )
+                self.assertEqual(rows, 1500)
+                load_sqlite(CardBatch.from_records(cards[:10]), database, "issued_cards")
+                connection = sqlite3.connect(database)
+                try:
+                    self.assertEqual(connection.execute("PRAGMA page_size").fetchone()[0], 8192)
+                    stored = connection.execute(
+                        "SELECT number, cvv, exp_month, exp_year FROM issued_cards"
+                    ).fetchall()
+                finally:
+                    connection.close()
+            self.assertEqual(len(stored), 1510)
+            self.assertEqual([dict(zip(CARD_FIELDS, row)) for row in stored[:1500]], cards)
+
+        def test_rejects_unsafe_table_names(self) -> None:
+            with self.assertRaises(ValueError):
+                load_sqlite([], ":memory:", "cards; DROP TABLE x")
+
+    class AddressParsingTests(unittest.TestCase):
+        def test_single_pass_matches_per_label_parser(self) -> None:
+            payload = _address_fixture_html(1)
+            self.assertEqual(parse_random_address(payload), _parse_address_per_label(payload))
+
+        def test_parses_every_block(self) -> None:
+            addresses = parse_random_addresses(_address_fixture_html(7))
+            self.assertEqual(len(addresses), 7)
+            self.assertEqual(addresses[3]["Street"], "103 Maple Avenue")
+            self.assertEqual(addresses[6]["State/province/area"], "Illinois")
+            self.assertEqual(list(addresses[0]), ADDRESS_LABELS)
+
+        def test_incomplete_block_is_rejected(self) -> None:
+            payload = _address_fixture_html(2).replace("<b>City:</b>", "<b>Town:</b>", 1)
+            with self.assertRaises(ValueError):
+                parse_random_addresses(payload)
+            with self.assertRaises(ValueError):
+                parse_random_address("<html></html>")
+
+    class AddressFetcherTests(unittest.TestCase):
+        def setUp(self) -> None:
+            import http.server
+
+            self.requests: List[str] = []
+            self.failures = 0
+            self.connections: Set[Tuple[str, int]] = set()
+            test = self
+
+            class Handler(http.server.BaseHTTPRequestHandler):
+                protocol_version = "HTTP/1.1"
+
+                def do_GET(self) -> None:
+                    test.requests.append(self.path)
+                    test.connections.add(self.client_address)
+                    if test.failures:
+                        test.failures -= 1
+                        self.send_response(503)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    quantity = int(urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)["quantity"][0])
+                    body = _address_fixture_html(quantity).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args: object) -> None:
+                    pass
+
+            self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+            self.template = f"http://127.0.0.1:{self.server.server_address[1]}/random?quantity={{quantity}}"
+
+        def tearDown(self) -> None:
+            self.server.shutdown()
+            self.server.server_close()
+
+        def test_batches_pool_and_cache(self) -> None:
+            with tempfile.TemporaryDirectory() as directory:
+                with AddressFetcher(self.template, concurrency=1, rate=1000, cache_dir=directory) as fetcher:
+                    addresses = fetcher.fetch_addresses(45)
+                self.assertEqual(len(addresses), 45)
+                self.assertEqual(sorted(self.requests), ["/random?quantity=20"] * 2 + ["/random?quantity=5"])
+                self.assertEqual(len(self.connections), 1)
+                self.assertEqual((fetcher.requests, fetcher.cache_hits), (3, 0))
+
+                with AddressFetcher(self.template, rate=1000, cache_dir=directory, offline=True) as replay:
+                    self.assertEqual(replay.fetch_addresses(45), addresses)
+                self.assertEqual(len(self.requests), 3)
+                self.assertEqual(replay.cache_hits, 3)
+                self.assertIn("100% hit rate", replay.report())
+                with self.assertRaises(RuntimeError):
+                    AddressFetcher(self.template, cache_dir=directory, offline=True).fetch_addresses(60)
+
+        def test_single_address_goes_through_fetcher(self) -> None:
+            url = self.template.format(quantity=1)
+            self.assertEqual(set(fetch_random_us_address(url)), set(ADDRESS_LABELS))
+            with tempfile.TemporaryDirectory() as directory:
+                with AddressFetcher(self.template, rate=1000, cache_dir=directory) as fetcher:
+                    address = fetch_random_us_address(url, fetcher)
+                    self.assertEqual(fetch_random_us_address(url, fetcher), address)  # replayed from the cache
+            self.assertEqual(len(self.requests), 2)
+            self.assertEqual((fetcher.requests, fetcher.cache_hits), (1, 1))
+
+        def test_pages_in_flight_are_bounded(self) -> None:
+            urls = [self.template.format(quantity=1)] * 20
+            fetcher = AddressFetcher(self.template, concurrency=1, rate=1000)
+            pages = fetcher.iter_pages(urls)
+            next(pages)
+            time.sleep(0.3)
+            self.assertLessEqual(len(self.requests), 1 + ADDRESS_PAGES_PER_WORKER)
+            self.assertEqual(len(list(pages)), 19)
+            self.assertEqual(len(self.requests), 20)
+            fetcher.close()
+
+        def test_closing_pages_early_drops_queued_requests(self) -> None:
+            urls = [self.template.format(quantity=1)] * 20
+            fetcher = AddressFetcher(self.template, concurrency=1, rate=5)
+            pages = fetcher.iter_pages(urls)
+            next(pages)
+            pages.close()
+            self.assertLessEqual(len(self.requests), 2)  # the first page and the one running
+            fetcher.close()
+
+        def test_retries_with_backoff(self) -> None:
+            self.failures = 2
+            fetcher = AddressFetcher(self.template, rate=1000, backoff=0.01)
+            self.assertEqual(len(fetcher.fetch_addresses(3)), 3)
+            self.assertEqual(fetcher.retried, 2)
+            self.failures = 5
+            with self.assertRaises(RuntimeError):
+                AddressFetcher(self.template, rate=1000, retries=1, backoff=0.01).fetch_addresses(1)
+
+        def test_token_bucket_limits_rate(self) -> None:
+            bucket = TokenBucket(rate=50, burst=1)
+            started = time.monotonic()
+            for _ in range(6):
+                bucket.acquire()
+            self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    class PairingTests(unittest.TestCase):
+        ADDRESSES = [
+            {"Street": "1 Main St, Apt 2", "City": "Baton Rouge", "State/province/area": "Louisiana", "Zip code": "70801"},
+            {"Street": "9 Oak Ave", "City": "Monroe", "State/province/area": "Louisiana", "Zip code": "71201"},
+        ]
+
+        def test_prefetch_starts_immediately_and_propagates_errors(self) -> None:
+            started = threading.Event()
+
+            def source() -> Iterator[int]:
+                started.set()
+                yield 1
+                yield 2
+                raise RuntimeError("source failed")
+
+            items = prefetch(source())
+            self.assertTrue(started.wait(5))
+            self.assertEqual([next(items), next(items)], [1, 2])
+            with self.assertRaisesRegex(RuntimeError, "source failed"):
+                next(items)
+
+        def test_write_paired_joins_cards_and_addresses(self) -> None:
+            cards = CardGenerator().generate_bulk(bin_pattern="411111", count=2, seed=3)
+            buffer = io.StringIO()
+            write_paired(cards, iter(self.ADDRESSES), buffer, "csv")
+            rows = list(csv.reader(io.StringIO(buffer.getvalue())))
+            self.assertEqual(rows[0], ["card_number", "exp_month", "exp_year", "cvv", "street", "city", "state", "zip"])
+            self.assertEqual(rows[1][0], cards[0]["number"])
+            self.assertEqual(rows[1][4:], ["1 Main St, Apt 2", "Baton Rouge", "Louisiana", "70801"])
+
+            records = [json.loads(line) for line in _render_paired(cards, self.ADDRESSES, "jsonl").splitlines()]
+            self.assertEqual(list(records[1]), list(PAIRED_FIELDS))
+            self.assertEqual(records[1]["zip"], "71201")
+
+            layout = compile_template("{number}:{city}", PAIRED_FIELDS)
+            self.assertEqual(
+                _render_paired(cards, self.ADDRESSES, layout),
+                f"{cards[0]['number']}:Baton Rouge\n{cards[1]['number']}:Monroe\n",
+            )
+            with self.assertRaises(ValueError):
+                compile_template("{number}:{city}")
+            with self.assertRaises(RuntimeError):
+                _render_paired(cards, self.ADDRESSES[:1], "pipe")
+
+    def _render_paired(cards: Iterable[CardRecord], addresses: Iterable[Dict[str, str]], layout: Any) -> str:
+        buffer = io.StringIO()
+        write_paired(cards, addresses, buffer, layout)
+        return buffer.getvalue()
+
+    class AddressCorpusTests(unittest.TestCase):
+        CSV = (
+            "FULL ADDRESS,CITY,ZIP,JURISDICTION,COUNCILPERSON NAME\n"
+            "\"100 Canal St, Apt 2\",New Orleans,70130,Louisiana,A\n"
+            "5 Elm St,Austin,73301,Texas,B\n"
+            "9 Oak Ave,Dallas,75201,Texas,C\n"
+            "1 Bayou Rd,Metairie,70001,,D\n"
+            ",Nowhere,00000,Texas,E\n"
+        )
+
+        def _corpus_file(self, directory: str) -> str:
+            path = os.path.join(directory, "us-US.csv")
+            Path(path).write_text(self.CSV, encoding="utf-8")
+            return path
+
+        def test_rows_and_filters(self) -> None:
+            with tempfile.TemporaryDirectory() as directory:
+                corpus = AddressCorpus.from_csv(self._corpus_file(directory))
+            self.assertEqual(len(corpus), 4)
+            self.assertEqual(
+                corpus[0],
+                {"Street": "1 Bayou Rd", "City": "Metairie", "State/province/area": "Louisiana", "Zip code": "70001"},
+            )
+            texas = {corpus[index]["City"] for index in corpus.matching("TEXAS")}
+            self.assertEqual(texas, {"Austin", "Dallas"})
+            self.assertEqual([corpus[index]["Street"] for index in corpus.matching(zip_prefix="701")], ["100 Canal St, Apt 2"])
+            self.assertEqual(list(corpus.matching("texas", "75")), [3])
+            self.assertEqual(len(corpus.matching(zip_prefix="9")), 0)
+            samples = corpus.sample(300, state="louisiana")
+            self.assertEqual({address["State/province/area"] for address in samples}, {"Louisiana"})
+            with self.assertRaises(ValueError):
+                corpus.sample(1, state="Ohio")
+
+        def test_cache_is_mapped_and_refreshed(self) -> None:
+            with tempfile.TemporaryDirectory() as directory:
+                path = self._corpus_file(directory)
+                first = AddressCorpus.load(path)
+                self.assertTrue(os.path.exists(path + ADDRESS_CACHE_SUFFIX))
+                cached = AddressCorpus.load(path)
+                self.assertIsInstance(cached._image, mmap.mmap)
+                self.assertEqual([cached[index] for index in range(4)], [first[index] for index in range(4)])
+                with open(path, "a", encoding="utf-8") as handle:
+                    handle.write("7 Pine St,Portland,04101,Maine,F\n")
+                opened: List[mmap.mmap] = []
+                original = mmap.mmap
+
+                def recording_mmap(*args: object, **kwargs: object) -> mmap.mmap:
+                    opened.append(original(*args, **kwargs))
+                    return opened[-1]
+
+                mmap.mmap = recording_mmap  # type: ignore[misc]
+                try:
+                    self.assertEqual(len(AddressCorpus.load(path)), 5)
+                    Path(path + ADDRESS_CACHE_SUFFIX).write_bytes(b"RSGADDR1" + b"\0" * 64)
+                    self.assertEqual(len(AddressCorpus.load(path)), 5)
+                finally:
+                    mmap.mmap = original  # type: ignore[misc]
+                self.assertEqual(len(opened), 2)
+                self.assertTrue(all(mapped.closed for mapped in opened))
+                cached.close()
+
+    class CompressionTests(unittest.TestCase):
+        DECOMPRESSORS = {"gzip": gzip.decompress, "xz": lzma.decompress, "bz2": bz2.decompress}
+
+        def test_blocks_form_a_multi_member_stream(self) -> None:
+            data = b"".join(f"{index:08d}|card\n".encode("ascii") for index in range(20000))
+            for method, decompress in self.DECOMPRESSORS.items():
+                compressed = io.BytesIO()
+                compressor = BlockCompressor(compressed, method, threads=3, block_size=50000)
+                for offset in range(0, len(data), 7000):
+                    compressor.write(data[offset:offset + 7000])
+                compressor.close()
+                self.assertEqual(decompress(compressed.getvalue()), data, method)
+
+        def test_empty_output_is_valid(self) -> None:
+            compressed = io.BytesIO()
+            BlockCompressor(compressed, "gzip").close()
+            self.assertEqual(gzip.decompress(compressed.getvalue()), b"")
+
+        def test_compressed_sink(self) -> None:
+            cards = CardGenerator().generate_bulk("445566", count=50, length=16, seed="gz")
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "cards.csv.gz")
+                with open_card_sink(path, "gzip", 2) as sink:
+                    write_csv(cards, sink)
+                with gzip.open(path, "rt", encoding="utf-8", newline="") as handle:
+                    self.assertEqual(handle.read(), format_csv(cards) + "\n")
+
+    class CheckpointTests(unittest.TestCase):
+        SETTINGS = {
+            "bin_pattern": "445566",
+            "count": 2500,
+            "format": "json",
+            "length": 16,
+            "cvv_length": None,
+            "years_ahead": 5,
+            "expiry_month": None,
+            "expiry_year": None,
+            "engine": ENGINE_PYTHON,
+            "sampling": SAMPLING_PERMUTATION,
+            "seed": "resume",
+            "start": 0,
+            "workers": 1,
+            "expiry_anchor": "2030-01",
+        }
+
+        def test_resume_matches_uninterrupted_run(self) -> None:
+            with tempfile.TemporaryDirectory() as directory:
+                expected_path = os.path.join(directory, "expected.json")
+                write_checkpointed(CardGenerator(), expected_path, self.SETTINGS, interval=1000)
+                expected = Path(expected_path).read_bytes()
+                self.assertFalse(_checkpoint_path(expected_path).exists())
+                self.assertEqual(len(json.loads(expected)), 2500)
+
+                resumed_path = os.path.join(directory, "resumed.json")
+                interrupted = CardGenerator()
+                original = interrupted.iter_cards
+
+                def failing_iter_cards(*args: object, **kwargs: object) -> Iterator[CardRecord]:
+                    for number, card in enumerate(original(*args, **kwargs)):
+                        if number == 1700:
+                            raise KeyboardInterrupt
+                        yield card
+
+                interrupted.iter_cards = failing_iter_cards  # type: ignore[assignment]
+                with self.assertRaises(KeyboardInterrupt):
+                    write_checkpointed(interrupted, resumed_path, self.SETTINGS, interval=1000)
+                with open(resumed_path, "ab") as handle:
+                    handle.write(b"torn partial write")
+                write_checkpointed(CardGenerator(), resumed_path, {}, interval=1000, resume=True)
+                self.assertEqual(Path(resumed_path).read_bytes(), expected)
+
+        def test_checkpoints_never_point_past_flushed_bytes(self) -> None:
+            saved = _save_checkpoint
+            sizes: List[Tuple[int, int]] = []
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "cards.csv")
+
+                def recording_save(checkpoint: Path, state: Dict[str, object]) -> None:
+                    sizes.append((state["bytes"], os.path.getsize(path)))
+                    saved(checkpoint, state)
+
+                globals()["_save_checkpoint"] = recording_save
+                try:
+                    write_checkpointed(CardGenerator(), path, dict(self.SETTINGS, format="csv"), interval=1000)
+                finally:
+                    globals()["_save_checkpoint"] = saved
+            self.assertEqual(sizes[0][0], len(LAYOUTS["csv"].header))
+            self.assertTrue(all(recorded <= on_disk for recorded, on_disk in sizes))
+
+        def test_resume_keeps_recorded_interval(self) -> None:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "cards.csv")
+                interrupted = CardGenerator()
+                original = interrupted.iter_cards
+
+                def failing_iter_cards(*args: object, **kwargs: object) -> Iterator[CardRecord]:
+                    for number, card in enumerate(original(*args, **kwargs)):
+                        if number == 800:
+                            raise KeyboardInterrupt
+                        yield card
+
+                interrupted.iter_cards = failing_iter_cards  # type: ignore[assignment]
+                with self.assertRaises(KeyboardInterrupt):
+                    write_checkpointed(interrupted, path, dict(self.SETTINGS, format="csv"), interval=300)
+                state = json.loads(_checkpoint_path(path).read_text())
+                self.assertEqual((state["interval"], state["position"]), (300, 600))
+
+                saved = _save_checkpoint
+                positions: List[int] = []
+
+                def recording_save(checkpoint: Path, state: Dict[str, object]) -> None:
+                    positions.append(state["position"])
+                    saved(checkpoint, state)
+
+                globals()["_save_checkpoint"] = recording_save
+                try:
+                    write_checkpointed(CardGenerator(), path, {}, resume=True)
+                finally:
+                    globals()["_save_checkpoint"] = saved
+            self.assertEqual(positions[:2], [900, 1200])
+
+    class CardBatchTests(unittest.TestCase):
+        SAMPLE = [
+            {"number": "4111111111111111", "cvv": "123", "exp_month": "01", "exp_year": "30"},
+            {"number": "5555555555554444", "cvv": "321", "exp_month": "06", "exp_year": "28"},
+            {"number": "6011000990139424", "cvv": "007", "exp_month": "12", "exp_year": "29"},
+        ]
+
+        def test_round_trip_and_rows(self) -> None:
+            batch = CardBatch.from_records(self.SAMPLE)
+            self.assertEqual(len(batch), 3)
+            self.assertEqual(batch.to_records(), self.SAMPLE)
+            self.assertEqual(batch[1], self.SAMPLE[1])
+            self.assertEqual(batch[-1]["cvv"], "007")
+            self.assertEqual(batch[1:].to_records(), self.SAMPLE[1:])
+            self.assertEqual(len(batch.numbers) + len(batch.cvvs) + len(batch.expiries), 69)
+
+        def test_formatters_and_writers_accept_batches(self) -> None:
+            batch = CardBatch.from_records(self.SAMPLE)
+            for name, formatter in FORMATTERS.items():
+                self.assertEqual(formatter(batch), formatter(self.SAMPLE), name)
+                stream = io.StringIO()
+                WRITERS[name](batch, stream)
+                self.assertEqual(stream.getvalue(), formatter(self.SAMPLE) + "\n", name)
+
+        def test_rejects_mixed_widths(self) -> None:
+            mixed = self.SAMPLE + [
+                {"number": "378282246310005", "cvv": "1234", "exp_month": "01", "exp_year": "30"}
+            ]
+            with self.assertRaises(ValueError):
+                CardBatch.from_records(mixed)
+
+        def test_generate_bulk_as_batch(self) -> None:
+            batch = CardGenerator().generate_bulk("445566", count=25, length=16, as_batch=True)
+            self.assertIsInstance(batch, CardBatch)
+            self.assertTrue(all(validate_luhn(row["number"]) for row in batch))
+
+    class StreamingTests(unittest.TestCase):
+        def test_iter_cards_is_lazy(self) -> None:
+            cards = CardGenerator().iter_cards("445566", count=10**8, length=16)
+            first = list(itertools.islice(cards, 5))
+            self.assertEqual(len(first), 5)
+            self.assertTrue(all(validate_luhn(card["number"]) for card in first))
+
+        def test_iter_cards_validates_eagerly(self) -> None:
+            with self.assertRaises(ValueError):
+                CardGenerator().iter_cards("44", count=5)
+
     suite = unittest.TestSuite()
     suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(ValidatorTests))
     suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(GeneratorTests))
     suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(FormatterTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(DigitSourceTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(PatternTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(SeededTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(PermutationTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(CardBatchTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(StreamingTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(TemplateTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(CompressionTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(ManifestTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(ServiceTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(IssuedIndexTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(SqliteLoadTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(AddressParsingTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(AddressFetcherTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(PairingTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(AddressCorpusTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(CheckpointTests))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(BinaryFormatTests))
     result = unittest.TextTestRunner(verbosity=1).run(suite)
     return result.wasSuccessful()
 